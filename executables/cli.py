@@ -6,11 +6,13 @@ from typing import Optional
 import click
 from schnapsen.alternative_engines.ace_one_engine import AceOneGamePlayEngine
 
-from schnapsen.bots import MLDataBot, train_ML_model, MLPlayingBot, RandBot
+from schnapsen.bots import MLDataBot, train_ML_model, MLPlayingBot, RandBot, generate_random_tablebase
 
 from schnapsen.bots.example_bot import ExampleBot
 
-from schnapsen.game import (Bot, GamePlayEngine, Move, PlayerPerspective,
+from schnapsen.evaluation import sequential_test
+
+from schnapsen.game import (Bot, BotSpec, Move, PlayerPerspective,
                             SchnapsenGamePlayEngine, TrumpExchange)
 from schnapsen.alternative_engines.twenty_four_card_schnapsen import TwentyFourSchnapsenGamePlayEngine
 
@@ -22,25 +24,6 @@ def main() -> None:
     """Various Schnapsen Game Examples"""
 
 
-def play_games_and_return_stats(engine: GamePlayEngine, bot1: Bot, bot2: Bot, number_of_games: int) -> int:
-    """
-    Play number_of_games games between bot1 and bot2, using the SchnapsenGamePlayEngine, and return how often bot1 won.
-    Prints progress.
-    """
-    bot1_wins: int = 0
-    lead, follower = bot1, bot2
-    for i in range(1, number_of_games + 1):
-        if i % 2 == 0:
-            # swap bots so both start the same number of times
-            lead, follower = follower, lead
-        winner, _, _ = engine.play_game(lead, follower, random.Random(i))
-        if winner == bot1:
-            bot1_wins += 1
-        if i % 500 == 0:
-            print(f"Progress: {i}/{number_of_games}")
-    return bot1_wins
-
-
 @main.command()
 def random_game() -> None:
     engine = SchnapsenGamePlayEngine()
@@ -177,13 +160,28 @@ def try_bot_game() -> None:
     model_dir: str = 'ML_models'
     model_name: str = 'simple_model'
     model_location = pathlib.Path(model_dir) / model_name
-    bot1: Bot = MLPlayingBot(model_location=model_location)
-    bot2: Bot = RandBot(random.Random(464566))
+    bot1 = BotSpec(MLPlayingBot, kwargs={"model_location": model_location})
+    bot2 = BotSpec(RandBot, rand_argument="rand")
     number_of_games: int = 10000
 
-    # play games with altering leader position on first rounds
-    ml_bot_wins_against_random = play_games_and_return_stats(engine=engine, bot1=bot1, bot2=bot2, number_of_games=number_of_games)
-    print(f"The ML bot with name {model_name}, won {ml_bot_wins_against_random} times out of {number_of_games} games played.")
+    # play games with altering leader position on first rounds, until it is clear whether the ML bot wins more than 55% of the games
+    result = sequential_test(engine=engine, bot1=bot1, bot2=bot2, p0=0.5, p1=0.55, max_games=number_of_games)
+    print(f"The ML bot with name {model_name}, won {result.wins} times out of {result.games} games played.")
+    if result.accepted is None:
+        print("No decision was reached on whether it wins 55% or 50% of the games.")
+    else:
+        print(f"It wins {'55%' if result.accepted else '50% or less'} of the games, with confidence {result.confidence:.3f}.")
+
+
+@main.command()
+@click.option("--deals", default=10000, help="The number of random games to solve phase two for.")
+@click.option("--seed", default=42, help="The seed for the random games.")
+@click.option("--output", default="phase_two.tb", help="The file to write the tablebase to.")
+def generate_tablebase(deals: int, seed: int, output: str) -> None:
+    """Solve the phase two positions of random games and store them in a tablebase for the TablebaseBot."""
+    engine = SchnapsenGamePlayEngine()
+    number_of_positions = generate_random_tablebase(output, engine, number_of_deals=deals, rand=random.Random(seed))
+    print(f"Stored {number_of_positions} positions in {output}")
 
 
 @main.command()
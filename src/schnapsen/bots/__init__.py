@@ -3,10 +3,14 @@ it by from schnapsen.bots import MyBot.
 """
 from .rand import RandBot
 from .alphabeta import AlphaBetaBot
-from .rdeep import RdeepBot
+from .rdeep import RdeepBot, shutdown_rollout_pools
 from .ml_bot import MLDataBot, MLPlayingBot, train_ML_model
 from .gui.guibot import SchnapsenServer
 from .minimax import MiniMaxBot
+from .transposition import TranspositionTable
+from .tablebase import Tablebase, TablebaseBot, generate_tablebase, generate_random_tablebase
+from .ismcts import ISMCTSBot
 from .IS_project_bot import Human_Strategy_Bot
 
-__all__ = ["RandBot", "AlphaBetaBot", "RdeepBot", "MLDataBot", "MLPlayingBot", "train_ML_model", "SchnapsenServer", "MiniMaxBot", "Human_Strategy_Bot"]
+__all__ = ["RandBot", "AlphaBetaBot", "RdeepBot", "shutdown_rollout_pools", "MLDataBot", "MLPlayingBot", "train_ML_model", "SchnapsenServer", "MiniMaxBot", "Human_Strategy_Bot", "TranspositionTable",
+           "Tablebase", "TablebaseBot", "generate_tablebase", "generate_random_tablebase", "ISMCTSBot"]
@@ -1,16 +1,16 @@
-from typing import Optional
+from typing import Iterable, Optional, cast
 
 from schnapsen.game import (
     Bot,
     Move,
+    Marriage,
     PlayerPerspective,
     GamePhase,
     GameState,
-    FollowerPerspective,
-    LeaderPerspective,
     GamePlayEngine,
-    SchnapsenTrickScorer,
+    NUMBER_OF_MOVES,
 )
+from .transposition import Bound, TranspositionTable
 
 
 class AlphaBetaBot(Bot):
@@ -29,18 +29,48 @@ class AlphaBetaBot(Bot):
                 return self.delegate_phase2.get_move(state, leader_move)
             else:
                 # The logic of your bot
+
+    The more often the best move is searched first, the more of the tree gets pruned. Therefore, moves are searched in this order:
+    the best move stored in the transposition table, then winning captures and high-point cards (marriages and trump exchanges for the leader),
+    then killer moves (moves which caused a cutoff in a sibling node), and finally moves by their history score (how often and how deep they caused cutoffs).
+    The number of nodes searched and cutoffs made are counted in the nodes and cutoffs attributes.
     """
 
-    def __init__(self, name: Optional[str] = None) -> None:
+    def __init__(self, name: Optional[str] = None, transposition_table: Optional[TranspositionTable] = None, move_ordering: bool = True) -> None:
+        """
+        Create a new bot.
+
+        :param name: (Optional[str]): The name of this bot
+        :param transposition_table: (Optional[TranspositionTable]): The table in which positions already searched are remembered.
+            If not provided, the bot creates its own table, which is kept for all moves the bot makes. Pass the same table to several bots to share it across bots and games.
+        :param move_ordering: (bool): Whether to order the moves before searching them. If False, they are searched in the order the move validator returns them.
+        """
         super().__init__(name)
+        self.transposition_table = transposition_table if transposition_table is not None else TranspositionTable()
+        self.move_ordering = move_ordering
+        self.nodes = 0
+        """The number of nodes visited by the searches of this bot"""
+        self.cutoffs = 0
+        """The number of times the searches of this bot pruned the remaining moves of a node"""
+        # _killers[slot] contains the ids of the last two moves which caused a cutoff in nodes of that slot, see _killer_slot
+        self._killers: dict[int, list[int]] = {}
+        # _history[move_id] grows with each cutoff caused by the move, more so for cutoffs higher in the tree
+        self._history: list[int] = [0] * NUMBER_OF_MOVES
 
     def get_move(self, perspective: PlayerPerspective, leader_move: Optional[Move]) -> Move:
         assert (perspective.get_phase() == GamePhase.TWO), "AlphaBetaBot can only work in the second phase of the game."
-        _, move = self.value(
+        self.transposition_table.new_search()
+        # killers are specific to the position searched, the history is kept but counts less for the new search
+        self._killers.clear()
+        self._history = [score // 2 for score in self._history]
+        # When playing, it does not matter which of several equally good moves is chosen, so the moves are ordered from the root on
+        _, move = self._value(
             perspective.get_state_in_phase_two(),
             perspective.get_engine(),
             leader_move=leader_move,
             maximizing=True,
+            alpha=float("-inf"),
+            beta=float("inf"),
         )
         return move
 
@@ -53,22 +83,60 @@ class AlphaBetaBot(Bot):
         alpha: float = float("-inf"),
         beta: float = float("inf"),
     ) -> tuple[float, Move]:
-        my_perspective: PlayerPerspective
+        """
+        Get the value of the state and the best move for the player to move.
+        The moves of this node are tried in the order of the move validator, such that among equally good moves the same one is chosen as by MiniMaxBot.
+        Deeper in the tree, the moves are ordered to prune as much as possible.
+
+        :param state: (GameState): The current state of the game
+        :param engine: (GamePlayEngine): The engine used to play the game
+        :param leader_move: (Optional[Move]): The move of the leader, or None if the leader is to move
+        :param maximizing: (bool): Whether the player to move is the maximizing player
+        :param alpha: (float): The value the maximizing player is already sure to get
+        :param beta: (float): The value the minimizing player is already sure to get
+        :returns: (tuple[float, Move]): The value of the state for the maximizing player, and the best move
+        """
+        return self._value(state, engine, leader_move, maximizing, alpha, beta, order_moves=False)
+
+    def _value(
+        self,
+        state: GameState,
+        engine: GamePlayEngine,
+        leader_move: Optional[Move],
+        maximizing: bool,
+        alpha: float,
+        beta: float,
+        order_moves: bool = True,
+    ) -> tuple[float, Move]:
+        self.nodes += 1
+        table = self.transposition_table
+        depth = len(state.leader.hand) + len(state.follower.hand)
+        use_table = depth >= table.min_depth
+        table_move_id: Optional[int] = None
+        if use_table:
+            key = table.node_key(state, leader_move, maximizing)
+            entry = table.probe(key)
+            if entry is not None:
+                if entry.is_usable(alpha, beta):
+                    return entry.value, entry.move
+                table_move_id = entry.move_id
+        original_alpha, original_beta = alpha, beta
+
+        valid_moves: Iterable[Move]
         if leader_move is None:
             # we are the leader
-            my_perspective = LeaderPerspective(state, engine)
+            valid_moves = engine.move_validator.get_legal_leader_moves(engine, state)
         else:
-            my_perspective = FollowerPerspective(state, engine, leader_move)
-        valid_moves = my_perspective.valid_moves()
+            valid_moves = engine.move_validator.get_legal_follower_moves(engine, state, leader_move)
+        if order_moves and self.move_ordering:
+            valid_moves = self._order_moves(state, engine, leader_move, valid_moves, table_move_id, depth)
 
         best_value = float("-inf") if maximizing else float("inf")
         best_move: Optional[Move] = None
         for move in valid_moves:
-            leader: Bot
-            follower: Bot
             if leader_move is None:
                 # we are leader, call self to get the follower to play
-                value, _ = self.value(
+                value, _ = self._value(
                     state=state,
                     engine=engine,
                     leader_move=move,
@@ -78,14 +146,13 @@ class AlphaBetaBot(Bot):
                 )
             else:
                 # We are the follower. We need to complete the trick and then call self to play the next trick, with the correct maximizing, depending on who is the new leader
-                leader = OneFixedMoveBot(leader_move)
-                follower = OneFixedMoveBot(move)
-                new_game_state = engine.play_one_trick(game_state=state, new_leader=leader, new_follower=follower)
-                winning_info = SchnapsenTrickScorer().declare_winner(new_game_state)
+                # The trick is applied to the state itself, and undone after the evaluation, such that no copies of the state are needed.
+                undo = engine.apply_trick(state, leader_move=leader_move, follower_move=move)
+                winning_info = engine.trick_scorer.declare_winner(state)
                 if winning_info:
-                    winner = winning_info[0].implementation
+                    winner = winning_info[0]
                     points = winning_info[1]
-                    follower_wins = winner == follower
+                    follower_wins = winner is undo.follower
 
                     if not follower_wins:
                         points = -points
@@ -94,7 +161,7 @@ class AlphaBetaBot(Bot):
                     value = points
                 else:
                     # play the next round by doing a recursive call
-                    leader_stayed = leader == new_game_state.leader.implementation
+                    leader_stayed = state.leader is undo.leader
 
                     if leader_stayed:
                         # At the next step, the leader is our opponent, and it will be doing the opposite of what we do.
@@ -103,31 +170,88 @@ class AlphaBetaBot(Bot):
                         # At the next step we will have become the leader, so we will keep doing what we did
                         next_maximizing = maximizing
                     # implementation note: the previous two case could be written with a xor, but this seemed more readable
-                    value, _ = self.value(new_game_state, engine, None, next_maximizing, alpha, beta)
+                    value, _ = self._value(state, engine, None, next_maximizing, alpha, beta)
+                engine.undo_trick(state, undo)
             if maximizing:
                 if value > best_value:
                     best_move = move
                     best_value = value
                 alpha = max(alpha, best_value)  # alphabeta pruning
-                if beta <= alpha:
-                    break
             else:
                 if value < best_value:
                     best_move = move
                     best_value = value
                 beta = min(beta, best_value)  # alphabeta pruning
-                if beta <= alpha:
-                    break
+            if beta <= alpha:
+                self._record_cutoff(move, leader_move, depth)
+                break
         assert best_move  # We are sure the best_move can no longer be None. We assert to make sure we did not make a logical mistake
+        if use_table:
+            if best_value <= original_alpha:
+                bound = Bound.UPPER
+            elif best_value >= original_beta:
+                bound = Bound.LOWER
+            else:
+                bound = Bound.EXACT
+            table.store(key, best_value, bound, best_move, depth)
         return best_value, best_move
 
+    @staticmethod
+    def _killer_slot(depth: int, leader_move: Optional[Move]) -> int:
+        """Nodes with the same number of cards left and the same player to move share their killer moves."""
+        return 2 * depth + (leader_move is not None)
 
-class OneFixedMoveBot(Bot):
-    def __init__(self, move: Move) -> None:
-        self.first_move: Optional[Move] = move
+    def _record_cutoff(self, move: Move, leader_move: Optional[Move], depth: int) -> None:
+        """Update the counters, killer moves and history scores after move caused a cutoff."""
+        self.cutoffs += 1
+        killers = self._killers.setdefault(self._killer_slot(depth, leader_move), [])
+        if move.move_id not in killers:
+            killers.insert(0, move.move_id)
+            del killers[2:]
+        self._history[move.move_id] += depth * depth
 
-    def get_move(self, perspective: PlayerPerspective, leader_move: Optional[Move]) -> Move:
-        assert self.first_move, "This bot can only play one move, after that it ends"
-        move = self.first_move
-        self.first_move = None
-        return move
+    def _order_moves(self, state: GameState, engine: GamePlayEngine, leader_move: Optional[Move], moves: Iterable[Move],
+                     table_move_id: Optional[int], depth: int) -> list[Move]:
+        """
+        Sort the moves such that the ones most likely to be best are searched first.
+
+        :param state: (GameState): The current state of the game
+        :param engine: (GamePlayEngine): The engine used to play the game
+        :param leader_move: (Optional[Move]): The move of the leader, or None if the leader is to move
+        :param moves: (Iterable[Move]): The legal moves
+        :param table_move_id: (Optional[int]): The move_id of the best move stored in the transposition table, if any
+        :param depth: (int): The number of cards left in the hands of both players
+        :returns: (list[Move]): The moves, most promising first. Moves which are equally promising keep their original order.
+        """
+        scorer = engine.trick_scorer
+        trump_suit = state.trump_suit
+        killers = self._killers.get(self._killer_slot(depth, leader_move), [])
+        history = self._history
+
+        if leader_move is None:
+            def tactical_score(move: Move) -> int:
+                # marriages give points, trump exchanges improve the hand for free, and leading with high cards is often good
+                if move.is_marriage():
+                    return 200 + (40 if move.as_marriage().suit is trump_suit else 20)
+                if move.is_trump_exchange():
+                    return 200
+                return scorer.rank_to_points(move.as_regular_move().card.rank)
+        else:
+            # after a marriage, the king is played
+            leader_card = cast(Marriage, leader_move).king_card if leader_move.is_marriage() else leader_move.as_regular_move().card
+            leader_points = scorer.rank_to_points(leader_card.rank)
+
+            def tactical_score(move: Move) -> int:
+                # win the trick taking as many points as possible, or else lose it giving away as few points as possible
+                card = move.as_regular_move().card
+                points = scorer.rank_to_points(card.rank)
+                if card.suit is leader_card.suit:
+                    wins = points > leader_points
+                else:
+                    wins = card.suit is trump_suit
+                return 200 + leader_points + points if wins else -points
+
+        def order(move: Move) -> tuple[bool, int, bool, int]:
+            return move.move_id == table_move_id, tactical_score(move), move.move_id in killers, history[move.move_id]
+
+        return sorted(moves, key=order, reverse=True)
@@ -1,5 +1,5 @@
 from typing import Optional
-from schnapsen.game import Bot, PlayerPerspective, Move, SchnapsenTrickScorer, Score
+from schnapsen.game import Bot, PlayerPerspective, Move, Score
 from schnapsen.deck import Suit, Card, Rank
 
 
@@ -55,7 +55,8 @@ class ExampleBot(Bot):
             card: Card = normal_move.cards[0]
             print(card.suit)
             print(card.rank)
-            scorer = SchnapsenTrickScorer()
+            # the engine knows the rules of the game, including how many points a card is worth
+            scorer = perspective.get_engine().trick_scorer
             points: int = scorer.rank_to_points(card.rank)
             print(points)
         return one_move
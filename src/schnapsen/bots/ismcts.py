@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import math
+import random
+import time
+from typing import Optional, cast
+
+from schnapsen.game import (
+    Bot,
+    BotState,
+    ExchangeTrick,
+    Move,
+    PlayerPerspective,
+    GameState,
+    GamePlayEngine,
+    RegularTrick,
+    Trick,
+    random_rollout_policy,
+)
+
+
+class _Node:
+    """
+    A node of the search tree of ISMCTSBot. The node is reached by playing its move from the parent node.
+    The tree is shared by all determinizations, so a move only has a child node once it has been legal in at least one of them.
+    """
+
+    __slots__ = ("move", "parent", "by_me", "children", "visits", "availability", "total_reward")
+
+    def __init__(self, move: Optional[Move], parent: Optional[_Node], by_me: bool) -> None:
+        self.move = move
+        self.parent = parent
+        # whether the move of this node is played by the bot which owns the tree
+        self.by_me = by_me
+        # maps the move_id to the child node
+        self.children: dict[int, _Node] = {}
+        self.visits = 0
+        # the number of iterations in which the move of this node was legal when its parent was visited
+        self.availability = 0
+        # the sum of the rewards of the iterations through this node, from the point of view of the player who played the move
+        self.total_reward = 0.0
+
+
+class ISMCTSBot(Bot):
+    """
+    A bot playing Information Set Monte Carlo Tree Search (single observer ISMCTS, Cowling, Powley and Whitehouse, 2012), in both phases of the game.
+
+    Each iteration guesses the unknown cards (see PlayerPerspective.make_assumption and determinization_sampler), and walks down a single tree of moves which is shared by all guesses.
+    In each node, the child is chosen with UCB1 among the moves which are legal in the current guess, counting for each move in how many visits it was available.
+    Once a move without a child node is chosen, the node is added, and the game is finished with random moves (GamePlayEngine.rollout).
+    The reward of an iteration is the number of game points won or lost, scaled to the range 0 to 1.
+    The bot plays the move of the root which was visited most.
+
+    The tree is kept between consecutive moves of the bot in a game. At the next move, the moves played since are looked up in the tree, and the search continues from the node they lead to.
+    This needs the history of the game, with an engine which does not record it (see GamePlayEngine.record_history) each move starts with a new tree.
+
+    :param rand: (random.Random): The source of randomness for this bot
+    :param iterations: (Optional[int]): The number of iterations for each move. Defaults to 1000.
+    :param time_budget: (Optional[float]): If given, the number of seconds to spend on each move. The search stops as soon as either the iterations or the time budget are used up.
+        At least one iteration is always done.
+    :param exploration: (float): The exploration constant of UCB1. Defaults to 0.7.
+    :param name: (Optional[str]): The name of this bot
+    """
+
+    # a rollout finishes the game, which never takes this many tricks
+    _ROLLOUT_DEPTH = 100
+
+    def __init__(self, rand: random.Random, iterations: Optional[int] = 1000, time_budget: Optional[float] = None, exploration: float = 0.7, name: Optional[str] = None) -> None:
+        super().__init__(name)
+        assert iterations is not None or time_budget is not None, "ISMCTSBot needs a number of iterations, a time budget, or both"
+        assert iterations is None or iterations >= 1, f"at least one iteration is needed, got {iterations}"
+        assert time_budget is None or time_budget > 0, f"the time budget must be positive, got {time_budget}"
+        self.rand = rand
+        self.iterations = iterations
+        self.time_budget = time_budget
+        self.exploration = exploration
+        self.iterations_done = 0
+        """The number of iterations done for the last move"""
+        self.reused_visits = 0
+        """The number of visits of the root which were kept from earlier moves, for the last move"""
+        self._root: Optional[_Node] = None
+        # the number of tricks played when the root was last used, and whether that root was a follower node
+        self._tricks_at_root = 0
+        self._root_was_follower = False
+
+    def get_move(self, perspective: PlayerPerspective, leader_move: Optional[Move]) -> Move:
+        deadline = time.perf_counter() + self.time_budget if self.time_budget is not None else None
+        engine = perspective.get_engine()
+        tricks_played = perspective.get_tricks_played()
+        root = self._find_root(perspective.get_game_history().tricks(), tricks_played, leader_move)
+        self._root, self._tricks_at_root, self._root_was_follower = root, tricks_played, leader_move is not None
+        self.reused_visits = root.visits
+
+        sampler = perspective.determinization_sampler(leader_move)
+        self.iterations_done = 0
+        while self.iterations is None or self.iterations_done < self.iterations:
+            if deadline is not None and self.iterations_done > 0 and time.perf_counter() >= deadline:
+                break
+            self._iterate(root, sampler.sample(self.rand), engine, leader_move)
+            self.iterations_done += 1
+
+        # our own moves are legal in every guess, moves which were not tried yet (only possible with very few iterations) are never chosen over tried ones
+        valid_moves = perspective.valid_moves()
+        return max(valid_moves, key=lambda move: root.children[move.move_id].visits if move.move_id in root.children else -1)
+
+    def notify_game_end(self, won: bool, perspective: PlayerPerspective) -> None:
+        self._root = None
+
+    def _find_root(self, tricks: list[Trick], tricks_played: int, leader_move: Optional[Move]) -> _Node:
+        """
+        Find the node for the current position in the tree kept from the previous move, or create a new tree if it is not there.
+
+        :param tricks: (list[Trick]): The tricks in the history of the game. This is empty if the engine does not record the history.
+        :param tricks_played: (int): The number of tricks played in the game so far.
+        :param leader_move: (Optional[Move]): The move of the leader, if the bot is the follower.
+        :returns: (_Node): The root for the search.
+        """
+        node = self._root
+        if node is None or tricks_played < self._tricks_at_root:
+            # a new game
+            return _Node(None, None, False)
+        if len(tricks) != tricks_played:
+            # without the history, the moves played since the old root are not known
+            return _Node(None, None, False)
+        moves: list[Move] = []
+        for trick in tricks[self._tricks_at_root:]:
+            if isinstance(trick, ExchangeTrick):
+                moves.append(trick.exchange)
+            elif isinstance(trick, RegularTrick):
+                moves.extend((trick.leader_move, trick.follower_move))
+        if self._root_was_follower:
+            # the move of the leader in the first trick was already part of the old root
+            moves = moves[1:]
+        if leader_move is not None:
+            moves.append(leader_move)
+        for move in moves:
+            child = node.children.get(move.move_id)
+            if child is None:
+                return _Node(None, None, False)
+            node = child
+        # the part of the tree above the new root can not be reached anymore
+        node.parent = None
+        return node
+
+    def _iterate(self, root: _Node, state: GameState, engine: GamePlayEngine, leader_move: Optional[Move]) -> None:
+        """
+        Do a single iteration of the search: select a path through the tree, add a node, finish the game randomly, and update the nodes on the path.
+        The state is modified during the iteration.
+
+        :param root: (_Node): The root of the tree.
+        :param state: (GameState): The guessed state of the game.
+        :param engine: (GamePlayEngine): The engine which defines the rules.
+        :param leader_move: (Optional[Move]): The move of the leader, if the bot is the follower.
+        """
+        me: BotState = state.follower if leader_move is not None else state.leader
+        node = root
+        path: list[_Node] = []
+        while not engine.trick_scorer.declare_winner(state):
+            if leader_move is None:
+                moves = list(engine.move_validator.get_legal_leader_moves(engine, state))
+                by_me = state.leader is me
+            else:
+                moves = list(engine.move_validator.get_legal_follower_moves(engine, state, leader_move))
+                by_me = state.follower is me
+            untried: list[Move] = []
+            for move in moves:
+                child = node.children.get(move.move_id)
+                if child is None:
+                    untried.append(move)
+                else:
+                    child.availability += 1
+            expand = bool(untried)
+            if expand:
+                move = self.rand.choice(untried)
+                child = node.children[move.move_id] = _Node(move, node, by_me)
+                child.availability += 1
+            else:
+                child = max((node.children[legal_move.move_id] for legal_move in moves), key=self._ucb)
+                # only the root has no move
+                move = cast(Move, child.move)
+            node = child
+            path.append(node)
+            # play the move, a trick is applied once it is complete
+            if leader_move is not None:
+                engine.apply_trick(state, leader_move, move)
+                leader_move = None
+            elif move.is_trump_exchange():
+                engine.apply_trick(state, move)
+            else:
+                leader_move = move
+            if expand:
+                break
+
+        if not engine.trick_scorer.declare_winner(state):
+            engine.rollout(state, random_rollout_policy(self.rand), self._ROLLOUT_DEPTH, leader_move=leader_move)
+        winning_info = engine.trick_scorer.declare_winner(state)
+        assert winning_info is not None, "The rollout must finish the game"
+        winner, points = winning_info
+        my_reward = (3 + (points if winner is me else -points)) / 6
+        root.visits += 1
+        for node in path:
+            node.visits += 1
+            node.total_reward += my_reward if node.by_me else 1 - my_reward
+
+    def _ucb(self, node: _Node) -> float:
+        """
+        The UCB1 value of the node, with the availability of the node in place of the visits of its parent.
+
+        :param node: (_Node): The node, which has been visited at least once.
+        :returns: (float): The value.
+        """
+        return node.total_reward / node.visits + self.exploration * math.sqrt(math.log(node.availability) / node.visits)
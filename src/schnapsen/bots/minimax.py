@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Iterable, Optional
 
 from schnapsen.game import (
     Bot,
@@ -6,11 +6,9 @@ from schnapsen.game import (
     PlayerPerspective,
     GamePhase,
     GameState,
-    FollowerPerspective,
-    LeaderPerspective,
     GamePlayEngine,
-    SchnapsenTrickScorer,
 )
+from .transposition import Bound, TranspositionTable
 
 
 class MiniMaxBot(Bot):
@@ -30,11 +28,20 @@ class MiniMaxBot(Bot):
     </pre>
     """
 
-    def __init__(self, name: Optional[str] = None) -> None:
+    def __init__(self, name: Optional[str] = None, transposition_table: Optional[TranspositionTable] = None) -> None:
+        """
+        Create a new bot.
+
+        :param name: (Optional[str]): The name of this bot
+        :param transposition_table: (Optional[TranspositionTable]): The table in which positions already searched are remembered.
+            If not provided, the bot creates its own table, which is kept for all moves the bot makes. Pass the same table to several bots to share it across bots and games.
+        """
         super().__init__(name)
+        self.transposition_table = transposition_table if transposition_table is not None else TranspositionTable()
 
     def get_move(self, perspective: PlayerPerspective, leader_move: Optional[Move]) -> Move:
         assert (perspective.get_phase() == GamePhase.TWO), "MiniMaxBot can only work in the second phase of the game."
+        self.transposition_table.new_search()
         _, move = self.value(
             perspective.get_state_in_phase_two(),
             perspective.get_engine(),
@@ -61,19 +68,26 @@ class MiniMaxBot(Bot):
         Returns:
             tuple[float, Optional[Move]]: _description_
         """
-        my_perspective: PlayerPerspective
+        table = self.transposition_table
+        depth = len(state.leader.hand) + len(state.follower.hand)
+        use_table = depth >= table.min_depth
+        if use_table:
+            key = table.node_key(state, leader_move, maximizing)
+            entry = table.probe(key)
+            # minimax only stores exact values, but the table might be shared with an AlphaBetaBot which also stores bounds
+            if entry is not None and entry.bound is Bound.EXACT:
+                return entry.value, entry.move
+
+        valid_moves: Iterable[Move]
         if leader_move is None:
             # we are the leader
-            my_perspective = LeaderPerspective(state, engine)
+            valid_moves = engine.move_validator.get_legal_leader_moves(engine, state)
         else:
-            my_perspective = FollowerPerspective(state, engine, leader_move)
-        valid_moves = my_perspective.valid_moves()
+            valid_moves = engine.move_validator.get_legal_follower_moves(engine, state, leader_move)
 
         best_value = float("-inf") if maximizing else float("inf")
         best_move: Optional[Move] = None
         for move in valid_moves:
-            leader: Bot
-            follower: Bot
             if leader_move is None:
                 # we are leader, call self to get the follower to play
                 value, _ = self.value(
@@ -84,14 +98,13 @@ class MiniMaxBot(Bot):
                 )
             else:
                 # We are the follower. We need to complete the trick and then call self to play the next trick, with the correct maximizing, depending on who is the new leader
-                leader = OneFixedMoveBot(leader_move)
-                follower = OneFixedMoveBot(move)
-                new_game_state = engine.play_one_trick(game_state=state, new_leader=leader, new_follower=follower)
-                winning_info = SchnapsenTrickScorer().declare_winner(new_game_state)
+                # The trick is applied to the state itself, and undone after the evaluation, such that no copies of the state are needed.
+                undo = engine.apply_trick(state, leader_move=leader_move, follower_move=move)
+                winning_info = engine.trick_scorer.declare_winner(state)
                 if winning_info:
-                    winner = winning_info[0].implementation
+                    winner = winning_info[0]
                     points = winning_info[1]
-                    follower_wins = winner == follower
+                    follower_wins = winner is undo.follower
 
                     if not follower_wins:
                         points = -points
@@ -100,7 +113,7 @@ class MiniMaxBot(Bot):
                     value = points
                 else:
                     # play the next round by doing a recursive call
-                    leader_stayed = leader == new_game_state.leader.implementation
+                    leader_stayed = state.leader is undo.leader
 
                     if leader_stayed:
                         # At the next step, the leader is our opponent, and it will be doing the opposite of what we do.
@@ -109,7 +122,8 @@ class MiniMaxBot(Bot):
                         # At the next step we will have become the leader, so we will keep doing what we did
                         next_maximizing = maximizing
                     # implementation note: the previous two case could be written with a xor, but this seemed more readable
-                    value, _ = self.value(new_game_state, engine, None, next_maximizing)
+                    value, _ = self.value(state, engine, None, next_maximizing)
+                engine.undo_trick(state, undo)
             if maximizing and value > best_value:
                 best_move = move
                 best_value = value
@@ -117,15 +131,6 @@ class MiniMaxBot(Bot):
                 best_move = move
                 best_value = value
         assert best_move  # We are sure the best_move can no longer be None. We assert to make sure we did not make a logical mistake
+        if use_table:
+            table.store(key, best_value, Bound.EXACT, best_move, depth)
         return best_value, best_move
-
-
-class OneFixedMoveBot(Bot):
-    def __init__(self, move: Move) -> None:
-        self.first_move: Optional[Move] = move
-
-    def get_move(self, perspective: PlayerPerspective, leader_move: Optional[Move]) -> Move:
-        assert self.first_move, "This bot can only play one move, after that it ends"
-        move = self.first_move
-        self.first_move = None
-        return move
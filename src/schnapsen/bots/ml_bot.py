@@ -1,5 +1,5 @@
-from schnapsen.game import Bot, PlayerPerspective, SchnapsenDeckGenerator, Move, Trick, GamePhase, GamePlayEngine, SchnapsenGamePlayEngine
-from typing import Optional, cast, Literal
+from schnapsen.game import Bot, PlayerPerspective, SchnapsenDeckGenerator, Move, Trick, ExchangeTrick, RegularTrick, GamePhase, GamePlayEngine, SchnapsenGamePlayEngine
+from typing import Any, Optional, cast, Literal
 from schnapsen.deck import Suit, Rank
 from sklearn.neural_network import MLPClassifier
 from sklearn.linear_model import LogisticRegression
@@ -22,8 +22,8 @@ class MLPlayingBot(Bot):
         super().__init__(name)
         model_location = model_location
         assert model_location.exists(), f"Model could not be found at: {model_location}"
-        # load model
-        self.__model = joblib.load(model_location)
+        # load model, bots created for many games in the same process share it
+        self.__model = _load_model(model_location)
 
     def get_move(self, perspective: PlayerPerspective, leader_move: Optional[Move]) -> Move:
         # get the sate feature representation
@@ -62,6 +62,25 @@ class MLPlayingBot(Bot):
         return best_move
 
 
+# The models loaded in this process, by their resolved location and modification time, such that a model which is trained again is loaded again
+_loaded_models: dict[tuple[pathlib.Path, int], Any] = {}
+
+
+def _load_model(model_location: pathlib.Path) -> Any:
+    """
+    Load the model stored in the file, or get it from the models loaded earlier in this process.
+
+    :param model_location: The file containing the model.
+    :return: The model.
+    """
+    path = model_location.resolve()
+    key = (path, path.stat().st_mtime_ns)
+    model = _loaded_models.get(key)
+    if model is None:
+        model = _loaded_models[key] = joblib.load(path)
+    return model
+
+
 class MLDataBot(Bot):
     """
     This class is defined to allow the creation of a training schnapsen bot dataset, that allows us to train a Machine Learning (ML) Bot
@@ -105,12 +124,14 @@ class MLDataBot(Bot):
         # we iterate over all the rounds of the game
         for round_player_perspective, round_trick in game_history:
 
+            leader_move: Move
+            follower_move: Optional[Move]
             if round_trick.is_trump_exchange():
-                leader_move = round_trick.exchange
+                leader_move = cast(ExchangeTrick, round_trick).exchange
                 follower_move = None
             else:
-                leader_move = round_trick.leader_move
-                follower_move = round_trick.follower_move
+                leader_move = cast(RegularTrick, round_trick).leader_move
+                follower_move = cast(RegularTrick, round_trick).follower_move
 
             # we do not want this representation to include actions that followed. So if this agent was the leader, we ignore the followers move
             if round_player_perspective.am_i_leader():
@@ -311,15 +332,15 @@ def get_move_feature_vector(move: Optional[Move]) -> list[int]:
         # in case the move is a marriage move
         if move.is_marriage():
             move_type_one_hot_encoding = [0, 0, 1]
-            card = move.queen_card
+            card = move.as_marriage().queen_card
         #  in case the move is a trump exchange move
         elif move.is_trump_exchange():
             move_type_one_hot_encoding = [0, 1, 0]
-            card = move.jack
+            card = move.as_trump_exchange().jack
         #  in case it is a regular move
         else:
             move_type_one_hot_encoding = [1, 0, 0]
-            card = move.card
+            card = move.as_regular_move().card
         move_type_one_hot_encoding_numpy_array = move_type_one_hot_encoding
         card_rank_one_hot_encoding_numpy_array = get_one_hot_encoding_of_card_rank(card.rank)
         card_suit_one_hot_encoding_numpy_array = get_one_hot_encoding_of_card_suit(card.suit)
@@ -1,22 +1,39 @@
+from concurrent.futures import ProcessPoolExecutor
+import math
 from typing import Optional
-from schnapsen.game import Bot, PlayerPerspective, Move, GameState, GamePlayEngine
+import time
+from schnapsen.game import Bot, DeterminizationSampler, PlayerPerspective, Move, GameState, GamePlayEngine, random_rollout_policy
 import random
 
-from .rand import RandBot
-
 
 class RdeepBot(Bot):
     """
     Rdeep bot is a bot which performs many random rollouts of the game to decide which move to play.
+
+    With a time_budget, the bot works in anytime mode: it keeps taking samples until the budget for the move is used up, and then plays the best move found so far.
+
+    With successive_halving, the samples are taken in rounds, and after each round the worse half of the remaining moves is dropped.
+    The samples are spread over the rounds such that each round takes twice as many as the one before, so most rollouts go to the moves which are close to the best one.
+    The moves left in the last round are evaluated on all num_samples samples, while the total number of rollouts is a fraction of the rollouts needed to evaluate all moves on all samples.
+
+    With processes, the rollouts are done by a pool of worker processes. The pool is created when it is first needed, and kept for later moves, games and other bots using the same number of processes.
+    Call shutdown_rollout_pools to stop the worker processes when they are no longer needed.
+    The guesses of the unknown cards and the seeds of the rollouts are still drawn from rand in the main process, so the bot plays exactly the same moves as without processes.
     """
-    def __init__(self, num_samples: int, depth: int, rand: random.Random, name: Optional[str] = None) -> None:
+    def __init__(self, num_samples: int, depth: int, rand: random.Random, name: Optional[str] = None, time_budget: Optional[float] = None,
+                 successive_halving: bool = False, processes: Optional[int] = None) -> None:
         """
         Create a new rdeep bot.
 
-        :param num_samples: how many samples to take per move
+        :param num_samples: how many samples to take, every move is evaluated on each of them
         :param depth: how deep to sample
         :param rand: the source of randomness for this Bot
         :param name: the name of this Bot
+        :param time_budget: if given, the number of seconds to spend on each move. Samples are then taken until the time is used up, or num_samples samples are taken.
+            At least one sample is always completed, so the budget can be exceeded by the time needed for one sample.
+        :param successive_halving: whether to drop the worse half of the moves after each round of samples, instead of evaluating all moves on all samples
+        :param processes: if given, the number of worker processes doing the rollouts. With a time_budget, the samples are then sent to the workers in waves
+            of one sample per process, and the budget can be exceeded by the time needed for one wave.
         """
         super().__init__(name)
         assert num_samples >= 1, f"we cannot work with less than one sample, got {num_samples}"
@@ -24,73 +41,192 @@ class RdeepBot(Bot):
         self.__num_samples = num_samples
         self.__depth = depth
         self.__rand = rand
+        assert time_budget is None or time_budget > 0, f"the time budget must be positive, got {time_budget}"
+        self.__time_budget = time_budget
+        self.__successive_halving = successive_halving
+        assert processes is None or processes >= 1, f"at least one process is needed for the rollouts, got {processes}"
+        self.__processes = processes
+        self.samples_taken = 0
+        """The number of samples the last move was based on"""
+        self.rollouts = 0
+        """The number of rollouts (evaluations of a move on a sample) done for the last move"""
 
     def get_move(self, perspective: PlayerPerspective, leader_move: Optional[Move]) -> Move:
+        deadline = time.perf_counter() + self.__time_budget if self.__time_budget is not None else None
         # get the list of valid moves, and shuffle it such
         # that we get a random move of the highest scoring
         # ones if there are multiple highest scoring moves.
         moves = perspective.valid_moves()
         self.__rand.shuffle(moves)
+        engine = perspective.get_engine()
+        # the unknown cards are worked out once, and then guessed for each sample
+        sampler = perspective.determinization_sampler(leader_move)
+
+        # All moves are evaluated on the same samples (common random numbers): each sample is a single guess of the unknown cards,
+        # together with a seed for the random play after our move. This way, differences between the moves are not due to some moves getting luckier samples.
+        sum_of_scores = [0.0] * len(moves)
+        # the indices of the moves which are still considered, all of them have been evaluated on all samples taken so far
+        remaining = list(range(len(moves)))
+        self.samples_taken = 0
+        self.rollouts = 0
+        for round_samples in self.__rounds(len(moves)):
+            remaining_moves = [moves[index] for index in remaining]
+            if self.__processes is None:
+                self.__take_samples(sampler, engine, leader_move, remaining_moves, round_samples, deadline, remaining, sum_of_scores)
+            else:
+                self.__take_samples_in_pool(sampler, engine, leader_move, remaining_moves, round_samples, deadline, remaining, sum_of_scores)
+            if self.__out_of_time(deadline):
+                break
+            if self.__successive_halving:
+                # keep the better half, in case of ties the moves which come first in the shuffled order
+                remaining = sorted(remaining, key=lambda index: sum_of_scores[index], reverse=True)[:(len(remaining) + 1) // 2]
+                remaining.sort()
 
         best_score = float('-inf')
         best_move = None
-        for move in moves:
-            sum_of_scores = 0.0
-            for _ in range(self.__num_samples):
-                gamestate = perspective.make_assumption(leader_move=leader_move, rand=self.__rand)
-                score = self.__evaluate(gamestate, perspective.get_engine(), leader_move, move)
-                sum_of_scores += score
-            average_score = sum_of_scores / self.__num_samples
-            if average_score > best_score:
-                best_score = average_score
-                best_move = move
+        for index in remaining:
+            if sum_of_scores[index] > best_score:
+                best_score = sum_of_scores[index]
+                best_move = moves[index]
         assert best_move is not None
         return best_move
 
-    def __evaluate(self, gamestate: GameState, engine: GamePlayEngine, leader_move: Optional[Move], my_move: Move) -> float:
+    def __rounds(self, number_of_moves: int) -> list[int]:
         """
-        Evaluates the value of the given state for the given player
-        :param state: The state to evaluate
-        :param player: The player for whom to evaluate this state (1 or 2)
-        :return: A float representing the value of this state for the given player. The higher the value, the better the
-                state is for the player.
+        Determine how many samples to take in each round.
+        :param number_of_moves: the number of valid moves
+        :return: the number of samples for each round, adding up to num_samples
         """
-        me: Bot
-        leader_bot: Bot
-        follower_bot: Bot
-
-        if leader_move:
-            # we know what the other bot played
-            leader_bot = FirstFixedMoveThenBaseBot(RandBot(rand=self.__rand), leader_move)
-            # I am the follower
-            me = follower_bot = FirstFixedMoveThenBaseBot(RandBot(rand=self.__rand), my_move)
-        else:
-            # I am the leader bot
-            me = leader_bot = FirstFixedMoveThenBaseBot(RandBot(rand=self.__rand), my_move)
-            # We assume the other bot just random
-            follower_bot = RandBot(self.__rand)
-
-        new_game_state, _ = engine.play_at_most_n_tricks(game_state=gamestate, new_leader=leader_bot, new_follower=follower_bot, n=self.__depth)
-
-        if new_game_state.leader.implementation is me:
-            my_score = new_game_state.leader.score.direct_points
-            opponent_score = new_game_state.follower.score.direct_points
-        else:
-            my_score = new_game_state.follower.score.direct_points
-            opponent_score = new_game_state.leader.score.direct_points
-
-        heuristic = my_score / (my_score + opponent_score)
-        return heuristic
-
-
-class FirstFixedMoveThenBaseBot(Bot):
-    def __init__(self, base_bot: Bot, first_move: Move) -> None:
-        self.first_move = first_move
-        self.first_move_played = False
-        self.base_bot = base_bot
+        if not self.__successive_halving or number_of_moves <= 2:
+            return [self.__num_samples]
+        # enough rounds to get down to a single move, each round twice as many samples as the previous one
+        number_of_rounds = math.ceil(math.log2(number_of_moves))
+        if self.__num_samples < number_of_rounds:
+            # too few samples to give each round at least one, so all moves are evaluated on all of them
+            return [self.__num_samples]
+        rounds = [max(1, self.__num_samples * 2**round_index // (2**number_of_rounds - 1)) for round_index in range(number_of_rounds - 1)]
+        rounds.append(self.__num_samples - sum(rounds))
+        assert rounds[-1] >= 1, f"The rounds {rounds} do not add up to {self.__num_samples} samples"
+        return rounds
 
-    def get_move(self, perspective: PlayerPerspective, leader_move: Optional[Move]) -> Move:
-        if not self.first_move_played:
-            self.first_move_played = True
-            return self.first_move
-        return self.base_bot.get_move(perspective=perspective, leader_move=leader_move)
+    def __take_samples(self, sampler: DeterminizationSampler, engine: GamePlayEngine, leader_move: Optional[Move], moves: list[Move], count: int,
+                       deadline: Optional[float], indices: list[int], sum_of_scores: list[float]) -> None:
+        """
+        Take samples, and evaluate the moves on them in this process.
+        :param sampler: the sampler for the guesses of the unknown cards
+        :param moves: the moves to evaluate
+        :param count: the number of samples to take
+        :param deadline: the time (as given by time.perf_counter) at which the time budget is used up, None if there is no budget.
+            A sample which is incomplete when the budget is used up is dropped, such that all moves are still evaluated on the same samples.
+        :param indices: for each move, the index in sum_of_scores to which its scores are added
+        :param sum_of_scores: the sums of the scores of the moves, updated with the scores of the samples
+        """
+        for _ in range(count):
+            if self.__out_of_time(deadline):
+                return
+            gamestate = sampler.sample(self.__rand)
+            rollout_seed = self.__rand.getrandbits(64)
+            scores: list[float] = []
+            for move in moves:
+                if self.__out_of_time(deadline):
+                    return
+                scores.append(_evaluate(gamestate, engine, leader_move, move, self.__depth, random.Random(rollout_seed)))
+                self.rollouts += 1
+            for index, score in zip(indices, scores):
+                sum_of_scores[index] += score
+            self.samples_taken += 1
+
+    def __take_samples_in_pool(self, sampler: DeterminizationSampler, engine: GamePlayEngine, leader_move: Optional[Move], moves: list[Move], count: int,
+                               deadline: Optional[float], indices: list[int], sum_of_scores: list[float]) -> None:
+        """
+        Take samples, and evaluate the moves on them in the pool of worker processes. The parameters are the same as for __take_samples.
+        """
+        assert self.__processes is not None
+        pool = _get_rollout_pool(self.__processes)
+        taken = 0
+        while taken < count and not self.__out_of_time(deadline):
+            # without a budget all samples are sent at once, otherwise one sample per process, such that the budget can be checked in between
+            wave = count - taken if deadline is None else min(self.__processes, count - taken)
+            samples = []
+            for _ in range(wave):
+                sample = sampler.sample(self.__rand)
+                # the history holds the real bots, which cannot always be sent to another process. The rollouts do not need it.
+                sample.previous = None
+                samples.append((sample, self.__rand.getrandbits(64)))
+            # split the samples in one contiguous chunk per process, such that the engine is only sent once per chunk
+            chunk_size = math.ceil(wave / self.__processes)
+            chunks = [samples[start:start + chunk_size] for start in range(0, wave, chunk_size)]
+            for chunk_scores in pool.map(_evaluate_samples, [engine] * len(chunks), [self.__depth] * len(chunks), [leader_move] * len(chunks), [moves] * len(chunks), chunks):
+                for scores in chunk_scores:
+                    for index, score in zip(indices, scores):
+                        sum_of_scores[index] += score
+            self.rollouts += wave * len(moves)
+            self.samples_taken += wave
+            taken += wave
+
+    def __out_of_time(self, deadline: Optional[float]) -> bool:
+        """
+        Whether sampling must stop because the time budget is used up. This is never the case before the first sample is complete.
+        :param deadline: the time (as given by time.perf_counter) at which the budget is used up, None if there is no budget
+        :return: True if sampling must stop
+        """
+        return deadline is not None and self.samples_taken > 0 and time.perf_counter() >= deadline
+
+
+def _evaluate(gamestate: GameState, engine: GamePlayEngine, leader_move: Optional[Move], my_move: Move, depth: int, rand: random.Random) -> float:
+    """
+    Evaluates the value of the given state for the given player
+    :param state: The state to evaluate. It is modified during the rollout, but restored before returning.
+    :param player: The player for whom to evaluate this state (1 or 2)
+    :param depth: The number of tricks to play, including the current one
+    :param rand: The source of randomness for the random play after my_move
+    :return: A float representing the value of this state for the given player. The higher the value, the better the
+            state is for the player.
+    """
+    # the players are identified by their BotState, which stays the same object when the leader changes
+    me, opponent = (gamestate.follower, gamestate.leader) if leader_move else (gamestate.leader, gamestate.follower)
+    # we know what the other bot played (if anything), and assume that afterwards both players play randomly
+    if leader_move:
+        undos = engine.rollout(gamestate, random_rollout_policy(rand), depth, leader_move=leader_move, follower_move=my_move)
+    else:
+        undos = engine.rollout(gamestate, random_rollout_policy(rand), depth, leader_move=my_move)
+    my_score = me.score.direct_points
+    opponent_score = opponent.score.direct_points
+    engine.undo_rollout(gamestate, undos)
+
+    heuristic = my_score / (my_score + opponent_score)
+    return heuristic
+
+
+def _evaluate_samples(engine: GamePlayEngine, depth: int, leader_move: Optional[Move], moves: list[Move], samples: list[tuple[GameState, int]]) -> list[list[float]]:
+    """
+    Evaluates the moves on each of the samples. This is the task done by the worker processes of RdeepBot.
+    :param samples: the guessed states of the game, each with the seed of the rollouts
+    :return: for each sample, the scores of the moves
+    """
+    return [[_evaluate(gamestate, engine, leader_move, move, depth, random.Random(rollout_seed)) for move in moves] for gamestate, rollout_seed in samples]
+
+
+# The pools of worker processes used by RdeepBot, by the number of processes. They are kept until shutdown_rollout_pools is called, or the program ends.
+_rollout_pools: dict[int, ProcessPoolExecutor] = {}
+
+
+def _get_rollout_pool(processes: int) -> ProcessPoolExecutor:
+    """
+    Get the pool with the given number of processes, creating it if it does not exist yet.
+    :param processes: the number of worker processes
+    :return: the pool
+    """
+    pool = _rollout_pools.get(processes)
+    if pool is None:
+        pool = _rollout_pools[processes] = ProcessPoolExecutor(max_workers=processes)
+    return pool
+
+
+def shutdown_rollout_pools() -> None:
+    """
+    Stop the worker processes of all RdeepBots using processes. Bots which make another move afterwards start a new pool.
+    """
+    while _rollout_pools:
+        _, pool = _rollout_pools.popitem()
+        pool.shutdown()
@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import mmap
+import pathlib
+import random
+import struct
+from typing import Any, Iterable, Optional, Union
+
+from schnapsen.game import (
+    Bot,
+    Move,
+    PlayerPerspective,
+    GamePhase,
+    GameState,
+    GamePlayEngine,
+)
+from .alphabeta import AlphaBetaBot
+from .transposition import TranspositionTable
+
+
+class _TablebaseSolver:
+    """
+    Solves phase two positions exactly, remembering the value and best move of every position it visits.
+
+    :param engine: (GamePlayEngine): The engine which defines the rules
+    """
+
+    def __init__(self, engine: GamePlayEngine) -> None:
+        self.engine = engine
+        # maps the node key (see TranspositionTable.node_key with maximizing=True) to the value for the player to move and the id of the best move
+        self.results: dict[int, tuple[int, int]] = {}
+
+    def solve(self, state: GameState, leader_move: Optional[Move]) -> int:
+        """
+        Solve the position. The state is modified during the search, but restored before returning.
+
+        :param state: (GameState): The state of the game, in phase two
+        :param leader_move: (Optional[Move]): The move of the leader, or None if the leader is to move
+        :returns: (int): The game points the player to move wins, negative if the player loses
+        """
+        key = TranspositionTable.node_key(state, leader_move, True)
+        known = self.results.get(key)
+        if known is not None:
+            return known[0]
+        engine = self.engine
+        best_value = -4  # less than the worst possible outcome, losing 3 game points
+        best_move: Optional[Move] = None
+        if leader_move is None:
+            for move in engine.move_validator.get_legal_leader_moves(engine, state):
+                # the follower is the opponent of the leader
+                value = -self.solve(state, move)
+                if value > best_value:
+                    best_value, best_move = value, move
+        else:
+            for move in engine.move_validator.get_legal_follower_moves(engine, state, leader_move):
+                undo = engine.apply_trick(state, leader_move=leader_move, follower_move=move)
+                winning_info = engine.trick_scorer.declare_winner(state)
+                if winning_info:
+                    winner, points = winning_info
+                    value = points if winner is undo.follower else -points
+                elif state.leader is undo.follower:
+                    # we won the trick and lead the next one
+                    value = self.solve(state, None)
+                else:
+                    value = -self.solve(state, None)
+                engine.undo_trick(state, undo)
+                if value > best_value:
+                    best_value, best_move = value, move
+        assert best_move is not None, "A position in which the game is not over must have legal moves"
+        self.results[key] = (best_value, best_move.move_id)
+        return best_value
+
+
+class Tablebase:
+    """
+    A read-only table with the solved values and best moves of phase two positions, stored in a binary file which is memory-mapped.
+    The operating system loads the parts of the file which are used on demand, and shares them between processes which open the same file.
+
+    The file starts with a header (the magic bytes, the number of slots, and the number of entries), followed by an open-addressing hash table.
+    Each slot holds the key of the position (see TranspositionTable.node_key, with maximizing=True), the game points won by the player to move, and the move_id of the best move plus one.
+    A slot in which the last field is 0 is empty.
+
+    Tablebases are created with generate_tablebase. The values are only valid for the engine used to generate them.
+
+    :param path: (Union[str, pathlib.Path]): The file containing the tablebase
+    """
+
+    MAGIC = b"SCHNTB01"
+    _HEADER = struct.Struct("<8sQQ")
+    _SLOT = struct.Struct("<QbB")
+
+    def __init__(self, path: Union[str, pathlib.Path]) -> None:
+        self.path = pathlib.Path(path)
+        self._open()
+
+    def _open(self) -> None:
+        with open(self.path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._slot_count, self._entry_count = Tablebase._HEADER.unpack_from(self._map, 0)
+        if magic != Tablebase.MAGIC:
+            self._map.close()
+            raise Exception(f"The file {self.path} is not a Schnapsen tablebase")
+
+    def lookup(self, state: GameState, leader_move: Optional[Move]) -> Optional[tuple[int, Move]]:
+        """
+        Look up the position in the tablebase.
+
+        :param state: (GameState): The state of the game, in phase two
+        :param leader_move: (Optional[Move]): The move of the leader, or None if the leader is to move
+        :returns: (Optional[tuple[int, Move]]): The game points the player to move wins (negative if the player loses) and the best move, or None if the position is not in the tablebase.
+        """
+        key = TranspositionTable.node_key(state, leader_move, True)
+        slot = key % self._slot_count
+        header_size, slot_struct = Tablebase._HEADER.size, Tablebase._SLOT
+        while True:
+            stored_key, value, move_id_plus_one = slot_struct.unpack_from(self._map, header_size + slot * slot_struct.size)
+            if move_id_plus_one == 0:
+                return None
+            if stored_key == key:
+                return value, Move.from_id(move_id_plus_one - 1)
+            slot = (slot + 1) % self._slot_count
+
+    @staticmethod
+    def write(path: Union[str, pathlib.Path], results: dict[int, tuple[int, int]], load_factor: float = 0.5) -> None:
+        """
+        Write solved positions to a tablebase file.
+
+        :param path: (Union[str, pathlib.Path]): The file to write to. It is overwritten if it exists.
+        :param results: (dict[int, tuple[int, int]]): Maps the key of each position to its value and the move_id of its best move.
+        :param load_factor: (float): The maximum fraction of the slots which gets filled. Lower values make lookups faster and the file larger.
+        """
+        assert 0 < load_factor < 1, f"The load factor must be between 0 and 1, got {load_factor}"
+        slot_count = 1
+        while slot_count * load_factor < len(results):
+            slot_count *= 2
+        header_size, slot_struct = Tablebase._HEADER.size, Tablebase._SLOT
+        buffer = bytearray(header_size + slot_count * slot_struct.size)
+        Tablebase._HEADER.pack_into(buffer, 0, Tablebase.MAGIC, slot_count, len(results))
+        for key, (value, move_id) in results.items():
+            slot = key % slot_count
+            while slot_struct.unpack_from(buffer, header_size + slot * slot_struct.size)[2] != 0:
+                slot = (slot + 1) % slot_count
+            slot_struct.pack_into(buffer, header_size + slot * slot_struct.size, key, value, move_id + 1)
+        pathlib.Path(path).write_bytes(buffer)
+
+    def close(self) -> None:
+        """Close the memory map of the file."""
+        self._map.close()
+
+    def __len__(self) -> int:
+        """
+        The number of positions in the tablebase.
+
+        :returns: (int): The number of positions
+        """
+        return int(self._entry_count)
+
+    def __enter__(self) -> Tablebase:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __getstate__(self) -> dict[str, Any]:
+        # A memory map cannot be pickled. The file is mapped again when unpickling, for example in another process.
+        return {"path": self.path}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.path = state["path"]
+        self._open()
+
+    def __repr__(self) -> str:
+        return f"Tablebase(path={self.path})"
+
+
+def generate_tablebase(path: Union[str, pathlib.Path], engine: GamePlayEngine, roots: Iterable[GameState], load_factor: float = 0.5) -> int:
+    """
+    Solve the given phase two positions and every position which can be reached from them, and write the results to a tablebase file.
+
+    :param path: (Union[str, pathlib.Path]): The file to write the tablebase to. It is overwritten if it exists.
+    :param engine: (GamePlayEngine): The engine which defines the rules. The tablebase is only valid for this engine.
+    :param roots: (Iterable[GameState]): The positions to solve, all in phase two.
+    :param load_factor: (float): The maximum fraction of slots in the file which gets filled.
+    :returns: (int): The number of positions in the tablebase.
+    """
+    solver = _TablebaseSolver(engine)
+    for root in roots:
+        assert root.game_phase() is GamePhase.TWO, "Only positions in phase two can be put in a tablebase"
+        solver.solve(root, None)
+    Tablebase.write(path, solver.results, load_factor)
+    return len(solver.results)
+
+
+def generate_random_tablebase(path: Union[str, pathlib.Path], engine: GamePlayEngine, number_of_deals: int, rand: random.Random, load_factor: float = 0.5) -> int:
+    """
+    Generate a tablebase for the phase two positions reachable from the start of phase two in the given number of random games, see generate_tablebase.
+    The start positions are obtained with GamePlayEngine.get_random_phase_two_state.
+
+    :param path: (Union[str, pathlib.Path]): The file to write the tablebase to. It is overwritten if it exists.
+    :param engine: (GamePlayEngine): The engine which defines the rules.
+    :param number_of_deals: (int): The number of random games to play until phase two.
+    :param rand: (random.Random): The source of randomness for the games.
+    :param load_factor: (float): The maximum fraction of slots in the file which gets filled.
+    :returns: (int): The number of positions in the tablebase.
+    """
+    return generate_tablebase(path, engine, (engine.get_random_phase_two_state(rand) for _ in range(number_of_deals)), load_factor)
+
+
+class TablebaseBot(Bot):
+    """
+    A bot for the second phase of the game which looks up its moves in a Tablebase.
+    Positions which are not in the tablebase, or for which the stored move is not legal, are searched by the fallback bot instead.
+    Like AlphaBetaBot, it cannot be used for the first phase. Delegate to it from your own bot in the second phase.
+
+    :param tablebase: (Tablebase): The tablebase with the solved positions
+    :param fallback: (Optional[Bot]): The bot used for positions which are not in the tablebase. Defaults to an AlphaBetaBot.
+    :param name: (Optional[str]): The name of this bot
+    """
+
+    def __init__(self, tablebase: Tablebase, fallback: Optional[Bot] = None, name: Optional[str] = None) -> None:
+        super().__init__(name)
+        self.tablebase = tablebase
+        self.fallback = fallback if fallback is not None else AlphaBetaBot()
+        self.hits = 0
+        """The number of moves found in the tablebase"""
+        self.misses = 0
+        """The number of moves for which the fallback bot was used, including those with an illegal stored move"""
+
+    def get_move(self, perspective: PlayerPerspective, leader_move: Optional[Move]) -> Move:
+        assert (perspective.get_phase() == GamePhase.TWO), "TablebaseBot can only work in the second phase of the game."
+        found = self.tablebase.lookup(perspective.get_state_in_phase_two(), leader_move)
+        # a collision of the keys, or a tablebase built for other rules, can give a move which is not legal here
+        if found is None or found[1] not in perspective.valid_moves():
+            self.misses += 1
+            return self.fallback.get_move(perspective, leader_move)
+        self.hits += 1
+        return found[1]
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import Enum
+import random
+from typing import Optional
+
+from schnapsen.game import GameState, Move, NUMBER_OF_MOVES
+
+
+class Bound(Enum):
+    """
+    Indicates how the value stored in a TranspositionEntry relates to the true value of the position.
+    """
+    EXACT = 1
+    """The value is the true value of the position"""
+    LOWER = 2
+    """The search was cut off because the value was at least beta. The true value is at least the stored value."""
+    UPPER = 3
+    """No move reached alpha. The true value is at most the stored value."""
+
+
+@dataclass(frozen=True)
+class TranspositionEntry:
+    """
+    The result of searching a single position, as stored in a TranspositionTable.
+    """
+
+    key: int
+    """The full key of the position, see TranspositionTable.node_key"""
+    value: float
+    """The value found by the search"""
+    bound: Bound
+    """How value relates to the true value of the position"""
+    move_id: int
+    """The move_id of the best move found by the search"""
+    depth: int
+    """The size of the searched subtree, measured as the number of cards left in the hands of both players"""
+    generation: int
+    """The generation of the table in which the entry was stored"""
+
+    @property
+    def move(self) -> Move:
+        """The best move found by the search"""
+        return Move.from_id(self.move_id)
+
+    def is_usable(self, alpha: float, beta: float) -> bool:
+        """
+        Whether the stored value can be returned by a search with the given window, without searching the position again.
+        This is the case if the value is exact, or if the bound it gives already causes a cutoff.
+
+        :param alpha: (float): The lower end of the search window.
+        :param beta: (float): The upper end of the search window.
+        :returns: (bool): Whether the value can be used.
+        """
+        if self.bound is Bound.EXACT:
+            return True
+        if self.bound is Bound.LOWER:
+            return self.value >= beta
+        return self.value <= alpha
+
+
+def _make_node_salts() -> list[tuple[int, int]]:
+    # A fixed seed, such that keys are the same in every process
+    rng = random.Random(0x7A8B)
+    return [(rng.getrandbits(64), rng.getrandbits(64)) for _ in range(NUMBER_OF_MOVES + 1)]
+
+
+class TranspositionTable:
+    """
+    A bounded table remembering the values of positions which have already been searched by AlphaBetaBot or MiniMaxBot.
+    Different orders of moves often lead to the same position, with such a table it only needs to be searched once.
+
+    Positions are identified by GameState.zobrist_key, combined with the move of the leader (for the follower's turn) and whether the player to move is maximizing.
+    The values stored are game points from the point of view of the maximizing player, so they do not depend on the bot which searched them.
+    This means that a table can be kept across calls within a game, and can be shared across games and bots, as long as they use the same engine.
+
+    Each key has exactly one slot in the table. When that slot is taken by a different position, the new entry replaces it if the old entry is from an earlier search
+    (see new_search), or if the new entry covers a subtree which is at least as large.
+
+    :param size: (int): The number of slots in the table. Defaults to 2**16.
+    :param min_depth: (int): Nodes with fewer cards left in the hands of both players are cheaper to search again than to look up, the bots do not use the table for them. Defaults to 4.
+    """
+
+    # Salts which are combined with the key of the state, such that the same state with a different node type gets a different key.
+    # _NODE_SALTS[leader_move_id + 1][maximizing], where leader_move_id is -1 in case the leader is to move.
+    _NODE_SALTS: list[tuple[int, int]] = _make_node_salts()
+
+    def __init__(self, size: int = 2**16, min_depth: int = 4) -> None:
+        assert size >= 1, f"The size of the transposition table must be at least 1, got {size}"
+        self.size = size
+        self.min_depth = min_depth
+        self.generation = 0
+        self._entries: list[Optional[TranspositionEntry]] = [None] * size
+        self.probes = 0
+        """The number of lookups done in the table"""
+        self.hits = 0
+        """The number of lookups which found an entry"""
+
+    @staticmethod
+    def node_key(state: GameState, leader_move: Optional[Move], maximizing: bool) -> int:
+        """
+        Compute the key of a search node.
+
+        :param state: (GameState): The state of the game in the node.
+        :param leader_move: (Optional[Move]): The move already played by the leader, or None if the leader is to move.
+        :param maximizing: (bool): Whether the player to move is the maximizing player.
+        :returns: (int): The 64 bit key of the node.
+        """
+        salts = TranspositionTable._NODE_SALTS[leader_move.move_id + 1 if leader_move else 0]
+        return state.zobrist_key() ^ salts[maximizing]
+
+    def new_search(self) -> None:
+        """
+        Mark the start of a new search. Entries from earlier searches stay usable, but are replaced first.
+        """
+        self.generation += 1
+
+    def probe(self, key: int) -> Optional[TranspositionEntry]:
+        """
+        Look up the entry for the given key.
+
+        :param key: (int): The key of the node, see node_key.
+        :returns: (Optional[TranspositionEntry]): The entry stored for this key, or None if there is none.
+        """
+        self.probes += 1
+        entry = self._entries[key % self.size]
+        if entry is None or entry.key != key:
+            return None
+        self.hits += 1
+        return entry
+
+    def store(self, key: int, value: float, bound: Bound, move: Move, depth: int) -> None:
+        """
+        Store the result of searching a node, if the replacement policy allows it.
+
+        :param key: (int): The key of the node, see node_key.
+        :param value: (float): The value found by the search.
+        :param bound: (Bound): How the value relates to the true value of the node.
+        :param move: (Move): The best move found by the search.
+        :param depth: (int): The size of the searched subtree, measured as the number of cards left in the hands of both players.
+        """
+        slot = key % self.size
+        old = self._entries[slot]
+        if old is None or old.key == key or old.generation != self.generation or depth >= old.depth:
+            self._entries[slot] = TranspositionEntry(key, value, bound, move.move_id, depth, self.generation)
+
+    def clear(self) -> None:
+        """
+        Remove all entries from the table and reset the counters.
+        """
+        self._entries = [None] * self.size
+        self.generation = 0
+        self.probes = 0
+        self.hits = 0
+
+    def __len__(self) -> int:
+        """
+        The number of filled slots in the table.
+
+        :returns: (int): The number of entries in the table.
+        """
+        return sum(entry is not None for entry in self._entries)
+
+    def __repr__(self) -> str:
+        return f"TranspositionTable(size={self.size}, min_depth={self.min_depth})"
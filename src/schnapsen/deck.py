@@ -69,6 +69,8 @@ class Card(Enum):
     :attr rank (Rank): The rank of the card.
     :attr suit (Suit): The suit of the card.
     :attr character (str): The character representation of the card.
+    :attr index (int): The position of the card in this enumeration, starting at 0.
+    :attr bit (int): An integer with only bit `index` set, used to represent sets of cards as bitmasks (see CardSet).
     """
 
     # Each possible card is definied below as a tuple of (rank, suit, character)
@@ -132,6 +134,13 @@ class Card(Enum):
         self.rank = rank
         self.suit = suit
         self.character = character
+        # The cards are listed suit by suit, and within each suit rank by rank, so the index can be derived from both.
+        self.index = (suit.value - 1) * len(Rank) + (rank.value - 1)
+        self.bit = 1 << self.index
+
+    # Cards are singletons which are only equal to themselves, so the identity based hash of object is valid.
+    # It is much faster than the default hash of Enum, which hashes the name of the member in Python code.
+    __hash__ = object.__hash__
 
     @staticmethod
     def _get_card(rank: Rank, suit: Suit) -> Card:
@@ -183,6 +192,13 @@ class _CardCache:
 
     _CARD_CACHE: dict[tuple[Rank, Suit], Card] = {(card_rank, card_suit): Card._get_card(card_rank, card_suit) for (card_rank, card_suit) in itertools.product(Rank, Suit)}
 
+    # All cards, such that _CARDS_BY_INDEX[card.index] is card
+    _CARDS_BY_INDEX: list[Card] = sorted(Card, key=lambda card: card.index)
+
+    # The bitmasks of all cards with a given suit or rank
+    _SUIT_MASKS: dict[Suit, int] = {suit: sum(card.bit for card in Card if card.suit is suit) for suit in Suit}
+    _RANK_MASKS: dict[Rank, int] = {rank: sum(card.bit for card in Card if card.rank is rank) for rank in Rank}
+
 
 class CardCollection(ABC):
     """A collection of cards for which the order is not significant and not guaranteed."""
@@ -262,6 +278,8 @@ class OrderedCardCollection(CardCollection):
 
     def __init__(self, cards: Optional[Iterable[Card]] = None) -> None:
         self._cards: list[Card] = list(cards or [])
+        # The bitmask of the cards in _cards, used for fast membership tests. Derived classes modifying _cards must keep it up to date.
+        self._mask: int = CardSet.mask_of(self._cards)
 
     def is_empty(self) -> bool:
         """
@@ -306,7 +324,7 @@ class OrderedCardCollection(CardCollection):
         """
 
         assert isinstance(item, Card), "Only cards can be contained in a card collection"
-        return item in self._cards
+        return self._mask & item.bit != 0
 
     def filter_suit(self, suit: Suit) -> list[Card]:
         """
@@ -317,6 +335,8 @@ class OrderedCardCollection(CardCollection):
         """
 
         assert suit in Suit
+        if not self._mask & _CardCache._SUIT_MASKS[suit]:
+            return []
         results: list[Card] = [card for card in self._cards if card.suit is suit]
         return results
 
@@ -328,6 +348,8 @@ class OrderedCardCollection(CardCollection):
         :return: (list[Card]): An Iterable of cards with the provided rank.
         """
         assert rank in Rank
+        if not self._mask & _CardCache._RANK_MASKS[rank]:
+            return []
         results: list[Card] = [card for card in self._cards if card.rank is rank]
         return results
 
@@ -339,3 +361,175 @@ class OrderedCardCollection(CardCollection):
         """
 
         return f"OrderedCardCollection(cards={self._cards})"
+
+
+class CardSet(CardCollection):
+    """
+    An unordered collection of distinct cards, represented by a bitmask with one bit per card (see Card.bit).
+    Membership tests, filtering on suit or rank, and copying take constant time, independent of the number of cards in the set.
+    The cards are always iterated in the order of the Card enumeration.
+
+    :param cards: (Optional[Iterable[Card]]): The cards to initialize the set with. Duplicates are only stored once. Defaults to None.
+    :param mask: (int): Cards to initialize the set with, given as a bitmask. This is combined with the cards parameter. Defaults to 0.
+    :attr mask: (int): The bitmask of the cards in this set.
+    """
+
+    def __init__(self, cards: Optional[Iterable[Card]] = None, mask: int = 0) -> None:
+        self.mask = mask | CardSet.mask_of(cards or [])
+
+    @staticmethod
+    def mask_of(cards: Iterable[Card]) -> int:
+        """
+        Get the bitmask representing the provided cards.
+
+        :param cards: (Iterable[Card]): The cards to compute the mask for.
+        :returns: (int): The bitwise or of the bits of all cards.
+        """
+        mask = 0
+        for card in cards:
+            mask |= card.bit
+        return mask
+
+    @staticmethod
+    def suit_mask(suit: Suit) -> int:
+        """
+        Get the bitmask of all cards with the provided suit.
+
+        :param suit: (Suit): The suit to get the mask for.
+        :returns: (int): The bitmask of all cards of that suit.
+        """
+        return _CardCache._SUIT_MASKS[suit]
+
+    @staticmethod
+    def rank_mask(rank: Rank) -> int:
+        """
+        Get the bitmask of all cards with the provided rank.
+
+        :param rank: (Rank): The rank to get the mask for.
+        :returns: (int): The bitmask of all cards of that rank.
+        """
+        return _CardCache._RANK_MASKS[rank]
+
+    @staticmethod
+    def cards_of_mask(mask: int) -> list[Card]:
+        """
+        Get the cards represented by the provided bitmask, in the order of the Card enumeration.
+
+        :param mask: (int): The bitmask to convert.
+        :returns: (list[Card]): The cards of which the bit is set in the mask.
+        """
+        cards_by_index = _CardCache._CARDS_BY_INDEX
+        cards: list[Card] = []
+        while mask:
+            lowest_bit = mask & -mask
+            cards.append(cards_by_index[lowest_bit.bit_length() - 1])
+            mask ^= lowest_bit
+        return cards
+
+    def is_empty(self) -> bool:
+        """
+        Returns True if this set is empty, False otherwise.
+
+        :return: (bool): Whether this set is empty.
+        """
+        return self.mask == 0
+
+    def get_cards(self) -> list[Card]:
+        """
+        Returns a list of the cards in this set, in the order of the Card enumeration.
+
+        :return: (list[Card]): list of cards in this set.
+        """
+        return CardSet.cards_of_mask(self.mask)
+
+    def add(self, card: Card) -> None:
+        """
+        Add a card to this set. Adding a card which is already in the set has no effect.
+
+        :param card: (Card): The card to add.
+        """
+        self.mask |= card.bit
+
+    def remove(self, card: Card) -> None:
+        """
+        Remove a card from this set.
+
+        :param card: (Card): The card to remove. It must be in the set.
+        """
+        if not self.mask & card.bit:
+            raise Exception(f"Trying to remove a card from the set which is not in the set. Set is {self}, trying to remove {card}")
+        self.mask ^= card.bit
+
+    def copy(self) -> CardSet:
+        """
+        Create an independent copy of this set.
+
+        :return: (CardSet): A copy of this set. Changes to the original will not affect the copy and vice versa.
+        """
+        return CardSet(mask=self.mask)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of cards in this set.
+
+        :return: (int): The number of cards in this set.
+        """
+        return self.mask.bit_count()
+
+    def __iter__(self) -> Iterator[Card]:
+        """
+        Returns an iterator over the cards in this set.
+
+        :return: (Iterator[Card]): An iterator over the cards in this set.
+        """
+        return iter(CardSet.cards_of_mask(self.mask))
+
+    def __contains__(self, item: Any) -> bool:
+        """
+        Returns whether the provided item is in this set.
+
+        :param item: (Any): The item to check.
+        :return: (bool): Whether the item is in this set.
+        """
+        assert isinstance(item, Card), "Only cards can be contained in a card collection"
+        return self.mask & item.bit != 0
+
+    def filter_suit(self, suit: Suit) -> list[Card]:
+        """
+        Returns a list with in it all cards which have the provided suit
+
+        :param suit: (Suit): The suit to filter on.
+        :return: (list[Card]): A list of cards with the provided suit.
+        """
+        return CardSet.cards_of_mask(self.mask & _CardCache._SUIT_MASKS[suit])
+
+    def filter_rank(self, rank: Rank) -> list[Card]:
+        """
+        Returns a list with in it all cards which have the provided rank
+
+        :param rank: (Rank): The rank to filter on.
+        :return: (list[Card]): A list of cards with the provided rank.
+        """
+        return CardSet.cards_of_mask(self.mask & _CardCache._RANK_MASKS[rank])
+
+    def __eq__(self, __o: object) -> bool:
+        """
+        Two CardSets are equal if they contain the same cards.
+        """
+        if not isinstance(__o, CardSet):
+            return False
+        return self.mask == __o.mask
+
+    def __hash__(self) -> int:
+        """
+        The hash of a CardSet is the hash of its mask. Note that CardSets are mutable, so they must not be changed while used as a key.
+        """
+        return hash(self.mask)
+
+    def __repr__(self) -> str:
+        """
+        Returns a string representation of this set.
+
+        :return: (str): A string representation of this set.
+        """
+        return f"CardSet(cards={self.get_cards()})"
@@ -0,0 +1,107 @@
+"""
+In this module you find a sequential test for comparing two bots, which stops playing games as soon as the outcome is clear.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import math
+import os
+from typing import Optional
+
+from .game import BotSpec, GamePlayEngine
+
+
+@dataclass(frozen=True)
+class SPRTResult:
+    """
+    The outcome of a sequential probability ratio test, see sequential_test.
+    """
+
+    accepted: Optional[bool]
+    """True if the test accepted the hypothesis that the first bot wins with probability p1, False if it accepted the probability p0, None if max_games were played without a decision"""
+    games: int
+    """The number of games played until the decision"""
+    wins: int
+    """The number of those games won by the first bot"""
+    log_likelihood_ratio: float
+    """The log likelihood ratio of p1 against p0 after the last game"""
+    lower_bound: float
+    """The log likelihood ratio below which p0 is accepted"""
+    upper_bound: float
+    """The log likelihood ratio above which p1 is accepted"""
+
+    @property
+    def win_rate(self) -> float:
+        """The fraction of the games won by the first bot"""
+        return self.wins / self.games if self.games else 0.0
+
+    @property
+    def confidence(self) -> float:
+        """
+        The probability of the accepted hypothesis given the games played, starting from even odds for both hypotheses.
+        If no hypothesis was accepted, this is the probability of the more likely one.
+        """
+        probability_p1 = 1 / (1 + math.exp(-self.log_likelihood_ratio))
+        if self.accepted is None:
+            return max(probability_p1, 1 - probability_p1)
+        return probability_p1 if self.accepted else 1 - probability_p1
+
+
+def sequential_test(engine: GamePlayEngine, bot1: BotSpec, bot2: BotSpec, p0: float = 0.5, p1: float = 0.55, alpha: float = 0.05, beta: float = 0.05,
+                    max_games: int = 10000, first_seed: int = 1, batch_size: Optional[int] = None, processes: Optional[int] = None) -> SPRTResult:
+    """
+    Decide between two hypotheses for the probability p that the first bot wins a game against the second one: p = p0 or p = p1, with p0 < p1.
+    A regression check of a new bot version would for example use p0=0.5 and p1=0.55: is the new version at least as strong, or clearly stronger?
+
+    Games are played with GamePlayEngine.play_games, with the seeds first_seed, first_seed + 1, ... and alternating leaders.
+    After each game, the log likelihood ratio of the results under p1 and p0 is updated (Wald's sequential probability ratio test).
+    The test stops as soon as the ratio leaves the interval (log(beta / (1 - alpha)), log((1 - beta) / alpha)), which usually takes far fewer games than a fixed-size test with the same error rates.
+
+    To use several processes, the games are played in batches. Results after the deciding game in a batch are ignored, such that the outcome does not depend on batch_size or processes.
+
+    :param engine: (GamePlayEngine): The engine used to play the games.
+    :param bot1: (BotSpec): The specification of the first bot.
+    :param bot2: (BotSpec): The specification of the second bot.
+    :param p0: (float): The probability that the first bot wins under the first hypothesis. Defaults to 0.5.
+    :param p1: (float): The probability that the first bot wins under the second hypothesis, larger than p0. Defaults to 0.55.
+    :param alpha: (float): The maximum probability of accepting p1 if p0 is true. Defaults to 0.05.
+    :param beta: (float): The maximum probability of accepting p0 if p1 is true. Defaults to 0.05.
+    :param max_games: (int): The number of games after which the test stops without a decision. Defaults to 10000.
+    :param first_seed: (int): The seed of the first game. Defaults to 1.
+    :param batch_size: (Optional[int]): The number of games played at once. Defaults to 16 games per process. Rounded up to an even number, such that the leaders keep alternating.
+    :param processes: (Optional[int]): The number of processes to use, see GamePlayEngine.play_games. The processes are started once, and play all batches.
+    :returns: (SPRTResult): The decision, with the number of games it took.
+    """
+    assert 0 < p0 < p1 < 1, f"The hypotheses must satisfy 0 < p0 < p1 < 1, got p0={p0} and p1={p1}"
+    assert 0 < alpha < 1 and 0 < beta < 1, f"The error rates must be between 0 and 1, got alpha={alpha} and beta={beta}"
+    lower_bound, upper_bound = math.log(beta / (1 - alpha)), math.log((1 - beta) / alpha)
+    win_step, loss_step = math.log(p1 / p0), math.log((1 - p1) / (1 - p0))
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if batch_size is None:
+        batch_size = 16 * processes
+    batch_size += batch_size % 2
+
+    # the processes are started once, and play all batches
+    pool = engine.game_pool(bot1, bot2, processes) if processes > 1 else None
+    try:
+        games = wins = 0
+        log_likelihood_ratio = 0.0
+        while games < max_games:
+            seeds = range(first_seed + games, first_seed + min(games + batch_size, max_games))
+            results = pool.play_games(seeds) if pool is not None else engine.play_games(bot1, bot2, seeds, processes=1)
+            for result in results:
+                games += 1
+                if result.winner == 1:
+                    wins += 1
+                    log_likelihood_ratio += win_step
+                else:
+                    log_likelihood_ratio += loss_step
+                if log_likelihood_ratio <= lower_bound or log_likelihood_ratio >= upper_bound:
+                    return SPRTResult(accepted=log_likelihood_ratio >= upper_bound, games=games, wins=wins, log_likelihood_ratio=log_likelihood_ratio,
+                                      lower_bound=lower_bound, upper_bound=upper_bound)
+        return SPRTResult(accepted=None, games=games, wins=wins, log_likelihood_ratio=log_likelihood_ratio, lower_bound=lower_bound, upper_bound=upper_bound)
+    finally:
+        if pool is not None:
+            pool.shutdown()
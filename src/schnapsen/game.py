@@ -5,14 +5,17 @@ In this module you will find all parts related to playing a game of Schnapsen.
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
 import contextlib
+import copy
 from dataclasses import dataclass, field
 from enum import Enum
 from io import StringIO
+import os
 from random import Random
 import sys
-from typing import Generator, Iterable, Optional, Union, cast, Any
-from .deck import CardCollection, OrderedCardCollection, Card, Rank, Suit
+from typing import Callable, Generator, Iterable, Iterator, Optional, Sequence, SupportsIndex, Union, cast, overload, Any
+from .deck import CardCollection, CardSet, OrderedCardCollection, Card, Rank, Suit
 import itertools
 
 
@@ -65,14 +68,63 @@ class Bot(ABC):
         return self.__name if hasattr(self, '_Bot__name') else super().__str__()
 
 
+@dataclass(frozen=True)
+class BotSpec:
+    """
+    A picklable recipe for creating a Bot. It is used to create bots in other processes, see GamePlayEngine.play_games.
+    The factory (usually the class of the bot) must be defined at the top level of a module, such that it can be pickled.
+
+    Example: BotSpec(RdeepBot, kwargs={"num_samples": 16, "depth": 4}, rand_argument="rand")
+    """
+
+    factory: Callable[..., Bot]
+    """The callable creating the bot, usually the class of the bot"""
+    args: tuple[Any, ...] = ()
+    """The positional arguments for the factory"""
+    kwargs: dict[str, Any] = field(default_factory=dict)
+    """The keyword arguments for the factory"""
+    rand_argument: Optional[str] = None
+    """If set, the keyword argument under which the bot gets a random.Random, seeded from the seed of the game."""
+
+    def build(self, seed: Union[int, str, None] = None) -> Bot:
+        """
+        Create the bot.
+
+        :param seed: (Union[int, str, None]): The seed from which the random.Random passed as rand_argument is created. Required in case rand_argument is set.
+        :returns: (Bot): A new bot.
+        """
+        kwargs = dict(self.kwargs)
+        if self.rand_argument is not None:
+            assert seed is not None, f"A seed is needed to create the random number generator passed as {self.rand_argument}"
+            kwargs[self.rand_argument] = Random(seed)
+        return self.factory(*self.args, **kwargs)
+
+
 class Move(ABC):
     """
     A single move during a game. There are several types of move possible: normal moves, trump exchanges, and marriages.
     They are implmented in classes inheriting from this class.
     """
 
-    cards: list[Card]  # implementation detail: The creation of this list is defered to the derived classes in _cards()
-    """The cards played in this move"""
+    move_id: int
+    """
+    A small integer identifying this move, unique among all possible moves and below NUMBER_OF_MOVES.
+    Regular moves use the index of their card, trump exchanges and marriages come after these, one per suit.
+    Search code can use it to index arrays by move.
+    """
+
+    card_tuple: tuple[Card, ...]
+    """The cards played in this move, precomputed as a tuple. Unlike cards, this does not create a new list on each access."""
+
+    @staticmethod
+    def from_id(move_id: int) -> Move:
+        """
+        Get the shared instance of the move with the given move_id.
+
+        :param move_id: (int): The id of the move, as found in Move.move_id.
+        :returns: (Move): The move with the given move_id.
+        """
+        return _MoveCache._MOVES_BY_ID[move_id]
 
     def is_regular_move(self) -> bool:
         """
@@ -110,41 +162,59 @@ class Move(ABC):
         """Returns this same move but as a TrumpExchange."""
         raise AssertionError("as_trump_exchange called on a Move which is not a TrumpExchange. Check with is_trump_exchange first.")
 
-    def __getattribute__(self, __name: str) -> Any:
-        if __name == "cards":
-            # We call the method to compute the card list
-            return object.__getattribute__(self, "_cards")()
-        return object.__getattribute__(self, __name)
+    @property
+    def cards(self) -> list[Card]:
+        """The cards played in this move"""
+        # implementation detail: The creation of this list is defered to the derived classes in _cards()
+        return self._cards()
 
-    @abstractmethod
     def _cards(self) -> list[Card]:
         """
         Get the list of cards in this move. This method should not be called direcly, use the cards property instead.
-        Private abstract method for other classes to inherit and/or override.
         """
+        return list(self.card_tuple)
 
-    @abstractmethod
     def __eq__(self, __o: object) -> bool:
         """
         Compares two moves with each other. Two moves are equal in case they are of the same type and if they contain the same cards.
-        Abstract method for derived classes to override.
+        This is the case exactly when they have the same move_id.
         """
+        if self is __o:
+            return True
+        if not isinstance(__o, Move):
+            return False
+        return self.move_id == __o.move_id
 
+    def __hash__(self) -> int:
+        return self.move_id
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, eq=False)
 class RegularMove(Move):
     """A regular move in the game"""
 
     card: Card
     """The card which is played"""
 
-    def _cards(self) -> list[Card]:
-        return [self.card]
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "move_id", self.card.index)
+        object.__setattr__(self, "card_tuple", (self.card,))
+
+    @staticmethod
+    def get_move(card: Card) -> RegularMove:
+        """
+        Get the shared instance of the regular move playing the given card.
+
+        :param card: (Card): The card to be played.
+        :returns: (RegularMove): The move playing this card.
+        """
+        return _MoveCache._REGULAR_MOVES[card.index]
 
     @staticmethod
     def from_cards(cards: Iterable[Card]) -> list[Move]:
         """Create an iterable of Moves from an iterable of cards."""
-        return [RegularMove(card) for card in cards]
+        regular_moves = _MoveCache._REGULAR_MOVES
+        return [regular_moves[card.index] for card in cards]
 
     def is_regular_move(self) -> bool:
         return True
@@ -155,13 +225,8 @@ class RegularMove(Move):
     def __repr__(self) -> str:
         return f"RegularMove(card={self.card})"
 
-    def __eq__(self, __o: object) -> bool:
-        if not isinstance(__o, RegularMove):
-            return False
-        return self.card == __o.card
-
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, eq=False)
 class TrumpExchange(Move):
     """A move that implements the exchange of the trump card for a Jack of the same suit."""
 
@@ -173,6 +238,18 @@ class TrumpExchange(Move):
         Asserts that the card is a Jack
         """
         assert self.jack.rank is Rank.JACK, f"The rank card {self.jack} used to initialize the {TrumpExchange.__name__} was not Rank.JACK"
+        object.__setattr__(self, "move_id", _MoveCache._EXCHANGE_OFFSET + self.jack.suit.value - 1)
+        object.__setattr__(self, "card_tuple", (self.jack,))
+
+    @staticmethod
+    def get_move(suit: Suit) -> TrumpExchange:
+        """
+        Get the shared instance of the trump exchange with the jack of the given suit.
+
+        :param suit: (Suit): The trump suit.
+        :returns: (TrumpExchange): The trump exchange for this suit.
+        """
+        return _MoveCache._TRUMP_EXCHANGES[suit.value - 1]
 
     def is_trump_exchange(self) -> bool:
         """
@@ -187,19 +264,11 @@ class TrumpExchange(Move):
         """
         return self
 
-    def _cards(self) -> list[Card]:
-        return [self.jack]
-
     def __repr__(self) -> str:
         return f"TrumpExchange(jack={self.jack})"
 
-    def __eq__(self, __o: object) -> bool:
-        if not isinstance(__o, TrumpExchange):
-            return False
-        return self.jack == __o.jack
-
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, eq=False)
 class Marriage(Move):
     """
     A Move representing a marriage in the game. This move has two cards, a king and a queen of the same suit.
@@ -226,6 +295,18 @@ class Marriage(Move):
         assert self.king_card.rank is Rank.KING, f"The rank card {self.king_card} used to initialize the {Marriage.__name__} was not Rank.KING"
         assert self.queen_card.suit == self.king_card.suit, f"The cards used to inialize the Marriage {self.queen_card} and {self.king_card} so not have the same suit."
         object.__setattr__(self, "suit", self.queen_card.suit)
+        object.__setattr__(self, "move_id", _MoveCache._MARRIAGE_OFFSET + self.suit.value - 1)
+        object.__setattr__(self, "card_tuple", (self.queen_card, self.king_card))
+
+    @staticmethod
+    def get_move(suit: Suit) -> Marriage:
+        """
+        Get the shared instance of the marriage of the given suit.
+
+        :param suit: (Suit): The suit of the marriage.
+        :returns: (Marriage): The marriage of the queen and king of this suit.
+        """
+        return _MoveCache._MARRIAGES[suit.value - 1]
 
     def is_marriage(self) -> bool:
         return True
@@ -241,18 +322,162 @@ class Marriage(Move):
         """
         # this limits you to only have the queen to play after a marriage, while in general you would have a choice.
         # This is not an issue since playing the king give you the highest score.
-        return RegularMove(self.king_card)
-
-    def _cards(self) -> list[Card]:
-        return [self.queen_card, self.king_card]
+        return _MoveCache._REGULAR_MOVES[self.king_card.index]
 
     def __repr__(self) -> str:
         return f"Marriage(queen_card={self.queen_card}, king_card={self.king_card})"
 
-    def __eq__(self, __o: object) -> bool:
-        if not isinstance(__o, Marriage):
-            return False
-        return self.queen_card == __o.queen_card and self.king_card == self.king_card
+
+class _MoveCache:
+    """
+    A registry of shared instances of all possible moves.
+    Moves are immutable, so move generation hands out these instances instead of creating new ones.
+    """
+    # The move ids of the trump exchanges and marriages start after the ones of the regular moves.
+    _EXCHANGE_OFFSET = len(Card)
+    _MARRIAGE_OFFSET = len(Card) + len(Suit)
+
+    # _REGULAR_MOVES[card.index] plays card
+    _REGULAR_MOVES: list[RegularMove] = []
+    # _TRUMP_EXCHANGES[suit.value - 1] and _MARRIAGES[suit.value - 1] are the moves of that suit
+    _TRUMP_EXCHANGES: list[TrumpExchange] = []
+    _MARRIAGES: list[Marriage] = []
+    # _MOVES_BY_ID[move.move_id] is move
+    _MOVES_BY_ID: list[Move] = []
+
+    @staticmethod
+    def _fill() -> None:
+        _MoveCache._REGULAR_MOVES.extend(RegularMove(card) for card in sorted(Card, key=lambda card: card.index))
+        suits = sorted(Suit, key=lambda suit: suit.value)
+        _MoveCache._TRUMP_EXCHANGES.extend(TrumpExchange(Card.get_card(Rank.JACK, suit)) for suit in suits)
+        _MoveCache._MARRIAGES.extend(Marriage(Card.get_card(Rank.QUEEN, suit), Card.get_card(Rank.KING, suit)) for suit in suits)
+        _MoveCache._MOVES_BY_ID.extend(_MoveCache._REGULAR_MOVES)
+        _MoveCache._MOVES_BY_ID.extend(_MoveCache._TRUMP_EXCHANGES)
+        _MoveCache._MOVES_BY_ID.extend(_MoveCache._MARRIAGES)
+        assert all(move.move_id == move_id for move_id, move in enumerate(_MoveCache._MOVES_BY_ID))
+
+
+_MoveCache._fill()
+
+NUMBER_OF_MOVES = len(_MoveCache._MOVES_BY_ID)
+"""The number of possible moves. All move ids are smaller than this number."""
+
+
+class _Zobrist:
+    """
+    The random numbers used to compute the Zobrist keys of game states, see GameState.zobrist_key.
+    They are generated with a fixed seed, such that keys are the same in every run and every process.
+    """
+    _MASK64 = (1 << 64) - 1
+
+    # _TALON[position][card.index] is the number for card lying at the position, counted from the bottom of the talon
+    _TALON: list[list[int]] = []
+    # _TRUMP[suit.value - 1] is the number for the trump suit
+    _TRUMP: list[int] = []
+    # Salts distinguishing the hands and scores of the leader and the follower
+    _LEADER_HAND = 0
+    _FOLLOWER_HAND = 0
+    _LEADER_SCORE = 0
+    _FOLLOWER_SCORE = 0
+
+    @staticmethod
+    def _fill() -> None:
+        rng = Random(0x5C4A9753)
+        _Zobrist._TALON.extend([rng.getrandbits(64) for _ in Card] for _ in Card)
+        _Zobrist._TRUMP.extend(rng.getrandbits(64) for _ in Suit)
+        _Zobrist._LEADER_HAND, _Zobrist._FOLLOWER_HAND, _Zobrist._LEADER_SCORE, _Zobrist._FOLLOWER_SCORE = (rng.getrandbits(64) for _ in range(4))
+
+    @staticmethod
+    def mix(value: int) -> int:
+        """
+        Scramble a 64 bit integer, such that every input bit affects every output bit (the finalizer of splitmix64).
+
+        :param value: (int): The value to scramble
+        :returns: (int): The scrambled value, in the range [0, 2**64)
+        """
+        mask64 = _Zobrist._MASK64
+        value = (value ^ (value >> 30)) * 0xBF58476D1CE4E5B9 & mask64
+        value = (value ^ (value >> 27)) * 0x94D049BB133111EB & mask64
+        return value ^ (value >> 31)
+
+    @staticmethod
+    def talon_key(cards: list[Card]) -> int:
+        """
+        Compute the key of the cards on a talon from scratch.
+
+        :param cards: (list[Card]): The cards on the talon, the last one is the bottommost card.
+        :returns: (int): The XOR of the numbers of the cards at their positions.
+        """
+        key = 0
+        table = _Zobrist._TALON
+        for position, card in enumerate(reversed(cards)):
+            key ^= table[position][card.index]
+        return key
+
+
+_Zobrist._fill()
+
+
+class _HandCards(list[Card]):
+    """
+    The list of cards of a Hand. Changes made directly to this list, rather than through Hand.add and Hand.remove, update the bitmask of the hand as well.
+    """
+
+    __slots__ = ("_hand",)
+
+    def __init__(self, hand: Hand, cards: Iterable[Card]) -> None:
+        super().__init__(cards)
+        self._hand = hand
+
+    def _changed(self) -> None:
+        self._hand._update_mask()
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # copies are plain lists, which are not tied to the hand. Hand.__setstate__ ties the copy in a copied hand to that hand.
+        return (list, (list(self),))
+
+    def append(self, card: Card) -> None:
+        super().append(card)
+        self._changed()
+
+    def extend(self, cards: Iterable[Card]) -> None:
+        super().extend(cards)
+        self._changed()
+
+    def insert(self, index: SupportsIndex, card: Card) -> None:
+        super().insert(index, card)
+        self._changed()
+
+    def remove(self, card: Card) -> None:
+        super().remove(card)
+        self._changed()
+
+    def pop(self, index: SupportsIndex = -1) -> Card:
+        card = super().pop(index)
+        self._changed()
+        return card
+
+    def clear(self) -> None:
+        super().clear()
+        self._changed()
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        super().__setitem__(index, value)
+        self._changed()
+
+    def __delitem__(self, index: Any) -> None:
+        super().__delitem__(index)
+        self._changed()
+
+    def __iadd__(self, cards: Iterable[Card]) -> _HandCards:  # type: ignore[override, misc]
+        super().__iadd__(cards)
+        self._changed()
+        return self
+
+    def __imul__(self, times: SupportsIndex) -> _HandCards:
+        super().__imul__(times)
+        self._changed()
+        return self
 
 
 class Hand(CardCollection):
@@ -272,6 +497,28 @@ class Hand(CardCollection):
         assert len(cards) <= max_size, f"The number of cards {len(cards)} is larger than the maximum number fo allowed cards {max_size}"
         self.cards = cards
 
+    @property
+    def cards(self) -> list[Card]:
+        """
+        The cards in the hand, in the order in which they were added.
+        The list can be changed in place, but add and remove are faster, because they update the bitmask used for membership tests without going over all cards.
+        """
+        return self._cards
+
+    @cards.setter
+    def cards(self, cards: list[Card]) -> None:
+        self._cards = _HandCards(self, cards)
+        self._update_mask()
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.cards = state["_cards"]
+
+    def _update_mask(self) -> None:
+        # The bitmask of the cards in the hand (see CardSet). A Hand can contain duplicates, in which case the mask has less bits than there are cards.
+        self._mask = CardSet.mask_of(self._cards)
+        self._has_duplicates = self._mask.bit_count() != len(self._cards)
+
     def remove(self, card: Card) -> None:
         """
         Remove one occurence of the card from this hand
@@ -279,9 +526,15 @@ class Hand(CardCollection):
         :param card: (Card): The card to be removed from the hand.
         """
         try:
-            self.cards.remove(card)
+            # the list is changed as a plain list, the mask is updated below
+            list.remove(self._cards, card)
         except ValueError as ve:
             raise Exception(f"Trying to remove a card from the hand which is not in the hand. Hand is {self.cards}, trying to remove {card}") from ve
+        if self._has_duplicates:
+            # another copy of the card might still be in the hand, so we recompute the mask
+            self._update_mask()
+        else:
+            self._mask ^= card.bit
 
     def add(self, card: Card) -> None:
         """
@@ -289,8 +542,11 @@ class Hand(CardCollection):
 
         :param card:  The card to be added to the hand
         """
-        assert len(self.cards) < self.max_size, "Adding one more card to the hand will cause a hand with too many cards"
-        self.cards.append(card)
+        assert len(self._cards) < self.max_size, "Adding one more card to the hand will cause a hand with too many cards"
+        list.append(self._cards, card)
+        if self._mask & card.bit:
+            self._has_duplicates = True
+        self._mask |= card.bit
 
     def has_cards(self, cards: Iterable[Card]) -> bool:
         """
@@ -299,7 +555,8 @@ class Hand(CardCollection):
         :param cards: An iterable of cards which need to be checked
         :returns: Whether all cards in the provided iterable are in this Hand
         """
-        return all(card in self.cards for card in cards)
+        required = CardSet.mask_of(cards)
+        return self._mask & required == required
 
     def copy(self) -> Hand:
         """
@@ -307,7 +564,19 @@ class Hand(CardCollection):
 
         :returns: A deep copy of this hand. Changes to the original will not affect the copy and vice versa.
         """
-        return Hand(list(self.cards), max_size=self.max_size)
+        new_hand = Hand([], max_size=self.max_size)
+        new_hand._cards = _HandCards(new_hand, self._cards)
+        new_hand._mask = self._mask
+        new_hand._has_duplicates = self._has_duplicates
+        return new_hand
+
+    def as_card_set(self) -> CardSet:
+        """
+        Get the cards of this Hand as a CardSet.
+
+        :returns: (CardSet): A new CardSet with the cards of this Hand. Changes to the set will not be reflected in this Hand.
+        """
+        return CardSet(mask=self._mask)
 
     def is_empty(self) -> bool:
         """
@@ -315,7 +584,7 @@ class Hand(CardCollection):
 
         :returns: A bool indicating whether the hand is empty
         """
-        return len(self.cards) == 0
+        return self._mask == 0
 
     def get_cards(self) -> list[Card]:
         """
@@ -323,7 +592,25 @@ class Hand(CardCollection):
 
         :returns: (list[Card]): A defensive copy of the list of Cards in this Hand.
         """
-        return list(self.cards)
+        return list(self._cards)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of cards in the hand.
+
+        :returns: (int): The number of cards in the hand.
+        """
+        return len(self._cards)
+
+    def __contains__(self, item: Any) -> bool:
+        """
+        Returns whether the provided card is in the hand.
+
+        :param item: (Any): The card to check.
+        :returns: (bool): Whether the card is in the hand.
+        """
+        assert isinstance(item, Card), "Only cards can be contained in a card collection"
+        return self._mask & item.bit != 0
 
     def filter_suit(self, suit: Suit) -> list[Card]:
         """
@@ -332,7 +619,9 @@ class Hand(CardCollection):
         :param suit: (Suit): The suit to filter on.
         :returns: (list(Card)): A list of cards which have the specified suit.
         """
-        results: list[Card] = [card for card in self.cards if card.suit is suit]
+        if not self._mask & CardSet.suit_mask(suit):
+            return []
+        results: list[Card] = [card for card in self._cards if card.suit is suit]
         return results
 
     def filter_rank(self, rank: Rank) -> list[Card]:
@@ -342,7 +631,9 @@ class Hand(CardCollection):
         :param suit: (Rank): The rank to filter on.
         :returns: (list(Card)): A list of cards which have the specified rank.
         """
-        results: list[Card] = [card for card in self.cards if card.rank is rank]
+        if not self._mask & CardSet.rank_mask(rank):
+            return []
+        results: list[Card] = [card for card in self._cards if card.rank is rank]
         return results
 
     def __repr__(self) -> str:
@@ -376,6 +667,7 @@ class Talon(OrderedCardCollection):
             self.__trump_suit = trump_suit
 
         super().__init__(cards)
+        self.__zobrist_key = _Zobrist.talon_key(self._cards)
 
     def copy(self) -> Talon:
         """
@@ -402,6 +694,9 @@ class Talon(OrderedCardCollection):
         assert new_trump.suit is self._cards[-1].suit, f"The suit of the new card {new_trump} is not equal to the current bottom {self._cards[-1].suit}"
         old_trump = self._cards.pop(len(self._cards) - 1)
         self._cards.append(new_trump)
+        self._mask = CardSet.mask_of(self._cards)
+        bottom = _Zobrist._TALON[0]
+        self.__zobrist_key ^= bottom[old_trump.index] ^ bottom[new_trump.index]
         return old_trump
 
     def draw_cards(self, amount: int) -> Iterable[Card]:
@@ -414,7 +709,12 @@ class Talon(OrderedCardCollection):
 
         assert len(self._cards) >= amount, f"There are only {len(self._cards)} on the Talon, but {amount} cards are requested"
         draw = self._cards[:amount]
+        # the drawn cards were at the top, the positions of the other cards, counted from the bottom, do not change
+        top_position = len(self._cards) - 1
+        for offset, card in enumerate(draw):
+            self.__zobrist_key ^= _Zobrist._TALON[top_position - offset][card.index]
         self._cards = self._cards[amount:]
+        self._mask = CardSet.mask_of(self._cards)
         return draw
 
     def trump_suit(self) -> Suit:
@@ -426,6 +726,15 @@ class Talon(OrderedCardCollection):
         """
         return self.__trump_suit
 
+    def zobrist_key(self) -> int:
+        """
+        Return the Zobrist key of the cards on this Talon, taking their order into account.
+        The key is updated incrementally when cards are drawn or the trump is exchanged. It is part of GameState.zobrist_key.
+
+        :returns: (int): A 64 bit key of the cards on this Talon.
+        """
+        return self.__zobrist_key
+
     def trump_card(self) -> Optional[Card]:
         """
         Returns the current trump card, i.e., the bottommost card.
@@ -452,8 +761,10 @@ class Trick(ABC):
     A complete trick. This is, the move of the leader and if that was not an exchange, the move of the follower.
     """
 
-    cards: Iterable[Card] = field(init=False, repr=False, hash=False)
-    """All cards used as part of this trick. This includes cards used in marriages"""
+    @property
+    def cards(self) -> Iterable[Card]:
+        """All cards used as part of this trick. This includes cards used in marriages"""
+        return self._cards()
 
     @abstractmethod
     def is_trump_exchange(self) -> bool:
@@ -471,12 +782,6 @@ class Trick(ABC):
         :returns: The first part of this trick
         """
 
-    def __getattribute__(self, __name: str) -> Any:
-        if __name == "cards":
-            # We call the method to compute the card list
-            return object.__getattribute__(self, "_cards")()
-        return object.__getattribute__(self, __name)
-
     @abstractmethod
     def _cards(self) -> Iterable[Card]:
         """
@@ -509,9 +814,7 @@ class ExchangeTrick(Trick):
 
     def _cards(self) -> Iterable[Card]:
         """Get all cards used in this tick. This method should not be called directly."""
-        exchange = self.exchange.cards
-        exchange.append(self.trump_card)
-        return exchange
+        return [*self.exchange.card_tuple, self.trump_card]
 
 
 @dataclass(frozen=True)
@@ -548,7 +851,7 @@ class RegularTrick(Trick, PartialTrick):
 
     def _cards(self) -> Iterable[Card]:
         """Get all cards used in this tick. This method should not be called directly."""
-        return itertools.chain(self.leader_move.cards, self.follower_move.cards)
+        return itertools.chain(self.leader_move.card_tuple, self.follower_move.card_tuple)
 
     def __repr__(self) -> str:
         """A string representation of the Trick"""
@@ -654,6 +957,64 @@ class Previous:
     """The trick which led to the current Gamestate from the Previous state"""
     leader_remained_leader: bool
     """Did the leader of remain the leader."""
+    _perspectives: dict[bool, PlayerPerspective] = field(default_factory=dict, init=False, repr=False, compare=False)
+    """The perspectives on the previous state made by perspective, by whether they are the perspective of the leader. These are made once, and shared by all histories which contain this state."""
+
+    def perspective(self, leader: bool, engine: GamePlayEngine) -> PlayerPerspective:
+        """
+        The perspective of one of the players on the previous state, as the player saw it when making a move in the trick.
+
+        :param leader: (bool): True for the perspective of the leader of the trick, False for the perspective of the follower.
+        :param engine: (GamePlayEngine): The engine which is used to play the game.
+        :returns: (PlayerPerspective): The perspective. It is made at the first request, and cached for later requests with the same engine.
+        """
+        perspective = self._perspectives.get(leader)
+        if perspective is None or perspective.get_engine() is not engine:
+            if leader:
+                perspective = LeaderPerspective(self.state, engine)
+            elif self.trick.is_trump_exchange():
+                perspective = ExchangeFollowerPerspective(self.state, engine)
+            else:
+                perspective = FollowerPerspective(self.state, engine, self.trick.as_partial().leader_move)
+            self._perspectives[leader] = perspective
+        return perspective
+
+    def __getstate__(self) -> dict[str, Any]:
+        # the cached perspectives are made again when needed, there is no need to send them to other processes
+        state = self.__dict__.copy()
+        state["_perspectives"] = {}
+        return state
+
+
+@dataclass(frozen=True)
+class TrickUndoRecord:
+    """
+    The information needed to revert a trick which was applied in place to a GameState, see GamePlayEngine.apply_trick.
+    The record only keeps references to the parts of the state which the trick replaced or changed, it does not copy the state. Only the lists of cards are copied, as tuples.
+    """
+
+    leader: BotState
+    """The leader before the trick was applied"""
+    follower: BotState
+    """The follower before the trick was applied"""
+    leader_score: Score
+    """The score of the leader before the trick was applied"""
+    follower_score: Score
+    """The score of the follower before the trick was applied"""
+    leader_won_cards: tuple[Card, ...]
+    """The cards won by the leader before the trick was applied"""
+    follower_won_cards: tuple[Card, ...]
+    """The cards won by the follower before the trick was applied"""
+    leader_hand: tuple[Card, ...]
+    """The cards in the hand of the leader before the trick was applied"""
+    follower_hand: tuple[Card, ...]
+    """The cards in the hand of the follower before the trick was applied"""
+    talon: Talon
+    """The talon before the trick was applied. Tricks which change the talon put a modified copy on the state."""
+    trick_cards_mask: int
+    """The trick_cards_mask of the state before the trick was applied"""
+    tricks_played: int
+    """The tricks_played of the state before the trick was applied"""
 
 
 @dataclass
@@ -667,18 +1028,61 @@ class GameState:
     """The current leader, i.e., the one who will play the first move in the next trick"""
     follower: BotState
     """The current follower, i.e., the one who will play the second move in the next trick"""
-    trump_suit: Suit = field(init=False)
-    """The trump suit in this game. This information is also in the Talon."""
     talon: Talon
     """The talon, containing the cards not yet in the hand of the player and the trump card at the bottom"""
     previous: Optional[Previous]
     """The events which led to this GameState, or None, if this is the initial GameState (or previous tricks and states are unknown)"""
+    trick_cards_mask: int = 0
+    """
+    The bitmask (see CardSet.mask_of) of all cards which were part of the tricks played before this state, including the cards shown in marriages and trump exchanges.
+    Both players have seen all these cards. The trick implementer keeps the mask up to date when it applies a trick, such that the perspectives do not have to walk through the history.
+    If a state is created with a previous state but without a mask, the mask is derived from the previous state and trick.
+    """
+    tricks_played: int = 0
+    """
+    The number of tricks played before this state, including trump exchanges. Like trick_cards_mask, it is kept up to date when a trick is applied, also when no history is recorded.
+    If a state is created with a previous state but without a count, the count is derived from the previous state.
+    """
+
+    def __post_init__(self) -> None:
+        if self.previous is not None and not self.trick_cards_mask:
+            self.trick_cards_mask = self.previous.state.trick_cards_mask | CardSet.mask_of(self.previous.trick.cards)
+        if self.previous is not None and not self.tricks_played:
+            self.tricks_played = self.previous.state.tricks_played + 1
+
+    @property
+    def trump_suit(self) -> Suit:
+        """The trump suit in this game. This information is also in the Talon."""
+        return self.talon.trump_suit()
 
-    def __getattribute__(self, __name: str) -> Any:
-        if __name == "trump_suit":
-            # We get it from the talon
-            return self.talon.trump_suit()
-        return object.__getattribute__(self, __name)
+    def zobrist_key(self) -> int:
+        """
+        A 64 bit key of this state, for use in transposition tables and result caches.
+        The key covers the hands of the leader and the follower, the order of the cards on the talon, the trump suit, and the scores (including pending marriage points) of both players.
+        It does not cover the cards won, the bots, nor the history.
+        States which agree on everything covered get the same key, different states get different keys with very high probability.
+        Use canonical_key in case collisions are not acceptable.
+
+        The talon keeps its key up to date when the trick implementer draws cards or exchanges the trump, and the hands of the players are keyed by their bitmasks, so computing the key takes constant time.
+
+        :returns: (int): The key of this state, in the range [0, 2**64)
+        """
+        leader, follower = self.leader, self.follower
+        leader_score, follower_score = leader.score, follower.score
+        key = self.talon.zobrist_key() ^ _Zobrist._TRUMP[self.talon.trump_suit().value - 1]
+        key ^= _Zobrist.mix(leader.hand._mask ^ _Zobrist._LEADER_HAND) ^ _Zobrist.mix(follower.hand._mask ^ _Zobrist._FOLLOWER_HAND)
+        key ^= _Zobrist.mix((leader_score.direct_points << 32 | leader_score.pending_points) ^ _Zobrist._LEADER_SCORE)
+        key ^= _Zobrist.mix((follower_score.direct_points << 32 | follower_score.pending_points) ^ _Zobrist._FOLLOWER_SCORE)
+        return key
+
+    def canonical_key(self) -> tuple[int, int, tuple[Card, ...], Suit, Score, Score]:
+        """
+        A hashable key which identifies this state exactly, covering the same information as zobrist_key.
+        Two states have equal canonical keys if and only if they agree on everything covered.
+
+        :returns: (tuple): The bitmasks of the hands of the leader and follower, the cards on the talon, the trump suit, and the scores of the leader and the follower.
+        """
+        return (self.leader.hand._mask, self.follower.hand._mask, tuple(self.talon._cards), self.talon.trump_suit(), self.leader.score, self.follower.score)
 
     def copy_for_next(self) -> GameState:
         """
@@ -692,7 +1096,9 @@ class GameState:
             leader=self.leader.copy(),
             follower=self.follower.copy(),
             talon=self.talon.copy(),
-            previous=None
+            previous=None,
+            trick_cards_mask=self.trick_cards_mask,
+            tricks_played=self.tricks_played
         )
         return new_state
 
@@ -709,7 +1115,9 @@ class GameState:
             leader=self.leader.copy(),
             follower=self.follower.copy(),
             talon=self.talon.copy(),
-            previous=self.previous
+            previous=self.previous,
+            trick_cards_mask=self.trick_cards_mask,
+            tricks_played=self.tricks_played
         )
         new_state.leader.implementation = new_leader
         new_state.follower.implementation = new_follower
@@ -761,44 +1169,15 @@ class PlayerPerspective(ABC):
         Design note: this could also return an Iterable[Move], but list[Move] was chosen to make the API easier to use.
         """
 
-    def get_game_history(self) -> list[tuple[PlayerPerspective, Optional[Trick]]]:
+    def get_game_history(self) -> GameHistory:
         """
         The game history from the perspective of the player. This means all the past PlayerPerspective this bot has seen, and the Tricks played.
         This only provides access to cards the Bot is allowed to see.
 
-        :returns: (list[tuple[PlayerPerspective, Optional[Trick]]]): The PlayerPerspective and Tricks in chronological order, index 0 is the first round played. Only the last Trick will be None.
-        The last pair will contain the current PlayerGameState.
+        :returns: (GameHistory): A sequence of the PlayerPerspective and Tricks in chronological order, index 0 is the first round played. Only the last Trick will be None.
+        The last pair will contain the current PlayerGameState. The past perspectives are only made when they are accessed.
         """
-
-        # We reconstruct the history backwards.
-        game_state_history: list[tuple[PlayerPerspective, Optional[Trick]]] = []
-        # We first push the current state to the end
-        game_state_history.insert(0, (self, None))
-
-        current_leader = self.am_i_leader()
-        current = self.__game_state.previous
-
-        while current:
-            # If we were leader, and we remained, then we were leader before
-            # If we were follower, and we remained, then we were follower before
-            # If we were leader, and we did not remain, then we were follower before
-            # If we were follower, and we did not remain, then we were leader before
-            # This logic gets reflected by the negation of a xor
-            current_leader = not current_leader ^ current.leader_remained_leader
-
-            current_player_perspective: PlayerPerspective
-            if current_leader:
-                current_player_perspective = LeaderPerspective(current.state, self.__engine)
-            else:  # We are following
-                if current.trick.is_trump_exchange():
-                    current_player_perspective = ExchangeFollowerPerspective(current.state, self.__engine)
-                else:
-                    current_player_perspective = FollowerPerspective(current.state, self.__engine, current.trick.as_partial().leader_move)
-            history_record = (current_player_perspective, current.trick)
-            game_state_history.insert(0, history_record)
-
-            current = current.state.previous
-        return game_state_history
+        return GameHistory(self, self.__game_state, self.__engine)
 
     @abstractmethod
     def get_hand(self) -> Hand:
@@ -824,6 +1203,10 @@ class PlayerPerspective(ABC):
         """How many cards are still on the talon?"""
         return len(self.__game_state.talon)
 
+    def get_tricks_played(self) -> int:
+        """How many tricks have been played in this game so far, including trump exchanges? This is also known when the engine does not record the history."""
+        return self.__game_state.tricks_played
+
     def get_phase(self) -> GamePhase:
         """What is the pahse of the game? This returns a GamePhase object.
         You can check the phase by checking state.get_phase == GamePhase.ONE
@@ -842,11 +1225,17 @@ class PlayerPerspective(ABC):
 
     @abstractmethod
     def get_won_cards(self) -> CardCollection:
-        """Get a list of all cards this Bot has won until now."""
+        """
+        Get a list of all cards this Bot has won until now.
+        The cards are ordered by their position in the deck (see CardSet), not by the order in which they were won. Use get_game_history for the order of the tricks.
+        """
 
     @abstractmethod
     def get_opponent_won_cards(self) -> CardCollection:
-        """Get the list of cards the opponent has won until now."""
+        """
+        Get the list of cards the opponent has won until now.
+        Like in get_won_cards, the cards are ordered by their position in the deck, not by the order in which they were won.
+        """
 
     def __get_own_bot_state(self) -> BotState:
         """Get the internal state object of this bot. This should not be used by a bot."""
@@ -872,38 +1261,19 @@ class PlayerPerspective(ABC):
         :param leader_move: (Optional[Move]):The move made by the leader of the trick. These cards have also been seen until now.
         :returns: (CardCollection): A list of all cards your bot has seen until now
         """
-        bot = self.__get_own_bot_state()
-
-        seen_cards: set[Card] = set()  # We make it a set to remove duplicates
-
-        # in own hand
-        seen_cards.update(bot.hand)
+        # the cards in own hand, and all cards which were played in Tricks (icludes marriages and Trump exchanges)
+        seen_mask = self.__get_own_bot_state().hand._mask | self.__game_state.trick_cards_mask
 
         # the trump card
         trump = self.get_trump_card()
         if trump:
-            seen_cards.add(trump)
+            seen_mask |= trump.bit
 
-        # all cards which were played in Tricks (icludes marriages and Trump exchanges)
-
-        seen_cards.update(self.__past_tricks_cards())
         if leader_move is not None:
-            seen_cards.update(leader_move.cards)
-
-        return OrderedCardCollection(seen_cards)
-
-    def __past_tricks_cards(self) -> set[Card]:
-        """
-        Gets the cards played in past tricks
+            for card in leader_move.card_tuple:
+                seen_mask |= card.bit
 
-        :returns: (set[Card]): A set of all cards played in past tricks
-        """
-        past_cards: set[Card] = set()
-        prev = self.__game_state.previous
-        while prev:
-            past_cards.update(prev.trick.cards)
-            prev = prev.state.previous
-        return past_cards
+        return CardSet(mask=seen_mask)
 
     def get_known_cards_of_opponent_hand(self) -> CardCollection:
         """Get all cards which are in the opponents hand, but known to your Bot. This includes cards earlier used in marriages, or a trump exchange.
@@ -915,8 +1285,8 @@ class PlayerPerspective(ABC):
         if self.get_phase() == GamePhase.TWO:
             return opponent_hand
         # We only disclose cards which have been part of a move, i.e., an Exchange or a Marriage
-        past_trick_cards = self.__past_tricks_cards()
-        return OrderedCardCollection(filter(lambda c: c in past_trick_cards, opponent_hand))
+        trick_cards_mask = self.__game_state.trick_cards_mask
+        return OrderedCardCollection(filter(lambda c: c.bit & trick_cards_mask, opponent_hand))
 
     def get_engine(self) -> GamePlayEngine:
         """
@@ -947,60 +1317,213 @@ class PlayerPerspective(ABC):
         This also takes into account cards seen earlier during marriages played by the opponent, as well as potential trump jack exchanges
 
         This removes the real bots from the GameState. If you want to continue the game, provide new Bots. See copy_with_other_bots in the GameState class.
+        To make many guesses for the same decision, use determinization_sampler instead, which only works out once which cards are unknown.
 
         :param leader_move: (Optional[Move]): the optional already executed leader_move in the current trick. This card is guaranteed to be in the hand of the leader in the returned GameState.
         :param rand: (Random):the source of random numbers to do the random assignment of unknown cards
 
         :returns: GameState: A perfect information state object.
         """
-        opponent_hand = self.__get_opponent_bot_state().hand.copy()
+        return self.determinization_sampler(leader_move).sample(rand)
+
+    def determinization_sampler(self, leader_move: Optional[Move]) -> DeterminizationSampler:
+        """
+        Works out which cards are unknown to the player and where they could be, such that many guesses of the unknown cards can be made quickly.
+        Each guess made by the sampler is the same as the one make_assumption makes with the same random numbers.
+
+        :param leader_move: (Optional[Move]): the optional already executed leader_move in the current trick. This card is guaranteed to be in the hand of the leader in the guessed states.
+        :returns: (DeterminizationSampler): The sampler for the current state.
+        """
+        opponent_hand = self.__get_opponent_bot_state().hand
 
         if leader_move is not None:
             assert all(card in opponent_hand for card in leader_move.cards), f"The specified leader_move {leader_move} is not in the hand of the opponent {opponent_hand}"
 
-        full_state = self.__game_state.copy_with_other_bots(_DummyBot(), _DummyBot())
         if self.get_phase() == GamePhase.TWO:
-            return full_state
+            # all cards are known
+            return DeterminizationSampler(self.__game_state, not self.am_i_leader(), [], [], [])
 
         seen_cards = self.seen_cards(leader_move)
         full_deck = self.__engine.deck_generator.get_initial_deck()
+        talon = self.__game_state.talon
+        talon_slots = [index for index, card in enumerate(talon) if card not in seen_cards]
+        opponent_slots = [index for index, card in enumerate(opponent_hand) if card not in seen_cards]
+        unseen_cards = [card for card in full_deck if card not in seen_cards]
 
-        opponent_hand = self.__get_opponent_bot_state().hand.copy()
-        unseen_opponent_hand = list(filter(lambda card: card not in seen_cards, opponent_hand))
+        assert len(talon_slots) + len(opponent_slots) == len(unseen_cards), "Logical error. The number of unseen cards in the opponents hand and in the talon must be equal to the number of unseen cards"
 
-        talon = full_state.talon
-        unseen_talon = list(filter(lambda card: card not in seen_cards, talon))
+        return DeterminizationSampler(self.__game_state, not self.am_i_leader(), unseen_cards, talon_slots, opponent_slots)
 
-        unseen_cards = list(filter(lambda card: card not in seen_cards, full_deck))
-        if len(unseen_cards) > 1:
-            rand.shuffle(unseen_cards)
 
-        assert len(unseen_talon) + len(unseen_opponent_hand) == len(unseen_cards), "Logical error. The number of unseen cards in the opponents hand and in the talon must be equal to the number of unseen cards"
+class GameHistory(Sequence[tuple[PlayerPerspective, Optional[Trick]]]):
+    """
+    The history of a game from the perspective of one of the players, as returned by PlayerPerspective.get_game_history.
+    This is a sequence of pairs of a PlayerPerspective and the Trick played from it, in chronological order. The last pair contains the current perspective, and None as the Trick.
 
-        new_talon: list[Card] = []
-        for card in talon:
-            if card in unseen_talon:
-                # take one of the random cards
-                new_talon.append(unseen_cards.pop())
-            else:
-                new_talon.append(card)
+    Creating the history walks through the previous states once, but the past perspectives are only made when they are accessed.
+    They are cached on the Previous records, such that later histories of the same game reuse them.
 
-        full_state.talon = Talon(new_talon)
+    :param current: (PlayerPerspective): The current perspective of the player.
+    :param state: (GameState): The current state of the game.
+    :param engine: (GamePlayEngine): The engine which is used to play the game.
+    """
 
-        new_opponent_hand = []
-        for card in opponent_hand:
-            if card in unseen_opponent_hand:
-                new_opponent_hand.append(unseen_cards.pop())
-            else:
-                new_opponent_hand.append(card)
-        if self.am_i_leader():
-            full_state.follower.hand = Hand(new_opponent_hand)
-        else:
-            full_state.leader.hand = Hand(new_opponent_hand)
+    def __init__(self, current: PlayerPerspective, state: GameState, engine: GamePlayEngine) -> None:
+        self.__current = current
+        self.__engine = engine
+        # the previous records in chronological order, each with whether the player was the leader in that trick
+        records: list[tuple[Previous, bool]] = []
+        current_leader = current.am_i_leader()
+        previous = state.previous
+        while previous:
+            # If we were leader, and we remained, then we were leader before
+            # If we were follower, and we remained, then we were follower before
+            # If we were leader, and we did not remain, then we were follower before
+            # If we were follower, and we did not remain, then we were leader before
+            # This logic gets reflected by the negation of a xor
+            current_leader = not current_leader ^ previous.leader_remained_leader
+            records.append((previous, current_leader))
+            previous = previous.state.previous
+        records.reverse()
+        self.__records = records
+
+    def __len__(self) -> int:
+        return len(self.__records) + 1
+
+    @overload
+    def __getitem__(self, index: int) -> tuple[PlayerPerspective, Optional[Trick]]:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[tuple[PlayerPerspective, Optional[Trick]]]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[tuple[PlayerPerspective, Optional[Trick]], list[tuple[PlayerPerspective, Optional[Trick]]]]:
+        """
+        Get a pair of the history. Slicing gives a list of the pairs, in which only the sliced perspectives are made.
+
+        :param index: (Union[int, slice]): The index of the pair, negative indices count from the end.
+        :returns: (Union[tuple[PlayerPerspective, Optional[Trick]], list[tuple[PlayerPerspective, Optional[Trick]]]]): The pair, or the list of pairs for a slice.
+        """
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if index == len(self.__records):
+            return self.__current, None
+        if not 0 <= index < len(self.__records):
+            raise IndexError("game history index out of range")
+        previous, was_leader = self.__records[index]
+        return previous.perspective(was_leader, self.__engine), previous.trick
+
+    def __iter__(self) -> Iterator[tuple[PlayerPerspective, Optional[Trick]]]:
+        engine = self.__engine
+        for previous, was_leader in self.__records:
+            yield previous.perspective(was_leader, engine), previous.trick
+        yield self.__current, None
+
+    def tricks(self) -> list[Trick]:
+        """
+        Get the tricks played in the game so far, without making any of the past perspectives.
 
-        assert len(unseen_cards) == 0, "All cards must be consumed by either the opponent hand or talon by now"
+        :returns: (list[Trick]): The tricks in chronological order. This is one less than the length of the history, as the current perspective has no trick yet.
+        """
+        return [previous.trick for previous, _ in self.__records]
+
+    def __repr__(self) -> str:
+        return f"GameHistory(current={self.__current}, tricks={self.tricks()})"
+
+
+class DeterminizationSampler:
+    """
+    Makes random guesses of the unknown cards in a game, as seen by one of the players. Create it with PlayerPerspective.determinization_sampler.
+    The unknown cards and the places they could be in are worked out once, when the sampler is created, such that each guess only needs to shuffle the unknown cards.
+
+    A guess can be represented compactly as a permutation of the unknown cards (see sample_permutations), and turned into a full state with state_from_permutation.
+
+    :param game_state: (GameState): The real state of the game. It is not modified, and must not be modified while the sampler is in use.
+    :param opponent_is_leader: (bool): Whether the opponent of the player is the leader.
+    :param unseen_cards: (list[Card]): The cards which the player has not seen, in the order of the initial deck.
+    :param talon_slots: (list[int]): The positions in the talon which hold an unseen card.
+    :param opponent_slots: (list[int]): The positions in the hand of the opponent which hold an unseen card.
+    """
+
+    def __init__(self, game_state: GameState, opponent_is_leader: bool, unseen_cards: list[Card], talon_slots: list[int], opponent_slots: list[int]) -> None:
+        assert len(talon_slots) + len(opponent_slots) == len(unseen_cards), "Each unseen card must have a place"
+        self.__game_state = game_state
+        self.__opponent_is_leader = opponent_is_leader
+        self.__unseen_cards = unseen_cards
+        self.__talon_slots = talon_slots
+        self.__opponent_slots = opponent_slots
+
+    @property
+    def unseen_cards(self) -> list[Card]:
+        """The cards which the player has not seen, in the order of the initial deck. The permutations are permutations of these cards."""
+        return list(self.__unseen_cards)
+
+    def sample(self, rand: Random) -> GameState:
+        """
+        Make a random guess of the unknown cards, like PlayerPerspective.make_assumption.
 
-        return full_state
+        :param rand: (Random): The source of random numbers.
+        :returns: (GameState): A perfect information state, with bots which cannot play. See copy_with_other_bots in the GameState class.
+        """
+        return self.state_from_permutation(self.__permutation(rand))
+
+    def sample_many(self, rand: Random, number_of_samples: int) -> list[GameState]:
+        """
+        Make several random guesses of the unknown cards.
+
+        :param rand: (Random): The source of random numbers.
+        :param number_of_samples: (int): The number of guesses.
+        :returns: (list[GameState]): The guesses, the same as calling sample this many times.
+        """
+        return [self.sample(rand) for _ in range(number_of_samples)]
+
+    def sample_permutations(self, rand: Random, number_of_samples: int) -> list[list[Card]]:
+        """
+        Make several random guesses of the unknown cards, without creating the states. Turn them into states with state_from_permutation.
+
+        :param rand: (Random): The source of random numbers.
+        :param number_of_samples: (int): The number of guesses.
+        :returns: (list[list[Card]]): For each guess, a permutation of unseen_cards.
+        """
+        return [self.__permutation(rand) for _ in range(number_of_samples)]
+
+    def __permutation(self, rand: Random) -> list[Card]:
+        cards = list(self.__unseen_cards)
+        if len(cards) > 1:
+            rand.shuffle(cards)
+        return cards
+
+    def state_from_permutation(self, permutation: list[Card]) -> GameState:
+        """
+        Create the state for a guess of the unknown cards.
+        The unseen cards are put in the free places of the talon from top to bottom, and then in those of the hand of the opponent, taking cards from the end of the permutation.
+
+        :param permutation: (list[Card]): A permutation of unseen_cards.
+        :returns: (GameState): A perfect information state, with bots which cannot play. See copy_with_other_bots in the GameState class.
+        """
+        assert len(permutation) == len(self.__unseen_cards), f"The permutation must have one card for each of the {len(self.__unseen_cards)} unseen cards"
+        game_state = self.__game_state
+        next_card = len(permutation) - 1
+
+        talon_cards = game_state.talon.get_cards()
+        for slot in self.__talon_slots:
+            talon_cards[slot] = permutation[next_card]
+            next_card -= 1
+
+        opponent, me = (game_state.leader, game_state.follower) if self.__opponent_is_leader else (game_state.follower, game_state.leader)
+        opponent_cards = opponent.hand.get_cards()
+        for slot in self.__opponent_slots:
+            opponent_cards[slot] = permutation[next_card]
+            next_card -= 1
+
+        new_opponent = BotState(implementation=_DummyBot(), hand=Hand(opponent_cards), score=opponent.score, won_cards=list(opponent.won_cards))
+        new_me = BotState(implementation=_DummyBot(), hand=me.hand.copy(), score=me.score, won_cards=list(me.won_cards))
+        leader, follower = (new_opponent, new_me) if self.__opponent_is_leader else (new_me, new_opponent)
+        return GameState(leader=leader, follower=follower, talon=Talon(talon_cards, game_state.trump_suit), previous=game_state.previous,
+                         trick_cards_mask=game_state.trick_cards_mask, tricks_played=game_state.tricks_played)
 
 
 class _DummyBot(Bot):
@@ -1083,7 +1606,7 @@ class LeaderPerspective(PlayerPerspective):
 
         :returns: (CardCollection): A CardCollection of all tricks the leader has won until now.
         """
-        return OrderedCardCollection(self.__game_state.leader.won_cards)
+        return CardSet(self.__game_state.leader.won_cards)
 
     def get_opponent_won_cards(self) -> CardCollection:
         """
@@ -1092,7 +1615,7 @@ class LeaderPerspective(PlayerPerspective):
         :returns: (CardCollection): A CardCollection of all tricks the follower has won until now.
         """
 
-        return OrderedCardCollection(self.__game_state.follower.won_cards)
+        return CardSet(self.__game_state.follower.won_cards)
 
     def __repr__(self) -> str:
         return f"LeaderPerspective(state={self.__game_state}, engine={self.__engine})"
@@ -1172,7 +1695,7 @@ class FollowerPerspective(PlayerPerspective):
         :returns: (CardCollection): A CardCollection of all tricks the follower has won until now.
         """
 
-        return OrderedCardCollection(self.__game_state.follower.won_cards)
+        return CardSet(self.__game_state.follower.won_cards)
 
     def get_opponent_won_cards(self) -> CardCollection:
         """
@@ -1181,7 +1704,7 @@ class FollowerPerspective(PlayerPerspective):
         :returns: (CardCollection): A CardCollection of all tricks the leader has won until now.
         """
 
-        return OrderedCardCollection(self.__game_state.leader.won_cards)
+        return CardSet(self.__game_state.leader.won_cards)
 
     def __repr__(self) -> str:
         return f"FollowerPerspective(state={self.__game_state}, engine={self.__engine}, leader_move={self.__leader_move})"
@@ -1263,7 +1786,7 @@ class ExchangeFollowerPerspective(PlayerPerspective):
 
         :returns: (CardCollection): A CardCollection of all tricks the leader has won until now.
         """
-        return OrderedCardCollection(self.__game_state.leader.won_cards)
+        return CardSet(self.__game_state.leader.won_cards)
 
     def get_won_cards(self) -> CardCollection:
         """
@@ -1272,7 +1795,7 @@ class ExchangeFollowerPerspective(PlayerPerspective):
         :returns: (CardCollection): A CardCollection of all tricks the follower has won until now.
         """
 
-        return OrderedCardCollection(self.__game_state.follower.won_cards)
+        return CardSet(self.__game_state.follower.won_cards)
 
     def am_i_leader(self) -> bool:
         """ Returns False because this is the follower perspective"""
@@ -1415,7 +1938,7 @@ class TrickImplementer(ABC):
         Plays a single Trick the game by asking the bots in the game_state for their Moves,
         using the MoveRequester from the game_engine.
         These moves are then also validated using the MoveValidator of the game_engine.
-        Finally, the trick is recorder in the history (previous field) of the returned GameState.
+        Finally, the trick is recorder in the history (previous field) of the returned GameState, unless the record_history of the game_engine is False.
 
         Note, the provided GameState does not get modified by this method.
 
@@ -1431,6 +1954,34 @@ class TrickImplementer(ABC):
         The same as play_trick, but also takes the leader_move to start with as an argument.
         """
 
+    def apply_trick_in_place(self, game_engine: GamePlayEngine, game_state: GameState,
+                             leader_move: Move, follower_move: Optional[Move]) -> TrickUndoRecord:
+        """
+        Applies the trick formed by the given moves directly to the game_state, without asking bots for moves, validating the moves, notifying the bots, or recording history.
+        The returned record can be passed to undo_trick to restore the game_state as it was before.
+        This is intended for search algorithms, which can walk the game tree this way without creating a new GameState for each trick.
+
+        Implementing this method is optional, the default implementation raises a NotImplementedError.
+
+        :param game_engine: The engine used to preform the underlying actions of the Trick.
+        :param game_state: The state of the game to which the trick is applied. This state will be modified.
+        :param leader_move: The move of the leader
+        :param follower_move: The move of the follower, or None if the leader_move is a trump exchange.
+        :returns: The record with which the trick can be undone.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support applying tricks in place")
+
+    def undo_trick(self, game_state: GameState, undo: TrickUndoRecord) -> None:
+        """
+        Reverts a trick applied with apply_trick_in_place. Tricks must be undone in the reverse order in which they were applied.
+
+        Implementing this method is optional, the default implementation raises a NotImplementedError.
+
+        :param game_state: The state of the game to which the trick was applied. This state will be modified.
+        :param undo: The record returned by apply_trick_in_place.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support undoing tricks")
+
 
 class SchnapsenTrickImplementer(TrickImplementer):
     """
@@ -1468,7 +2019,8 @@ class SchnapsenTrickImplementer(TrickImplementer):
             assert old_trump_card, "There is no card at the bottom of the talon"
             self.play_trump_exchange(next_game_state, exchange)
             # remember the previous state
-            next_game_state.previous = Previous(game_state, ExchangeTrick(exchange, old_trump_card), True)
+            if game_engine.record_history:
+                next_game_state.previous = Previous(game_state, ExchangeTrick(exchange, old_trump_card), True)
             # The whole trick ends here.
             return next_game_state
 
@@ -1492,31 +2044,103 @@ class SchnapsenTrickImplementer(TrickImplementer):
         # apply the trick to the next_game_state
         # The next game state will be modified during this trick. We start from the previous state
         next_game_state = game_state.copy_for_next()
+        leader_remained_leader = self._apply_regular_trick_in_place(game_engine, next_game_state, trick)
+        if game_engine.record_history:
+            next_game_state.previous = Previous(game_state, trick=trick, leader_remained_leader=leader_remained_leader)
+
+        return next_game_state
 
+    def _apply_regular_trick_in_place(self, game_engine: GamePlayEngine, game_state: GameState, trick: RegularTrick) -> bool:
+        """
+        Applies the given regular trick to the given game state. This method modifies the game state, but does not record the trick in the history.
+
+        :param game_engine: (GamePlayEngine): The engine used to preform the underlying actions of the Trick.
+        :param game_state: (GameState): The state of the game to which the trick is applied. This state will be modified.
+        :param trick: (RegularTrick): The trick to be applied to the game state.
+        :returns: (bool): Whether the leader of the trick remained the leader.
+        """
         if trick.leader_move.is_marriage():
             marriage_move: Marriage = cast(Marriage, trick.leader_move)
-            self._play_marriage(game_engine, next_game_state, marriage_move=marriage_move)
+            self._play_marriage(game_engine, game_state, marriage_move=marriage_move)
             regular_leader_move: RegularMove = cast(Marriage, trick.leader_move).underlying_regular_move()
         else:
             regular_leader_move = cast(RegularMove, trick.leader_move)
 
         # # apply changes in the hand and talon
-        next_game_state.leader.hand.remove(regular_leader_move.card)
-        next_game_state.follower.hand.remove(trick.follower_move.card)
+        game_state.leader.hand.remove(regular_leader_move.card)
+        game_state.follower.hand.remove(trick.follower_move.card)
+        trick_cards_mask = game_state.trick_cards_mask | trick.follower_move.card.bit
+        for card in trick.leader_move.card_tuple:
+            trick_cards_mask |= card.bit
+        game_state.trick_cards_mask = trick_cards_mask
+        game_state.tricks_played += 1
 
         # We set the leader for the next state based on what the scorer decides
-        next_game_state.leader, next_game_state.follower, leader_remained_leader = game_engine.trick_scorer.score(trick, next_game_state.leader, next_game_state.follower, next_game_state.trump_suit)
+        game_state.leader, game_state.follower, leader_remained_leader = game_engine.trick_scorer.score(trick, game_state.leader, game_state.follower, game_state.trump_suit)
 
         # important: the winner takes the first card of the talon, the loser the second one.
         # this also ensures that the loser of the last trick of the first phase gets the face up trump
-        if not next_game_state.talon.is_empty():
-            drawn = iter(next_game_state.talon.draw_cards(2))
-            next_game_state.leader.hand.add(next(drawn))
-            next_game_state.follower.hand.add(next(drawn))
+        if not game_state.talon.is_empty():
+            drawn = iter(game_state.talon.draw_cards(2))
+            game_state.leader.hand.add(next(drawn))
+            game_state.follower.hand.add(next(drawn))
+        return leader_remained_leader
 
-        next_game_state.previous = Previous(game_state, trick=trick, leader_remained_leader=leader_remained_leader)
+    def apply_trick_in_place(self, game_engine: GamePlayEngine, game_state: GameState,
+                             leader_move: Move, follower_move: Optional[Move]) -> TrickUndoRecord:
+        """
+        Applies the trick formed by the given moves directly to the game_state, without asking bots for moves, validating the moves, notifying the bots, or recording history.
+        The returned record can be passed to undo_trick to restore the game_state as it was before.
 
-        return next_game_state
+        :param game_engine: (GamePlayEngine): The engine used to preform the underlying actions of the Trick.
+        :param game_state: (GameState): The state of the game to which the trick is applied. This state will be modified.
+        :param leader_move: (Move): The move of the leader
+        :param follower_move: (Optional[Move]): The move of the follower, or None if the leader_move is a trump exchange.
+        :returns: (TrickUndoRecord): The record with which the trick can be undone.
+        """
+        leader, follower = game_state.leader, game_state.follower
+        talon = game_state.talon
+        undo = TrickUndoRecord(
+            leader=leader,
+            follower=follower,
+            leader_score=leader.score,
+            follower_score=follower.score,
+            leader_won_cards=tuple(leader.won_cards),
+            follower_won_cards=tuple(follower.won_cards),
+            leader_hand=tuple(leader.hand.cards),
+            follower_hand=tuple(follower.hand.cards),
+            talon=talon,
+            trick_cards_mask=game_state.trick_cards_mask,
+            tricks_played=game_state.tricks_played,
+        )
+        if not talon.is_empty():
+            # The talon will change, the undo record keeps the original
+            game_state.talon = talon.copy()
+        if leader_move.is_trump_exchange():
+            assert follower_move is None, "There is no follower move after a trump exchange"
+            self._exchange_trump(game_state, cast(TrumpExchange, leader_move))
+        else:
+            assert follower_move is not None, "A follower move is needed to complete the trick"
+            trick = RegularTrick(leader_move=cast(Union[Marriage, RegularMove], leader_move), follower_move=cast(RegularMove, follower_move))
+            self._apply_regular_trick_in_place(game_engine, game_state, trick)
+        return undo
+
+    def undo_trick(self, game_state: GameState, undo: TrickUndoRecord) -> None:
+        """
+        Reverts a trick applied with apply_trick_in_place. Tricks must be undone in the reverse order in which they were applied.
+
+        :param game_state: (GameState): The state of the game to which the trick was applied. This state will be modified.
+        :param undo: (TrickUndoRecord): The record returned by apply_trick_in_place.
+        """
+        leader, follower = undo.leader, undo.follower
+        game_state.leader, game_state.follower = leader, follower
+        game_state.talon = undo.talon
+        game_state.trick_cards_mask = undo.trick_cards_mask
+        game_state.tricks_played = undo.tricks_played
+        leader.score, follower.score = undo.leader_score, undo.follower_score
+        leader.won_cards, follower.won_cards = list(undo.leader_won_cards), list(undo.follower_won_cards)
+        leader.hand.cards = list(undo.leader_hand)
+        follower.hand.cards = list(undo.follower_hand)
 
     def get_leader_move(self, game_engine: GamePlayEngine, game_state: GameState) -> Move:
         """
@@ -1539,6 +2163,18 @@ class SchnapsenTrickImplementer(TrickImplementer):
         """
         Apply a trump exchange to the given game state. This method modifies the game state.
 
+        :param game_state: (GameState): The state of the game before the trump exchange is played. This state will be modified.
+        :param trump_exchange: (TrumpExchange): The trump exchange to be applied to the game state.
+        """
+        self._exchange_trump(game_state, trump_exchange)
+        # We notify the both bots that an exchange happened
+        game_state.leader.implementation.notify_trump_exchange(trump_exchange)
+        game_state.follower.implementation.notify_trump_exchange(trump_exchange)
+
+    def _exchange_trump(self, game_state: GameState, trump_exchange: TrumpExchange) -> None:
+        """
+        Apply the changes of a trump exchange to the hand of the leader and the talon, without notifying the bots. This method modifies the game state.
+
         :param game_state: (GameState): The state of the game before the trump exchange is played. This state will be modified.
         :param trump_exchange: (TrumpExchange): The trump exchange to be applied to the game state.
         """
@@ -1548,9 +2184,8 @@ class SchnapsenTrickImplementer(TrickImplementer):
         game_state.leader.hand.remove(trump_exchange.jack)
         old_trump = game_state.talon.trump_exchange(trump_exchange.jack)
         game_state.leader.hand.add(old_trump)
-        # We notify the both bots that an exchange happened
-        game_state.leader.implementation.notify_trump_exchange(trump_exchange)
-        game_state.follower.implementation.notify_trump_exchange(trump_exchange)
+        game_state.trick_cards_mask |= trump_exchange.jack.bit | old_trump.bit
+        game_state.tricks_played += 1
 
     def _play_marriage(self, game_engine: GamePlayEngine, game_state: GameState, marriage_move: Marriage) -> None:
         """
@@ -1582,6 +2217,53 @@ class SchnapsenTrickImplementer(TrickImplementer):
         return cast(RegularMove, follower_move)
 
 
+class TrustedSchnapsenTrickImplementer(SchnapsenTrickImplementer):
+    """
+    A SchnapsenTrickImplementer for simulations with bots which are trusted to play legal moves, see FastSchnapsenGamePlayEngine.
+    The moves are requested from the bots directly instead of through the MoveRequester of the engine, they are not checked, and the bots are not notified of trump exchanges.
+
+    :param validate: (bool): If True, the moves are requested and validated as in SchnapsenTrickImplementer, to test whether the bots can be trusted. The bots are still not notified.
+    """
+
+    def __init__(self, validate: bool = False) -> None:
+        self.validate = validate
+
+    def get_leader_move(self, game_engine: GamePlayEngine, game_state: GameState) -> Move:
+        """
+        Get the move of the leader of the trick, without validating it unless validate is set.
+
+        :param game_engine: (GamePlayEngine): The engine used to preform the underlying actions of the Trick.
+        :param game_state: (GameState): The state of the game before the trick is played. This state will not be modified.
+        :returns: (Move): The move of the leader of the trick.
+        """
+        if self.validate:
+            return super().get_leader_move(game_engine, game_state)
+        return game_state.leader.implementation.get_move(LeaderPerspective(game_state, game_engine), leader_move=None)
+
+    def get_follower_move(self, game_engine: GamePlayEngine, game_state: GameState, leader_move: Move) -> RegularMove:
+        """
+        Get the move of the follower of the trick, without validating it unless validate is set.
+
+        :param game_engine: (GamePlayEngine): The engine used to preform the underlying actions of the Trick.
+        :param game_state: (GameState): The state of the game before the trick is played. This state will not be modified.
+        :param leader_move: (Move): The move made by the leader of the trick.
+        :returns: (RegularMove): The move of the follower of the trick.
+        """
+        if self.validate:
+            return super().get_follower_move(game_engine, game_state, leader_move)
+        follower_move = game_state.follower.implementation.get_move(FollowerPerspective(game_state, game_engine, leader_move), leader_move=leader_move)
+        return cast(RegularMove, follower_move)
+
+    def play_trump_exchange(self, game_state: GameState, trump_exchange: TrumpExchange) -> None:
+        """
+        Apply a trump exchange to the given game state, without notifying the bots. This method modifies the game state.
+
+        :param game_state: (GameState): The state of the game before the trump exchange is played. This state will be modified.
+        :param trump_exchange: (TrumpExchange): The trump exchange to be applied to the game state.
+        """
+        self._exchange_trump(game_state, trump_exchange)
+
+
 class MoveRequester:
     """
     An moveRequester captures the logic of requesting a move from a bot.
@@ -1710,8 +2392,25 @@ class MoveValidator(ABC):
 class SchnapsenMoveValidator(MoveValidator):
     """
     The move validator for the game of Schnapsen.
+
+    The legal follower moves in the second phase are memoized, keyed by the set of cards in the hand of the follower (the bitmask of the hand), the card played by the leader, the trump suit, and the trick scorer.
+    The same cached entry serves both get_legal_follower_moves and is_legal_follower_move. In the first phase, all cards in the hand are legal, so nothing is cached.
+
+    :param follower_cache_size: (int): The maximum number of entries in the cache of legal follower moves. When the cache is full, the oldest half of the entries is dropped. Defaults to 2**17.
     """
 
+    def __init__(self, follower_cache_size: int = 2**17) -> None:
+        assert follower_cache_size >= 1, f"The cache must have room for at least one entry, got {follower_cache_size}"
+        self.follower_cache_size = follower_cache_size
+        # maps the key described above to the bitmask of the legal cards. The entries are in the order in which they were added.
+        self._follower_cache: dict[tuple[Any, ...], int] = {}
+
+    def __getstate__(self) -> dict[str, Any]:
+        # The cache is not pickled with the validator, for example when the engine is sent to another process. It is filled again there.
+        state = self.__dict__.copy()
+        state["_follower_cache"] = {}
+        return state
+
     def get_legal_leader_moves(self, game_engine: GamePlayEngine, game_state: GameState) -> Iterable[Move]:
         """
         Get all legal moves for the current leader of the game.
@@ -1723,17 +2422,16 @@ class SchnapsenMoveValidator(MoveValidator):
         """
         # all cards in the hand can be played
         cards_in_hand = game_state.leader.hand
-        valid_moves: list[Move] = [RegularMove(card) for card in cards_in_hand]
+        valid_moves: list[Move] = RegularMove.from_cards(cards_in_hand.cards)
         # trump exchanges
         if not game_state.talon.is_empty():
-            trump_jack = Card.get_card(Rank.JACK, game_state.trump_suit)
-            if trump_jack in cards_in_hand:
-                valid_moves.append(TrumpExchange(trump_jack))
+            trump_suit = game_state.trump_suit
+            if Card.get_card(Rank.JACK, trump_suit) in cards_in_hand:
+                valid_moves.append(TrumpExchange.get_move(trump_suit))
         # mariages
         for card in cards_in_hand.filter_rank(Rank.QUEEN):
-            king_card = Card.get_card(Rank.KING, card.suit)
-            if king_card in cards_in_hand:
-                valid_moves.append(Marriage(card, king_card))
+            if Card.get_card(Rank.KING, card.suit) in cards_in_hand:
+                valid_moves.append(Marriage.get_move(card.suit))
         return valid_moves
 
     def is_legal_leader_move(self, game_engine: GamePlayEngine, game_state: GameState, move: Move) -> bool:
@@ -1768,17 +2466,76 @@ class SchnapsenMoveValidator(MoveValidator):
         :param game_state: (GameState): The current state of the game
         :param leader_move: (Move): The move played by the leader of the trick.
 
-        :returns: (Iterable[Move]): An iterable containing the current legal moves.
+        :returns: (Iterable[Move]): An iterable containing the current legal moves, in the order of the cards in the hand.
+        """
+        legal_mask = self._get_legal_follower_mask(game_engine, game_state, leader_move)
+        return tuple(RegularMove.get_move(card) for card in game_state.follower.hand.cards if card.bit & legal_mask)
+
+    def is_legal_follower_move(self, game_engine: GamePlayEngine, game_state: GameState, leader_move: Move, move: Move) -> bool:
+        """
+        Whether the provided move is legal for the follower to play.
+
+        :param game_engine: (GamePlayEngine): The engine which is playing the game
+        :param game_state: (GameState): The current state of the game
+        :param leader_move: (Move): The move played by the leader of the trick.
+        :param move: (Move): The move to check
+
+        :returns: (bool): Whether the move is legal
+        """
+        assert move, 'The move played by the follower cannot be None'
+        assert leader_move, 'The move played by the leader cannot be None'
+        if not move.is_regular_move():
+            return False
+        return self._get_legal_follower_mask(game_engine, game_state, leader_move) & cast(RegularMove, move).card.bit != 0
+
+    def _get_legal_follower_mask(self, game_engine: GamePlayEngine, game_state: GameState, leader_move: Move) -> int:
         """
+        Get the bitmask of the cards the follower is allowed to play, from the cache if it is in there.
+
+        :param game_engine: (GamePlayEngine): The engine which is playing the game
+        :param game_state: (GameState): The current state of the game
+        :param leader_move: (Move): The move played by the leader of the trick.
 
+        :returns: (int): The bitmask (see CardSet) of the legal cards.
+        """
         hand = game_state.follower.hand
+        phase = game_state.game_phase()
+        if phase is GamePhase.ONE:
+            # no need to follow, any card in the hand is a legal move
+            return hand._mask
         if leader_move.is_marriage():
             leader_card = cast(Marriage, leader_move).queen_card
         else:
             leader_card = cast(RegularMove, leader_move).card
-        if game_state.game_phase() is GamePhase.ONE:
+        # the legal cards only depend on which cards are in the hand, not on their order. A hand with duplicates is keyed by all its cards.
+        hand_key: Any = tuple(hand.cards) if hand._has_duplicates else hand._mask
+        key = (hand_key, leader_card, game_state.trump_suit, game_engine.trick_scorer)
+        legal_mask = self._follower_cache.get(key)
+        if legal_mask is None:
+            legal_mask = CardSet.mask_of(self._compute_legal_follower_cards(game_engine, game_state, leader_card, phase))
+            cache = self._follower_cache
+            if len(cache) >= self.follower_cache_size:
+                # drop the oldest half, such that the more recent entries stay available
+                for old_key in list(itertools.islice(cache, (len(cache) + 1) // 2)):
+                    del cache[old_key]
+            cache[key] = legal_mask
+        return legal_mask
+
+    def _compute_legal_follower_cards(self, game_engine: GamePlayEngine, game_state: GameState, leader_card: Card, phase: GamePhase) -> list[Card]:
+        """
+        Compute the cards the follower is allowed to play.
+
+        :param game_engine: (GamePlayEngine): The engine which is playing the game
+        :param game_state: (GameState): The current state of the game
+        :param leader_card: (Card): The card played by the leader. In case of a marriage, this is the queen.
+        :param phase: (GamePhase): The current phase of the game
+
+        :returns: (list[Card]): The cards the follower can legally play, in the order in which they are in the hand.
+        """
+        hand = game_state.follower.hand
+        if phase is GamePhase.ONE:
             # no need to follow, any card in the hand is a legal move
-            return RegularMove.from_cards(hand.get_cards())
+            return hand.get_cards()
         # information from https://www.pagat.com/marriage/schnaps.html
         # ## original formulation ##
         # if your opponent leads a non-trump:
@@ -1795,6 +2552,7 @@ class SchnapsenMoveValidator(MoveValidator):
         # failing this, you must play a lower card of the same suit;
         # --new--> failing this, if the opponen did not play a trump, you must play a trump
         # failing this, you can play anything
+        trump_suit = game_state.trump_suit
         leader_card_score = game_engine.trick_scorer.rank_to_points(leader_card.rank)
         # you must play a higher card of the same suit if you can;
         same_suit_cards = hand.filter_suit(leader_card.suit)
@@ -1804,17 +2562,17 @@ class SchnapsenMoveValidator(MoveValidator):
                 # TODO this is slightly ambigousm should this be >= ??
                 higher_same_suit.append(card) if game_engine.trick_scorer.rank_to_points(card.rank) > leader_card_score else lower_same_suit.append(card)
             if higher_same_suit:
-                return RegularMove.from_cards(higher_same_suit)
+                return higher_same_suit
         # failing this, you must play a lower card of the same suit;
             elif lower_same_suit:
-                return RegularMove.from_cards(lower_same_suit)
+                return lower_same_suit
             raise AssertionError("Somethign is wrong in the logic here. There should be cards, but they are neither placed in the low, nor higher list")
         # failing this, if the opponen did not play a trump, you must play a trump
-        trump_cards = hand.filter_suit(game_state.trump_suit)
-        if leader_card.suit != game_state.trump_suit and trump_cards:
-            return RegularMove.from_cards(trump_cards)
+        trump_cards = hand.filter_suit(trump_suit)
+        if leader_card.suit != trump_suit and trump_cards:
+            return trump_cards
         # failing this, you can play anything
-        return RegularMove.from_cards(hand.get_cards())
+        return hand.get_cards()
 
 
 class TrickScorer(ABC):
@@ -1856,6 +2614,10 @@ class TrickScorer(ABC):
 class SchnapsenTrickScorer(TrickScorer):
     """
     A TrickScorer that scores ac cording to the Schnapsen rules
+
+    On construction, the outcome of every possible trick is computed and stored in a table, such that scoring a trick is a lookup.
+    The table is derived from rank_to_points, so derived classes which only change the points of the cards get a correct table automatically.
+    Derived classes defining their own __init__ must call super().__init__().
     """
 
     SCORES = {
@@ -1866,6 +2628,64 @@ class SchnapsenTrickScorer(TrickScorer):
         Rank.JACK: 2,
     }
 
+    def __init__(self) -> None:
+        # For each trump suit, a list indexed by leader_card.index * len(Card) + follower_card.index,
+        # containing whether the leader wins the trick and how many points the winner gets.
+        # Entries are None for pairs of cards which were not computed up front, these get filled when first needed.
+        self._number_of_cards = len(Card)
+        self._trick_table: dict[Suit, list[Optional[tuple[bool, int]]]] = {}
+        self._build_trick_table()
+
+    def _build_trick_table(self) -> None:
+        """
+        Compute the outcome of all tricks which can be played with cards for which rank_to_points is defined.
+        """
+        scored_cards: list[Card] = []
+        for card in Card:
+            try:
+                self.rank_to_points(card.rank)
+            except KeyError:
+                # this rank is not used by this scorer
+                continue
+            scored_cards.append(card)
+        number_of_cards = self._number_of_cards
+        for trump in Suit:
+            table: list[Optional[tuple[bool, int]]] = [None] * (number_of_cards * number_of_cards)
+            for leader_card in scored_cards:
+                for follower_card in scored_cards:
+                    if leader_card is not follower_card:
+                        table[leader_card.index * number_of_cards + follower_card.index] = self._resolve_trick(leader_card, follower_card, trump)
+            self._trick_table[trump] = table
+
+    def _resolve_trick(self, leader_card: Card, follower_card: Card, trump: Suit) -> tuple[bool, int]:
+        """
+        Determine the outcome of a trick in which the leader played leader_card and the follower played follower_card.
+
+        :param leader_card: The card played by the leader
+        :param follower_card: The card played by the follower
+        :param trump: The trump suit
+        :returns: Whether the leader wins the trick and the number of points the winner obtains
+        """
+        leader_card_points = self.rank_to_points(leader_card.rank)
+        follower_card_points = self.rank_to_points(follower_card.rank)
+
+        if leader_card.suit is follower_card.suit:
+            # same suit, either trump or not
+            if leader_card_points > follower_card_points:
+                leader_wins = True
+            else:
+                leader_wins = False
+        elif leader_card.suit is trump:
+            # the follower suit cannot be trumps as per the previous condition
+            leader_wins = True
+        elif follower_card.suit is trump:
+            # the leader suit cannot be trumps because of the previous conditions
+            leader_wins = False
+        else:
+            # the follower did not follow the suit of the leader and did not play trumps, hence the leader wins
+            leader_wins = True
+        return leader_wins, leader_card_points + follower_card_points
+
     def rank_to_points(self, rank: Rank) -> int:
         """
         Convert a rank to the number of points it is worth.
@@ -1909,32 +2729,20 @@ class SchnapsenTrickScorer(TrickScorer):
         leader_card = regular_leader_move.card
         follower_card = trick.follower_move.card
         assert leader_card != follower_card, f"The leader card {leader_card} and follower_card {follower_card} cannot be the same."
-        leader_card_points = self.rank_to_points(leader_card.rank)
-        follower_card_points = self.rank_to_points(follower_card.rank)
 
-        if leader_card.suit is follower_card.suit:
-            # same suit, either trump or not
-            if leader_card_points > follower_card_points:
-                leader_wins = True
-            else:
-                leader_wins = False
-        elif leader_card.suit is trump:
-            # the follower suit cannot be trumps as per the previous condition
-            leader_wins = True
-        elif follower_card.suit is trump:
-            # the leader suit cannot be trumps because of the previous conditions
-            leader_wins = False
-        else:
-            # the follower did not follow the suit of the leader and did not play trumps, hence the leader wins
-            leader_wins = True
+        table = self._trick_table[trump]
+        table_index = leader_card.index * self._number_of_cards + follower_card.index
+        outcome = table[table_index]
+        if outcome is None:
+            outcome = table[table_index] = self._resolve_trick(leader_card, follower_card, trump)
+        leader_wins, points_gained = outcome
+
         winner, loser = (leader, follower) if leader_wins else (follower, leader)
-        # record the win
-        winner.won_cards.extend([leader_card, follower_card])
-        # apply the points
-        points_gained = leader_card_points + follower_card_points
-        winner.score += Score(direct_points=points_gained)
-        # add winner's total of direct and pending points as their new direct points
-        winner.score = winner.score.redeem_pending_points()
+        # record the win. The list is shared with earlier copies of the state, so we create a new one
+        winner.won_cards = winner.won_cards + [leader_card, follower_card]
+        # apply the points, and add winner's total of direct and pending points as their new direct points
+        winner_score = winner.score
+        winner.score = Score(direct_points=winner_score.direct_points + winner_score.pending_points + points_gained)
         return winner, loser, leader_wins
 
     def declare_winner(self, game_state: GameState) -> Optional[tuple[BotState, int]]:
@@ -1971,6 +2779,112 @@ class SchnapsenTrickScorer(TrickScorer):
             return None
 
 
+@dataclass(frozen=True)
+class GameResult:
+    """
+    The outcome of one game played by GamePlayEngine.play_games.
+    """
+
+    seed: int
+    """The seed of the random.Random used to shuffle the deck"""
+    bot1_leads: bool
+    """Whether the first bot was the leader in the first trick"""
+    winner: int
+    """Which bot won the game: 1 for the first bot, 2 for the second one"""
+    game_points: int
+    """The number of game points won"""
+    score: Score
+    """The score of the winner"""
+
+    @property
+    def bot1_game_points(self) -> int:
+        """The game points won by the first bot, negative if the second bot won"""
+        return self.game_points if self.winner == 1 else -self.game_points
+
+
+@dataclass(frozen=True)
+class DuplicateResult:
+    """
+    The outcome of a deal played twice by GamePlayEngine.play_duplicate_games, once with each bot leading the first trick.
+    """
+
+    seed: int
+    """The seed of the random.Random used to shuffle the deck"""
+    bot1_leading: GameResult
+    """The game in which the first bot led the first trick"""
+    bot2_leading: GameResult
+    """The game in which the second bot led the first trick"""
+
+    @property
+    def difference(self) -> int:
+        """The game points won by the first bot in both games together, negative if the second bot won more"""
+        return self.bot1_leading.bot1_game_points + self.bot2_leading.bot1_game_points
+
+
+@dataclass(frozen=True)
+class PairedComparison:
+    """
+    A summary of the paired differences between two bots, see DuplicateResult.difference.
+    Because both bots played the same deals, the luck of the deal cancels out in each difference, and their spread is much smaller than that of single games.
+    """
+
+    deals: int
+    """The number of deals"""
+    mean_difference: float
+    """The average game points per deal the first bot won more than the second one"""
+    standard_error: float
+    """The standard error of mean_difference"""
+
+    @staticmethod
+    def of(differences: Iterable[float]) -> PairedComparison:
+        """
+        Summarize paired differences.
+
+        :param differences: (Iterable[float]): The difference of each deal, at least one.
+        :returns: (PairedComparison): The summary.
+        """
+        values = list(differences)
+        assert values, "At least one difference is needed for a comparison"
+        mean = sum(values) / len(values)
+        if len(values) == 1:
+            return PairedComparison(deals=1, mean_difference=mean, standard_error=float("inf"))
+        variance = sum((value - mean) ** 2 for value in values) / (len(values) - 1)
+        return PairedComparison(deals=len(values), mean_difference=mean, standard_error=(variance / len(values)) ** 0.5)
+
+    @property
+    def z_score(self) -> float:
+        """How many standard errors the mean difference is away from 0. Values beyond about 2 (or -2) indicate a significant difference between the bots."""
+        if self.standard_error == 0:
+            # all differences are the same
+            if self.mean_difference == 0:
+                return 0.0
+            return float("inf") if self.mean_difference > 0 else float("-inf")
+        return self.mean_difference / self.standard_error
+
+
+RolloutPolicy = Callable[["GamePlayEngine", GameState, Optional[Move]], Move]
+"""
+A policy used by GamePlayEngine.rollout to choose moves. It gets the engine, the state of the game and the move of the leader (None if the leader is to move),
+and returns the move for the player to move. The policy sees the full state, and the move it returns is not validated, so it must return a legal move.
+"""
+
+
+def random_rollout_policy(rand: Random) -> RolloutPolicy:
+    """
+    Create a policy for GamePlayEngine.rollout which plays a random legal move, like RandBot does.
+
+    :param rand: (Random): The source of randomness for the policy.
+    :returns: (RolloutPolicy): The policy.
+    """
+    def policy(engine: GamePlayEngine, game_state: GameState, leader_move: Optional[Move]) -> Move:
+        if leader_move is None:
+            moves = list(engine.move_validator.get_legal_leader_moves(engine, game_state))
+        else:
+            moves = list(engine.move_validator.get_legal_follower_moves(engine, game_state, leader_move))
+        return rand.choice(moves)
+    return policy
+
+
 @dataclass
 class GamePlayEngine:
     """
@@ -1982,6 +2896,12 @@ class GamePlayEngine:
     move_requester: MoveRequester
     move_validator: MoveValidator
     trick_scorer: TrickScorer
+    record_history: bool = True
+    """
+    Whether the tricks played are recorded in the history (previous field) of the states.
+    Without history, each new state only keeps the summary needed by the perspectives (see GameState.trick_cards_mask), and the earlier states can be freed right away.
+    This is meant for simulations in which the history is never read. The bots then only see the current perspective in get_game_history.
+    """
 
     def play_game(self, bot1: Bot, bot2: Bot, rng: Random) -> tuple[Bot, int, Score]:
         """
@@ -2009,6 +2929,61 @@ class GamePlayEngine:
         winner, points, score = self.play_game_from_state(game_state=game_state, leader_move=None)
         return winner, points, score
 
+    def play_games(self, bot1: BotSpec, bot2: BotSpec, seeds: Iterable[int], processes: Optional[int] = None, alternate_leader: bool = True) -> list[GameResult]:
+        """
+        Play one game for each seed between bots created from the specifications, spreading the games over a pool of processes.
+
+        Each game gets newly created bots, and the random.Random objects passed to bots with a rand_argument are seeded from the seed of the game.
+        Hence, the outcome of each game only depends on its seed, and the results are the same regardless of the number of processes.
+        The engine and the specifications are pickled to be sent to the processes.
+
+        :param bot1: (BotSpec): The specification of the first bot.
+        :param bot2: (BotSpec): The specification of the second bot.
+        :param seeds: (Iterable[int]): For each game the seed of the random.Random used to shuffle the deck.
+        :param processes: (Optional[int]): The number of processes to use. Defaults to the number of CPUs. With 1, all games are played in the current process.
+        :param alternate_leader: (bool): If True, the first bot leads the first trick in the first, third, fifth, ... game, and the second bot in the others. If False, the first bot always leads.
+
+        :returns: (list[GameResult]): The results of the games, in the order of the seeds.
+        """
+        seeds = list(seeds)
+        if processes is None:
+            processes = os.cpu_count() or 1
+        assert processes >= 1, f"At least one process is needed to play games, got {processes}"
+        if processes == 1 or len(seeds) <= 1:
+            return [_play_game_from_specs(self, bot1, bot2, seed, leads) for seed, leads in zip(seeds, _bot1_leads(len(seeds), alternate_leader))]
+        with self.game_pool(bot1, bot2, processes) as pool:
+            return pool.play_games(seeds, alternate_leader)
+
+    def game_pool(self, bot1: BotSpec, bot2: BotSpec, processes: int) -> GamePool:
+        """
+        Start a pool of processes which play games between bots created from the specifications with this engine, like play_games.
+        The pool can be reused for several calls of GamePool.play_games, such that the processes are only started once.
+
+        :param bot1: (BotSpec): The specification of the first bot.
+        :param bot2: (BotSpec): The specification of the second bot.
+        :param processes: (int): The number of processes.
+        :returns: (GamePool): The pool. Shut it down when done, for example by using it in a with statement.
+        """
+        return GamePool(self, bot1, bot2, processes)
+
+    def play_duplicate_games(self, bot1: BotSpec, bot2: BotSpec, seeds: Iterable[int], processes: Optional[int] = None) -> list[DuplicateResult]:
+        """
+        Play each deal twice with the seats swapped: once with the first bot leading the first trick, and once with the second bot leading.
+        Both games of a deal get the same shuffled deck, and bots seeded with the same seed, so that the difference in the outcomes is due to the bots only.
+        Use PairedComparison.of on the differences of the results to compare the bots. This needs far fewer games than comparing wins of games with independent deals.
+
+        :param bot1: (BotSpec): The specification of the first bot.
+        :param bot2: (BotSpec): The specification of the second bot.
+        :param seeds: (Iterable[int]): For each deal the seed of the random.Random used to shuffle the deck.
+        :param processes: (Optional[int]): The number of processes to use, see play_games.
+
+        :returns: (list[DuplicateResult]): The results of the deals, in the order of the seeds.
+        """
+        seeds = list(seeds)
+        # every seed twice in a row, with alternating leaders the first bot leads the first game of each deal
+        results = self.play_games(bot1, bot2, [seed for seed in seeds for _ in range(2)], processes=processes, alternate_leader=True)
+        return [DuplicateResult(seed=seed, bot1_leading=results[2 * index], bot2_leading=results[2 * index + 1]) for index, seed in enumerate(seeds)]
+
     def get_random_phase_two_state(self, rng: Random) -> GameState:
         """
         Get a random GameState in the second phase of the game.
@@ -2089,11 +3064,7 @@ class GamePlayEngine:
                 game_state = self.trick_implementer.play_trick(self, game_state)
             winner, points = self.trick_scorer.declare_winner(game_state) or (None, -1)
 
-        winner_state = WinnerPerspective(game_state, self)
-        winner.implementation.notify_game_end(won=True, perspective=winner_state)
-
-        loser_state = LoserPerspective(game_state, self)
-        game_state.follower.implementation.notify_game_end(False, perspective=loser_state)
+        self.notify_game_end(winner, game_state)
 
         return winner.implementation, points, winner.score
 
@@ -2114,7 +3085,7 @@ class GamePlayEngine:
         assert rounds == 1, f"We called play_at_most_n_tricks with rounds=1, but it returned not excactly 1 round, got {rounds} rounds."
         return state
 
-    def play_at_most_n_tricks(self, game_state: GameState, new_leader: Bot, new_follower: Bot, n: int) -> tuple[GameState, int]:
+    def play_at_most_n_tricks(self, game_state: GameState, new_leader: Bot, new_follower: Bot, n: int, record_history: Optional[bool] = None) -> tuple[GameState, int]:
         """
         Plays up to n tricks (including the one started by the leader, if provided) on a game which might have started before.
         The number of tricks will be smaller than n in case the game ends before n tricks are played.
@@ -2126,10 +3097,16 @@ class GamePlayEngine:
         :param new_leader: The bot which will take the leader role in the game.
         :param new_follower: The bot which will take the follower in the game.
         :param n: the maximum number of tricks to play
+        :param record_history: whether to record the tricks in the history of the states, overriding record_history of this engine for this call.
+            If False, the states reached do not link to the earlier states, and the bots get perspectives from an engine which does not record history either.
 
         :returns: The GameState reached and the number of steps actually taken.
         """
         assert n >= 0, "Cannot play less than 0 rounds"
+        if record_history is not None and record_history != self.record_history:
+            engine = copy.copy(self)
+            engine.record_history = record_history
+            return engine.play_at_most_n_tricks(game_state, new_leader, new_follower, n)
         game_state_copy = game_state.copy_with_other_bots(new_leader=new_leader, new_follower=new_follower)
 
         winner: Optional[BotState] = None
@@ -2141,37 +3118,208 @@ class GamePlayEngine:
             winner, _ = self.trick_scorer.declare_winner(game_state_copy) or (None, -1)
             rounds_played += 1
         if winner:
-            winner_state = WinnerPerspective(game_state_copy, self)
-            winner.implementation.notify_game_end(won=True, perspective=winner_state)
-
-            loser_state = LoserPerspective(game_state_copy, self)
-            game_state_copy.follower.implementation.notify_game_end(False, perspective=loser_state)
+            self.notify_game_end(winner, game_state_copy)
 
         return game_state_copy, rounds_played
 
+    def notify_game_end(self, winner: BotState, game_state: GameState) -> None:
+        """
+        Notifies both bots that the game has ended.
+
+        :param winner: The bot which won the game, this is the leader in the final state.
+        :param game_state: The final state of the game.
+        """
+        winner_state = WinnerPerspective(game_state, self)
+        winner.implementation.notify_game_end(won=True, perspective=winner_state)
+
+        loser_state = LoserPerspective(game_state, self)
+        game_state.follower.implementation.notify_game_end(False, perspective=loser_state)
+
+    def apply_trick(self, game_state: GameState, leader_move: Move, follower_move: Optional[Move] = None) -> TrickUndoRecord:
+        """
+        Applies a trick directly to the provided game_state, and returns a record which can be used to undo it.
+        The moves are not requested from the bots, they are not validated, the bots are not notified, and the trick is not recorded in the history (previous field) of the state.
+        Together with undo_trick, this allows search algorithms to walk the game tree using a single GameState.
+
+        :param game_state: The state of the game to which the trick is applied. This state will be modified.
+        :param leader_move: The move of the leader.
+        :param follower_move: The move of the follower, or None in case the leader_move is a trump exchange.
+
+        :returns: The record with which the trick can be undone using undo_trick.
+        """
+        return self.trick_implementer.apply_trick_in_place(self, game_state, leader_move, follower_move)
+
+    def undo_trick(self, game_state: GameState, undo: TrickUndoRecord) -> None:
+        """
+        Reverts a trick applied with apply_trick. Tricks must be undone in the reverse order in which they were applied.
+
+        :param game_state: The state of the game to which the trick was applied. This state will be modified.
+        :param undo: The record returned by apply_trick.
+        """
+        self.trick_implementer.undo_trick(game_state, undo)
+
+    def rollout(self, game_state: GameState, policy: RolloutPolicy, n: int, leader_move: Optional[Move] = None, follower_move: Optional[Move] = None) -> list[TrickUndoRecord]:
+        """
+        Plays up to n tricks directly on the provided game_state, with moves chosen by the policy. The number of tricks is smaller in case the game ends before n tricks are played.
+        This is a light-weight alternative to play_at_most_n_tricks for simulations: the tricks are applied with apply_trick, so no perspectives are created,
+        the moves are not validated, the bots in the state are neither asked for moves nor notified, and no history is recorded.
+        After the rollout, the state can be inspected (e.g. the scores of the players), and restored with undo_rollout.
+
+        :param game_state: The state of the game to start from. This state will be modified.
+        :param policy: The policy which chooses the moves of both players.
+        :param n: The maximum number of tricks to play. A trump exchange counts as a trick, as in play_at_most_n_tricks.
+        :param leader_move: If given, the move of the leader in the first trick, instead of asking the policy.
+        :param follower_move: If given, the move of the follower in the first trick, instead of asking the policy.
+
+        :returns: The records of the tricks played, in the order in which they were played.
+        """
+        assert n >= 0, "Cannot play less than 0 rounds"
+        undos: list[TrickUndoRecord] = []
+        while len(undos) < n:
+            if leader_move is None:
+                leader_move = policy(self, game_state, None)
+            if leader_move.is_trump_exchange():
+                follower_move = None
+            elif follower_move is None:
+                follower_move = policy(self, game_state, leader_move)
+            undos.append(self.apply_trick(game_state, leader_move, follower_move))
+            if self.trick_scorer.declare_winner(game_state):
+                break
+            leader_move = follower_move = None
+        return undos
+
+    def undo_rollout(self, game_state: GameState, undos: list[TrickUndoRecord]) -> None:
+        """
+        Reverts the tricks played by rollout, restoring the game_state as it was before the rollout.
+
+        :param game_state: The state of the game on which the rollout was played. This state will be modified.
+        :param undos: The records returned by rollout.
+        """
+        for undo in reversed(undos):
+            self.undo_trick(game_state, undo)
+
     def __repr__(self) -> str:
         return f"GamePlayEngine(deck_generator={self.deck_generator}, "\
                f"hand_generator={self.hand_generator}, "\
                f"trick_implementer={self.trick_implementer}, "\
                f"move_requester={self.move_requester}, "\
                f"move_validator={self.move_validator}, "\
-               f"trick_scorer={self.trick_scorer})"
+               f"trick_scorer={self.trick_scorer}, "\
+               f"record_history={self.record_history})"
+
+
+def _play_game_from_specs(engine: GamePlayEngine, bot1: BotSpec, bot2: BotSpec, seed: int, bot1_leads: bool) -> GameResult:
+    """
+    Play a single game of GamePlayEngine.play_games.
+    The seeds for the bots are derived from the seed of the game and the position of the bot, such that the two bots and the deck get independent random numbers.
+    """
+    first, second = bot1.build(seed=f"bot1-{seed}"), bot2.build(seed=f"bot2-{seed}")
+    leader, follower = (first, second) if bot1_leads else (second, first)
+    winner, game_points, score = engine.play_game(leader, follower, Random(seed))
+    return GameResult(seed=seed, bot1_leads=bot1_leads, winner=1 if winner is first else 2, game_points=game_points, score=score)
+
+
+class GamePool:
+    """
+    A pool of processes playing games between bots created from two specifications, with one engine. Create it with GamePlayEngine.game_pool.
+    The engine and the specifications are sent to each process once, when it starts, so the pool can only play games of this pairing.
+
+    :param engine: (GamePlayEngine): The engine to play the games with.
+    :param bot1: (BotSpec): The specification of the first bot.
+    :param bot2: (BotSpec): The specification of the second bot.
+    :param processes: (int): The number of processes.
+    """
+
+    def __init__(self, engine: GamePlayEngine, bot1: BotSpec, bot2: BotSpec, processes: int) -> None:
+        assert processes >= 1, f"At least one process is needed to play games, got {processes}"
+        self.engine = engine
+        self.bot1 = bot1
+        self.bot2 = bot2
+        self.processes = processes
+        self._executor = ProcessPoolExecutor(max_workers=processes, initializer=_init_game_worker, initargs=(engine, bot1, bot2))
+
+    def play_games(self, seeds: Iterable[int], alternate_leader: bool = True) -> list[GameResult]:
+        """
+        Play one game for each seed in the processes of the pool. The results are the same as those of GamePlayEngine.play_games with the engine and specifications of the pool.
+
+        :param seeds: (Iterable[int]): For each game the seed of the random.Random used to shuffle the deck.
+        :param alternate_leader: (bool): If True, the first bot leads the first trick in the first, third, fifth, ... game, and the second bot in the others. If False, the first bot always leads.
+        :returns: (list[GameResult]): The results of the games, in the order of the seeds.
+        """
+        seeds = list(seeds)
+        # send the games in chunks, such that the overhead of communication is small, but the work is still spread evenly
+        chunksize = max(1, len(seeds) // (self.processes * 4))
+        return list(self._executor.map(_play_game_in_worker, seeds, _bot1_leads(len(seeds), alternate_leader), chunksize=chunksize))
+
+    def shutdown(self) -> None:
+        """Stop the processes of the pool."""
+        self._executor.shutdown()
+
+    def __enter__(self) -> GamePool:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.shutdown()
+
+
+def _bot1_leads(number_of_games: int, alternate_leader: bool) -> list[bool]:
+    """For each game, whether the first bot leads the first trick, see GamePlayEngine.play_games"""
+    return [not alternate_leader or index % 2 == 0 for index in range(number_of_games)]
+
+
+# The engine and the bot specifications of the games played by the current worker process of GamePlayEngine.play_games
+_worker_setup: Optional[tuple[GamePlayEngine, BotSpec, BotSpec]] = None
+
+
+def _init_game_worker(engine: GamePlayEngine, bot1: BotSpec, bot2: BotSpec) -> None:
+    """Initializes a worker process of GamePlayEngine.play_games, such that the engine and specifications are only sent once."""
+    global _worker_setup
+    _worker_setup = (engine, bot1, bot2)
+
+
+def _play_game_in_worker(seed: int, bot1_leads: bool) -> GameResult:
+    """Plays one game in a worker process of GamePlayEngine.play_games"""
+    assert _worker_setup is not None, "The worker process was not initialized"
+    engine, bot1, bot2 = _worker_setup
+    return _play_game_from_specs(engine, bot1, bot2, seed, bot1_leads)
 
 
 class SchnapsenGamePlayEngine(GamePlayEngine):
     """
     A GamePlayEngine configured according to the rules of Schnapsen
+
+    :param record_history: (bool): Whether the tricks played are recorded in the history of the states, see GamePlayEngine.record_history. Defaults to True.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, record_history: bool = True) -> None:
         super().__init__(
             deck_generator=SchnapsenDeckGenerator(),
             hand_generator=SchnapsenHandGenerator(),
             trick_implementer=SchnapsenTrickImplementer(),
             move_requester=SimpleMoveRequester(),
             move_validator=SchnapsenMoveValidator(),
-            trick_scorer=SchnapsenTrickScorer()
+            trick_scorer=SchnapsenTrickScorer(),
+            record_history=record_history
         )
 
     def __repr__(self) -> str:
         return super().__repr__()
+
+
+class FastSchnapsenGamePlayEngine(SchnapsenGamePlayEngine):
+    """
+    A SchnapsenGamePlayEngine for simulations in which the bots are trusted to play legal moves, such as the rollouts of search bots.
+    It plays the same games, but skips the work done for each trick to protect the game against bots: the moves are requested from the bots directly,
+    the moves and the objects returned by the bots are not checked, and the bots are not notified of trump exchanges or of the end of the game.
+    Bots which play an illegal move in this engine lead to undefined results, test them with validate set.
+
+    :param validate: (bool): If True, the moves are requested and validated as in SchnapsenGamePlayEngine. Meant for testing, the bots are still not notified. Defaults to False.
+    :param record_history: (bool): Whether the tricks played are recorded in the history of the states, see GamePlayEngine.record_history. Defaults to True.
+    """
+
+    def __init__(self, validate: bool = False, record_history: bool = True) -> None:
+        super().__init__(record_history=record_history)
+        self.trick_implementer = TrustedSchnapsenTrickImplementer(validate)
+
+    def notify_game_end(self, winner: BotState, game_state: GameState) -> None:
+        """The bots are not notified in this engine."""
@@ -0,0 +1,280 @@
+"""
+In this module you find a runner for tournaments between bots, which plays the games in parallel and can resume a run which stopped halfway.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, asdict
+import itertools
+import json
+import os
+import pathlib
+from random import Random
+from typing import Any, Callable, Optional, Union
+
+from .game import BotSpec, GamePlayEngine, PairedComparison, SchnapsenGamePlayEngine
+
+
+@dataclass(frozen=True)
+class ScheduledGame:
+    """
+    A game which is part of the schedule of a tournament.
+    """
+
+    game_id: int
+    """The position of the game in the schedule"""
+    bot1: str
+    """The name of the first bot"""
+    bot2: str
+    """The name of the second bot"""
+    seed: int
+    """The seed of the random.Random used to shuffle the deck"""
+    bot1_leads: bool
+    """Whether the first bot leads the first trick"""
+
+
+@dataclass(frozen=True)
+class GameRecord:
+    """
+    The outcome of a game played in a tournament, as stored in the checkpoint file.
+    """
+
+    game_id: int
+    """The position of the game in the schedule"""
+    bot1: str
+    """The name of the first bot"""
+    bot2: str
+    """The name of the second bot"""
+    seed: int
+    """The seed of the random.Random used to shuffle the deck"""
+    bot1_leads: bool
+    """Whether the first bot led the first trick"""
+    winner: str
+    """The name of the bot which won"""
+    game_points: int
+    """The number of game points the winner got"""
+    winner_points: int
+    """The number of points (direct points) the winner made in the game"""
+
+
+@dataclass(frozen=True)
+class Standing:
+    """
+    The accumulated results of one bot in a tournament.
+    """
+
+    name: str
+    """The name of the bot"""
+    games: int
+    """The number of games played by the bot"""
+    wins: int
+    """The number of games won by the bot"""
+    game_points: int
+    """The number of game points won by the bot"""
+
+
+class Tournament:
+    """
+    A round-robin tournament: every pair of bots plays games_per_pairing games against each other, with each bot leading the first trick in half of the games.
+    Every game has its own deal, derived from the seed of the tournament.
+    In duplicate mode, each deal is instead played twice in a row with the seats swapped, such that the luck of the deal cancels out. See compare for the paired differences this gives.
+
+    The games are played in parallel by a pool of processes. The bots are created from picklable BotSpec objects, anew for each game, such that the outcome of a game only depends on its seed.
+    If a checkpoint file is given, the result of each game is appended to it as a line of JSON as soon as the game finishes.
+    When the tournament is run again with the same checkpoint file, the games already recorded are not played again.
+    The first line of the file describes the tournament, including how each bot is created, and running a different tournament with the same file raises an Exception.
+
+    :param bots: (dict[str, BotSpec]): The bots taking part, by name.
+    :param games_per_pairing: (int): The number of games each pair of bots plays.
+    :param seed: (int): The seed from which the deals of all games are derived. Defaults to 0.
+    :param engine: (Optional[GamePlayEngine]): The engine used to play the games. Defaults to a SchnapsenGamePlayEngine.
+    :param checkpoint: (Optional[Union[str, pathlib.Path]]): The file in which results are stored. Defaults to None, meaning that nothing is stored.
+    :param processes: (Optional[int]): The number of processes to use. Defaults to the number of CPUs. With 1, all games are played in the current process.
+    :param duplicate: (bool): Whether to play each deal twice with the seats swapped. games_per_pairing must be even in this case. Defaults to False.
+    """
+
+    def __init__(self, bots: dict[str, BotSpec], games_per_pairing: int, seed: int = 0, engine: Optional[GamePlayEngine] = None,
+                 checkpoint: Optional[Union[str, pathlib.Path]] = None, processes: Optional[int] = None, duplicate: bool = False) -> None:
+        assert len(bots) >= 2, "A tournament needs at least two bots"
+        assert games_per_pairing >= 1, f"Each pair of bots must play at least one game, got {games_per_pairing}"
+        assert not duplicate or games_per_pairing % 2 == 0, f"In duplicate mode each deal is played twice, so games_per_pairing must be even, got {games_per_pairing}"
+        self.bots = dict(bots)
+        self.games_per_pairing = games_per_pairing
+        self.seed = seed
+        self.duplicate = duplicate
+        self.engine = engine if engine is not None else SchnapsenGamePlayEngine()
+        self.checkpoint = pathlib.Path(checkpoint) if checkpoint is not None else None
+        self.processes = processes if processes is not None else (os.cpu_count() or 1)
+        assert self.processes >= 1, f"At least one process is needed to play games, got {self.processes}"
+
+    def schedule(self) -> list[ScheduledGame]:
+        """
+        Get all games of the tournament.
+
+        :returns: (list[ScheduledGame]): The games, ordered by pairing.
+        """
+        rng = Random(self.seed)
+        games: list[ScheduledGame] = []
+        for bot1, bot2 in itertools.combinations(self.bots, 2):
+            for repetition in range(self.games_per_pairing):
+                if not self.duplicate or repetition % 2 == 0:
+                    seed = rng.getrandbits(32)
+                games.append(ScheduledGame(game_id=len(games), bot1=bot1, bot2=bot2, seed=seed, bot1_leads=repetition % 2 == 0))
+        return games
+
+    def _header(self) -> dict[str, Any]:
+        """The description of the tournament which is written at the start of the checkpoint file."""
+        bots = {name: _describe_spec(spec) for name, spec in self.bots.items()}
+        return {"tournament": {"bots": bots, "games_per_pairing": self.games_per_pairing, "seed": self.seed, "duplicate": self.duplicate}}
+
+    def _load_checkpoint(self) -> list[GameRecord]:
+        """
+        Read the records stored in the checkpoint file, creating the file if it does not exist yet.
+
+        :returns: (list[GameRecord]): The records already in the file.
+        """
+        assert self.checkpoint is not None
+        if not self.checkpoint.exists() or self.checkpoint.stat().st_size == 0:
+            self.checkpoint.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.checkpoint, "w") as file:
+                file.write(json.dumps(self._header()) + "\n")
+            return []
+        with open(self.checkpoint) as file:
+            lines = file.read().split("\n")
+        if json.loads(lines[0]) != self._header():
+            raise Exception(f"The checkpoint {self.checkpoint} belongs to a different tournament: {lines[0]}")
+        records: list[GameRecord] = []
+        for line in lines[1:]:
+            try:
+                records.append(GameRecord(**json.loads(line)))
+            except (ValueError, TypeError):
+                # An empty line at the end, or the last line was only partially written when the run stopped. The game will be played again.
+                continue
+        if lines[-1] != "":
+            # Make sure new records start on a new line
+            with open(self.checkpoint, "a") as file:
+                file.write("\n")
+        return records
+
+    def run(self, progress: Optional[Callable[[int, int], None]] = None) -> list[GameRecord]:
+        """
+        Play all games which have not been played yet.
+
+        :param progress: (Optional[Callable[[int, int], None]]): If given, called after each game with the number of games finished and the total number of games.
+        :returns: (list[GameRecord]): The records of all games of the tournament, ordered as in the schedule.
+        """
+        schedule = self.schedule()
+        records = {record.game_id: record for record in self._load_checkpoint()} if self.checkpoint is not None else {}
+        remaining = [game for game in schedule if game.game_id not in records]
+
+        def finish(record: GameRecord) -> None:
+            records[record.game_id] = record
+            if self.checkpoint is not None:
+                with open(self.checkpoint, "a") as file:
+                    file.write(json.dumps(asdict(record)) + "\n")
+            if progress:
+                progress(len(records), len(schedule))
+
+        if self.processes == 1 or len(remaining) <= 1:
+            for game in remaining:
+                finish(_play_scheduled_game(self.engine, self.bots, game))
+        else:
+            with ProcessPoolExecutor(max_workers=self.processes, initializer=_init_tournament_worker, initargs=(self.engine, self.bots)) as executor:
+                futures = [executor.submit(_play_scheduled_game_in_worker, game) for game in remaining]
+                for future in as_completed(futures):
+                    finish(future.result())
+        return [records[game.game_id] for game in schedule]
+
+    @staticmethod
+    def standings(records: list[GameRecord]) -> list[Standing]:
+        """
+        Summarize the results of a tournament.
+
+        :param records: (list[GameRecord]): The records of the games, as returned by run.
+        :returns: (list[Standing]): The standing of each bot, the bot with the most game points first.
+        """
+        games: dict[str, int] = {}
+        wins: dict[str, int] = {}
+        points: dict[str, int] = {}
+        for record in records:
+            for name in (record.bot1, record.bot2):
+                games[name] = games.get(name, 0) + 1
+                wins.setdefault(name, 0)
+                points.setdefault(name, 0)
+            wins[record.winner] += 1
+            points[record.winner] += record.game_points
+        standings = [Standing(name=name, games=games[name], wins=wins[name], game_points=points[name]) for name in games]
+        return sorted(standings, key=lambda standing: standing.game_points, reverse=True)
+
+    @staticmethod
+    def paired_differences(records: list[GameRecord]) -> dict[tuple[str, str], list[int]]:
+        """
+        Get the paired differences of the deals which were played with both seatings, as in duplicate mode.
+        The difference of a deal is the number of game points the first bot of the pairing won in both games together, minus those won by the second bot.
+
+        :param records: (list[GameRecord]): The records of the games, as returned by run.
+        :returns: (dict[tuple[str, str], list[int]]): For each pairing (bot1, bot2) the differences of its deals, in the order in which the deals were scheduled.
+        """
+        games: dict[tuple[str, str, int], dict[bool, GameRecord]] = {}
+        for record in records:
+            games.setdefault((record.bot1, record.bot2, record.seed), {})[record.bot1_leads] = record
+        differences: dict[tuple[str, str], list[int]] = {}
+        for (bot1, bot2, _), seatings in games.items():
+            if len(seatings) == 2:
+                difference = sum(record.game_points if record.winner == bot1 else -record.game_points for record in seatings.values())
+                differences.setdefault((bot1, bot2), []).append(difference)
+        return differences
+
+    @staticmethod
+    def compare(records: list[GameRecord]) -> dict[tuple[str, str], PairedComparison]:
+        """
+        Summarize the paired differences of each pairing, see paired_differences.
+
+        :param records: (list[GameRecord]): The records of the games, as returned by run.
+        :returns: (dict[tuple[str, str], PairedComparison]): For each pairing (bot1, bot2) the comparison, positive mean differences favour bot1.
+        """
+        return {pairing: PairedComparison.of(differences) for pairing, differences in Tournament.paired_differences(records).items()}
+
+    def __repr__(self) -> str:
+        return f"Tournament(bots={list(self.bots)}, games_per_pairing={self.games_per_pairing}, seed={self.seed}, duplicate={self.duplicate}, engine={self.engine}, checkpoint={self.checkpoint})"
+
+
+def _describe_spec(spec: BotSpec) -> str:
+    """
+    Describe how a bot is created, such that a checkpoint is not resumed after the configuration of a bot changed.
+
+    :param spec: (BotSpec): The specification of the bot.
+    :returns: (str): The qualified name of the factory, and the repr of its arguments.
+    """
+    factory = f"{getattr(spec.factory, '__module__', '?')}.{getattr(spec.factory, '__qualname__', repr(spec.factory))}"
+    kwargs = dict(sorted(spec.kwargs.items()))
+    return f"{factory}(args={spec.args!r}, kwargs={kwargs!r}, rand_argument={spec.rand_argument!r})"
+
+
+def _play_scheduled_game(engine: GamePlayEngine, bots: dict[str, BotSpec], game: ScheduledGame) -> GameRecord:
+    """
+    Play a game of the tournament. The seeds of the random.Random objects for the bots are derived from the seed of the game and the name of the bot.
+    """
+    first, second = bots[game.bot1].build(seed=f"{game.bot1}-{game.seed}"), bots[game.bot2].build(seed=f"{game.bot2}-{game.seed}")
+    leader, follower = (first, second) if game.bot1_leads else (second, first)
+    winner, game_points, score = engine.play_game(leader, follower, Random(game.seed))
+    return GameRecord(game_id=game.game_id, bot1=game.bot1, bot2=game.bot2, seed=game.seed, bot1_leads=game.bot1_leads,
+                      winner=game.bot1 if winner is first else game.bot2, game_points=game_points, winner_points=score.direct_points)
+
+
+# The engine and the bots of the tournament played by the current worker process
+_worker_setup: Optional[tuple[GamePlayEngine, dict[str, BotSpec]]] = None
+
+
+def _init_tournament_worker(engine: GamePlayEngine, bots: dict[str, BotSpec]) -> None:
+    """Initializes a worker process of a tournament, such that the engine and the bot specifications are only sent once."""
+    global _worker_setup
+    _worker_setup = (engine, bots)
+
+
+def _play_scheduled_game_in_worker(game: ScheduledGame) -> GameRecord:
+    """Plays one game in a worker process of a tournament"""
+    assert _worker_setup is not None, "The worker process was not initialized"
+    engine, bots = _worker_setup
+    return _play_scheduled_game(engine, bots, game)
@@ -0,0 +1,68 @@
+import random
+import time
+from typing import Optional
+from unittest import TestCase
+from schnapsen.bots import ISMCTSBot, RandBot
+from schnapsen.game import Bot, Move, PlayerPerspective, SchnapsenGamePlayEngine
+
+
+class _RecordingBot(Bot):
+    """Records how many visits of the root the ISMCTSBot it wraps kept for each move"""
+
+    def __init__(self, bot: ISMCTSBot) -> None:
+        super().__init__()
+        self.bot = bot
+        self.reused_visits: list[int] = []
+
+    def get_move(self, perspective: PlayerPerspective, leader_move: Optional[Move]) -> Move:
+        move = self.bot.get_move(perspective, leader_move)
+        self.reused_visits.append(self.bot.reused_visits)
+        return move
+
+    def notify_game_end(self, won: bool, perspective: PlayerPerspective) -> None:
+        self.bot.notify_game_end(won, perspective)
+
+
+class ISMCTSBotTest(TestCase):
+    def setUp(self) -> None:
+        self.engine = SchnapsenGamePlayEngine()
+
+    def test_beats_random(self) -> None:
+        bot = ISMCTSBot(random.Random(42), iterations=100)
+        wins = 0
+        for seed in range(10):
+            winner, _, _ = self.engine.play_game(bot, RandBot(random.Random(seed)), random.Random(seed))
+            wins += winner is bot
+        self.assertGreaterEqual(wins, 8)
+
+    def test_tree_reuse(self) -> None:
+        recording = _RecordingBot(ISMCTSBot(random.Random(42), iterations=100))
+        for seed in range(5):
+            self.engine.play_game(recording, RandBot(random.Random(seed)), random.Random(seed))
+            # the first move of each game starts with a new tree
+            self.assertEqual(recording.reused_visits[0], 0)
+            self.assertGreater(sum(recording.reused_visits), 0)
+            recording.reused_visits.clear()
+
+    def test_tree_reuse_without_history(self) -> None:
+        # the moves played since the last search are not known, so the tree of another position is never reused
+        engine = SchnapsenGamePlayEngine(record_history=False)
+        recording = _RecordingBot(ISMCTSBot(random.Random(42), iterations=100))
+        for seed in range(3):
+            engine.play_game(recording, RandBot(random.Random(seed)), random.Random(seed))
+            self.assertGreater(len(recording.reused_visits), 1)
+            self.assertEqual(recording.reused_visits, [0] * len(recording.reused_visits))
+            recording.reused_visits.clear()
+
+    def test_same_moves_with_same_seed(self) -> None:
+        results = [self.engine.play_game(ISMCTSBot(random.Random(1), iterations=50), RandBot(random.Random(2)), random.Random(3)) for _ in range(2)]
+        self.assertEqual(results[0][1:], results[1][1:])
+
+    def test_time_budget(self) -> None:
+        bot = ISMCTSBot(random.Random(42), iterations=None, time_budget=0.01)
+        recording = _RecordingBot(bot)
+        start = time.perf_counter()
+        self.engine.play_game(recording, RandBot(random.Random(43)), random.Random(3))
+        # generous margin for slow machines: an iteration takes far less than 0.05 second
+        self.assertLess(time.perf_counter() - start, len(recording.reused_visits) * 0.06 + 0.5)
+        self.assertGreaterEqual(bot.iterations_done, 1)
@@ -2,7 +2,7 @@ from unittest import TestCase
 import random
 from typing import Optional
 import time
-from schnapsen.bots import RandBot, MiniMaxBot, AlphaBetaBot, RdeepBot
+from schnapsen.bots import RandBot, MiniMaxBot, AlphaBetaBot, RdeepBot, TranspositionTable
 from schnapsen.game import (
     Bot,
     Move,
@@ -18,6 +18,7 @@ from schnapsen.game import (
     Score,
 )
 from schnapsen.deck import Card, Suit
+from schnapsen.bots.transposition import Bound
 
 
 class TwoStageBot(Bot):
@@ -299,3 +300,60 @@ class MiniMaxBotAlphaBetaPhaseTwoHard(TestCase):
         # alphabeta should be faster, because it prunes more. Besides that, the result
         # should be the same
         self.assertTrue(self.alphabeta_time < self.minimax_time)
+
+
+class TranspositionTableTest(TestCase):
+    def test_values_do_not_change(self) -> None:
+        engine = SchnapsenGamePlayEngine()
+        # one table shared by all searches, and tables which are too small to remember anything useful
+        shared_table = TranspositionTable(size=1024)
+        alphabeta_shared = AlphaBetaBot(transposition_table=shared_table)
+        minimax_shared = MiniMaxBot(transposition_table=shared_table)
+        for i in range(30):
+            state = engine.get_random_phase_two_state(random.Random(i))
+            expected_value, _ = MiniMaxBot(transposition_table=TranspositionTable(size=1, min_depth=100)).value(state, engine, None, True)
+            for maximizing in (True, False):
+                shared_table.new_search()
+                value, _ = alphabeta_shared.value(state, engine, None, maximizing)
+                self.assertEqual(value, expected_value if maximizing else -expected_value)
+                value, _ = minimax_shared.value(state, engine, None, maximizing)
+                self.assertEqual(value, expected_value if maximizing else -expected_value)
+        self.assertGreater(shared_table.hits, 0)
+        self.assertLessEqual(len(shared_table), shared_table.size)
+
+    def test_replacement(self) -> None:
+        table = TranspositionTable(size=1)
+        move = RegularMove(Card.ACE_CLUBS)
+        table.store(1, 1.0, Bound.EXACT, move, depth=6)
+        # a smaller subtree from the same search does not replace the entry
+        table.store(2, 2.0, Bound.EXACT, move, depth=4)
+        self.assertIsNone(table.probe(2))
+        entry = table.probe(1)
+        assert entry is not None
+        self.assertEqual(entry.value, 1.0)
+        self.assertEqual(entry.move, move)
+        # but it does replace entries from earlier searches
+        table.new_search()
+        table.store(2, 2.0, Bound.LOWER, move, depth=4)
+        self.assertIsNone(table.probe(1))
+        entry = table.probe(2)
+        assert entry is not None
+        self.assertTrue(entry.is_usable(alpha=0.0, beta=2.0))
+        self.assertFalse(entry.is_usable(alpha=0.0, beta=3.0))
+
+
+class AlphaBetaMoveOrderingTest(TestCase):
+    def test_ordering_searches_fewer_nodes(self) -> None:
+        engine = SchnapsenGamePlayEngine()
+        ordered = AlphaBetaBot(move_ordering=True)
+        unordered = AlphaBetaBot(move_ordering=False)
+        for i in range(50):
+            state = engine.get_random_phase_two_state(random.Random(i))
+            # fresh tables, such that the searches do not profit from each other
+            ordered.transposition_table.clear()
+            unordered.transposition_table.clear()
+            ordered_value, _ = ordered.value(state, engine, None, True)
+            unordered_value, _ = unordered.value(state, engine, None, True)
+            self.assertEqual(ordered_value, unordered_value)
+        self.assertLess(ordered.nodes, unordered.nodes)
+        self.assertGreater(ordered.cutoffs, 0)
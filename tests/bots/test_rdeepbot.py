@@ -1,7 +1,37 @@
+from typing import Optional
 from unittest import TestCase
-from schnapsen.bots import RdeepBot
-from schnapsen.game import SchnapsenGamePlayEngine
+from unittest.mock import patch
+from schnapsen.bots import RdeepBot, RandBot, shutdown_rollout_pools
+from schnapsen.bots.rdeep import _rollout_pools
+from schnapsen.game import Bot, DeterminizationSampler, LeaderPerspective, Move, PlayerPerspective, SchnapsenGamePlayEngine
 import random
+import threading
+import time
+
+
+class _CountingBot(Bot):
+    """Counts how often the bot it wraps is asked for a move"""
+
+    def __init__(self, bot: Bot) -> None:
+        super().__init__()
+        self.bot = bot
+        self.moves = 0
+
+    def get_move(self, perspective: PlayerPerspective, leader_move: Optional[Move]) -> Move:
+        self.moves += 1
+        return self.bot.get_move(perspective, leader_move)
+
+
+class _LockingBot(RandBot):
+    """A RandBot holding a lock, such that it cannot be pickled"""
+
+    def __init__(self, rand: random.Random) -> None:
+        super().__init__(rand)
+        self.lock = threading.Lock()
+
+    def get_move(self, perspective: PlayerPerspective, leader_move: Optional[Move]) -> Move:
+        with self.lock:
+            return super().get_move(perspective, leader_move)
 
 
 class RdeepBotTest(TestCase):
@@ -10,6 +40,90 @@ class RdeepBotTest(TestCase):
         self.bot1 = RdeepBot(16, 4, random.Random(42), "bot1")
         self.bot2 = RdeepBot(16, 4, random.Random(43), "bot2")
 
+    @classmethod
+    def tearDownClass(cls) -> None:
+        # the tests with processes share the pool, it is stopped once they are done
+        shutdown_rollout_pools()
+
     def test_run(self) -> None:
         for i in range(10):
             self.engine.play_game(self.bot1, self.bot2, random.Random(i))
+
+    def test_samples_are_shared_by_moves(self) -> None:
+        # the unknown cards are worked out once per decision, and guessed num_samples times, not once for every move and sample
+        bot = _CountingBot(RdeepBot(5, 2, random.Random(42)))
+        with patch.object(PlayerPerspective, "determinization_sampler", autospec=True, side_effect=PlayerPerspective.determinization_sampler) as sampler, \
+                patch.object(DeterminizationSampler, "sample", autospec=True, side_effect=DeterminizationSampler.sample) as sample:
+            self.engine.play_game(bot, RandBot(random.Random(43)), random.Random(3))
+        self.assertEqual(sampler.call_count, bot.moves)
+        self.assertEqual(sample.call_count, 5 * bot.moves)
+
+    def test_time_budget(self) -> None:
+        anytime = _CountingBot(RdeepBot(10**6, 4, random.Random(42), time_budget=0.02))
+        start = time.perf_counter()
+        self.engine.play_game(anytime, RandBot(random.Random(43)), random.Random(3))
+        # generous margin for slow machines: one sample takes far less than 0.1 second
+        self.assertLess(time.perf_counter() - start, anytime.moves * 0.1)
+        rdeep = anytime.bot
+        assert isinstance(rdeep, RdeepBot)
+        self.assertGreaterEqual(rdeep.samples_taken, 1)
+        self.assertLess(rdeep.samples_taken, 10**6)
+
+        # the number of samples still limits the samples taken
+        limited = RdeepBot(3, 4, random.Random(42), time_budget=10)
+        self.engine.play_game(limited, RandBot(random.Random(43)), random.Random(3))
+        self.assertEqual(limited.samples_taken, 3)
+
+    def test_successive_halving(self) -> None:
+        engine = self.engine
+        uniform, halving = RdeepBot(16, 4, random.Random(42)), RdeepBot(16, 4, random.Random(42), successive_halving=True)
+        state = engine.get_random_phase_two_state(random.Random(5))
+        rollouts = {}
+        for bot in (uniform, halving):
+            perspective = LeaderPerspective(state.copy_with_other_bots(bot, RandBot(random.Random(43))), engine)
+            bot.get_move(perspective, None)
+            rollouts[bot] = bot.rollouts
+            # the best moves are evaluated on all samples
+            self.assertEqual(bot.samples_taken, 16)
+        self.assertEqual(rollouts[uniform], 16 * len(perspective.valid_moves()))
+        self.assertLess(rollouts[halving], rollouts[uniform])
+
+    def test_successive_halving_takes_num_samples(self) -> None:
+        # the rounds add up to exactly num_samples, also when there are fewer samples than rounds
+        for seed in range(5):
+            state = self.engine.get_random_phase_two_state(random.Random(seed))
+            for num_samples in range(1, 10):
+                bot = RdeepBot(num_samples, 2, random.Random(42), successive_halving=True)
+                perspective = LeaderPerspective(state.copy_with_other_bots(bot, RandBot(random.Random(43))), self.engine)
+                self.assertGreaterEqual(len(perspective.valid_moves()), 5)
+                bot.get_move(perspective, None)
+                self.assertEqual(bot.samples_taken, num_samples)
+
+    def test_processes(self) -> None:
+        # the rollouts are done by other processes, but the moves are the same
+        for time_budget in (None, 10.0):
+            serial = _CountingBot(RdeepBot(8, 4, random.Random(42), time_budget=time_budget))
+            parallel = _CountingBot(RdeepBot(8, 4, random.Random(42), time_budget=time_budget, processes=2))
+            serial_result = self.engine.play_game(serial, RandBot(random.Random(43)), random.Random(3))
+            parallel_result = self.engine.play_game(parallel, RandBot(random.Random(43)), random.Random(3))
+            self.assertIs(serial_result[0] is serial, parallel_result[0] is parallel)
+            self.assertEqual(serial_result[1:], parallel_result[1:])
+            self.assertEqual(serial.moves, parallel.moves)
+
+    def test_processes_with_opponent_which_cannot_be_pickled(self) -> None:
+        # only the guessed states are sent to the other processes, not the history with the real bots
+        serial = self.engine.play_game(RdeepBot(4, 4, random.Random(42)), _LockingBot(random.Random(43)), random.Random(3))
+        parallel = self.engine.play_game(RdeepBot(4, 4, random.Random(42), processes=2), _LockingBot(random.Random(43)), random.Random(3))
+        self.assertEqual(serial[1:], parallel[1:])
+
+    def test_shutdown_rollout_pools(self) -> None:
+        bot = RdeepBot(4, 4, random.Random(42), processes=2)
+        self.engine.play_game(bot, RandBot(random.Random(43)), random.Random(3))
+        pool = _rollout_pools[2]
+        shutdown_rollout_pools()
+        self.assertEqual(_rollout_pools, {})
+        with self.assertRaises(RuntimeError):
+            pool.submit(int)
+        # a later move starts a new pool
+        self.engine.play_game(bot, RandBot(random.Random(43)), random.Random(4))
+        self.assertIsNot(_rollout_pools[2], pool)
@@ -0,0 +1,72 @@
+from unittest import TestCase
+import pathlib
+import pickle
+import random
+import tempfile
+from schnapsen.bots import MiniMaxBot, Tablebase, TablebaseBot, TranspositionTable, generate_random_tablebase
+from schnapsen.game import LeaderPerspective, RegularMove, SchnapsenGamePlayEngine
+
+
+class TablebaseTest(TestCase):
+    def setUp(self) -> None:
+        self.engine = SchnapsenGamePlayEngine()
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self.directory.name) / "phase_two.tb"
+        self.number_of_positions = generate_random_tablebase(self.path, self.engine, number_of_deals=10, rand=random.Random(42))
+        self.tablebase = Tablebase(self.path)
+
+    def tearDown(self) -> None:
+        self.tablebase.close()
+        self.directory.cleanup()
+
+    def test_lookup_matches_search(self) -> None:
+        self.assertEqual(len(self.tablebase), self.number_of_positions)
+        rng = random.Random(42)
+        for _ in range(10):
+            state = self.engine.get_random_phase_two_state(rng)
+            found = self.tablebase.lookup(state, None)
+            assert found is not None
+            expected_value, expected_move = MiniMaxBot().value(state, self.engine, None, True)
+            self.assertEqual(found, (expected_value, expected_move))
+            # the positions after the leader moved are stored as well
+            for move in self.engine.move_validator.get_legal_leader_moves(self.engine, state):
+                self.assertIsNotNone(self.tablebase.lookup(state, move))
+
+    def test_bot(self) -> None:
+        rng = random.Random(42)
+        state = self.engine.get_random_phase_two_state(rng)
+        bot1, bot2 = TablebaseBot(self.tablebase), TablebaseBot(self.tablebase)
+        self.engine.play_game_from_state_with_new_bots(state, new_leader=bot1, new_follower=bot2, leader_move=None)
+        # all positions reachable from the stored start position are in the tablebase
+        self.assertEqual(bot1.misses + bot2.misses, 0)
+        self.assertGreater(bot1.hits + bot2.hits, 0)
+
+        # other positions are handled by the fallback
+        other_state = self.engine.get_random_phase_two_state(random.Random(1234))
+        bot3, bot4 = TablebaseBot(self.tablebase), TablebaseBot(self.tablebase)
+        self.engine.play_game_from_state_with_new_bots(other_state, new_leader=bot3, new_follower=bot4, leader_move=None)
+        self.assertGreater(bot3.misses + bot4.misses, 0)
+
+    def test_illegal_stored_move(self) -> None:
+        # as after a collision of keys: the stored move is not legal in the position
+        state = self.engine.get_random_phase_two_state(random.Random(42))
+        illegal_move = RegularMove(state.follower.hand.get_cards()[0])
+        path = pathlib.Path(self.directory.name) / "illegal.tb"
+        Tablebase.write(path, {TranspositionTable.node_key(state, None, True): (3, illegal_move.move_id)})
+        with Tablebase(path) as tablebase:
+            bot = TablebaseBot(tablebase)
+            move = bot.get_move(LeaderPerspective(state, self.engine), None)
+        self.assertIn(move, self.engine.move_validator.get_legal_leader_moves(self.engine, state))
+        self.assertEqual((bot.hits, bot.misses), (0, 1))
+
+    def test_pickle(self) -> None:
+        copy = pickle.loads(pickle.dumps(self.tablebase))
+        state = self.engine.get_random_phase_two_state(random.Random(42))
+        self.assertEqual(copy.lookup(state, None), self.tablebase.lookup(state, None))
+        copy.close()
+
+    def test_not_a_tablebase(self) -> None:
+        other = pathlib.Path(self.directory.name) / "other"
+        other.write_bytes(b"x" * 100)
+        with self.assertRaises(Exception):
+            Tablebase(other)
@@ -4,6 +4,7 @@ from schnapsen.deck import (
     Suit,
     Rank,
     Card,
+    CardSet,
     OrderedCardCollection,
 )
 
@@ -129,3 +130,44 @@ class CollectionTest(TestCase):
                 for card in removed:
                     self.assertNotEqual(card.rank, rank)
                     self.assertIn(card, collection)
+
+
+class CardSetTest(TestCase):
+
+    def test_card_bits_are_unique(self) -> None:
+        self.assertEqual(len({card.bit for card in Card}), len(Card))
+        for index, card in enumerate(Card):
+            self.assertEqual(card.index, index)
+            self.assertEqual(card.bit, 1 << index)
+
+    def test_membership_and_length(self) -> None:
+        for card_list in CollectionTest.card_lists:
+            card_set = CardSet(card_list)
+            self.assertEqual(len(card_set), len(set(card_list)))
+            for card in Card:
+                self.assertEqual(card in card_set, card in card_list)
+
+    def test_add_remove(self) -> None:
+        card_set = CardSet()
+        self.assertTrue(card_set.is_empty())
+        card_set.add(Card.ACE_CLUBS)
+        card_set.add(Card.ACE_CLUBS)
+        self.assertEqual(card_set.get_cards(), [Card.ACE_CLUBS])
+        card_set.remove(Card.ACE_CLUBS)
+        self.assertTrue(card_set.is_empty())
+        with self.assertRaises(Exception):
+            card_set.remove(Card.ACE_CLUBS)
+
+    def test_copy(self) -> None:
+        card_set = CardSet([Card.ACE_CLUBS, Card.QUEEN_HEARTS])
+        copy = card_set.copy()
+        copy.remove(Card.ACE_CLUBS)
+        self.assertIn(Card.ACE_CLUBS, card_set)
+        self.assertNotEqual(card_set, copy)
+
+    def test_filter(self) -> None:
+        card_set = CardSet(Card)
+        for suit in Suit:
+            self.assertEqual(card_set.filter_suit(suit), [card for card in Card if card.suit is suit])
+        for rank in Rank:
+            self.assertEqual(card_set.filter_rank(rank), [card for card in Card if card.rank is rank])
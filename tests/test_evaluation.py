@@ -0,0 +1,37 @@
+from unittest import TestCase
+from unittest.mock import patch
+from schnapsen.bots import RandBot
+from schnapsen.evaluation import sequential_test
+from schnapsen.game import BotSpec, SchnapsenGamePlayEngine
+
+
+class SequentialTestTest(TestCase):
+    def setUp(self) -> None:
+        self.engine = SchnapsenGamePlayEngine()
+        self.bot1 = BotSpec(RandBot, rand_argument="rand")
+        self.bot2 = BotSpec(RandBot, rand_argument="rand")
+
+    def test_decisions(self) -> None:
+        # two random bots win about half of the games each
+        above = sequential_test(self.engine, self.bot1, self.bot2, p0=0.3, p1=0.4, processes=1)
+        self.assertIs(above.accepted, True)
+        below = sequential_test(self.engine, self.bot1, self.bot2, p0=0.6, p1=0.7, processes=1)
+        self.assertIs(below.accepted, False)
+        for result in (above, below):
+            self.assertLess(result.games, 200)
+            self.assertGreaterEqual(result.confidence, 0.95)
+            self.assertTrue(result.log_likelihood_ratio <= result.lower_bound or result.log_likelihood_ratio >= result.upper_bound)
+
+    def test_undecided(self) -> None:
+        result = sequential_test(self.engine, self.bot1, self.bot2, p0=0.45, p1=0.55, max_games=10, processes=1)
+        self.assertIsNone(result.accepted)
+        self.assertEqual(result.games, 10)
+        self.assertEqual(result.wins, sum(game.winner == 1 for game in self.engine.play_games(self.bot1, self.bot2, range(1, 11), processes=1)))
+
+    def test_does_not_depend_on_batches(self) -> None:
+        expected = sequential_test(self.engine, self.bot1, self.bot2, p0=0.3, p1=0.4, batch_size=2, processes=1)
+        self.assertEqual(sequential_test(self.engine, self.bot1, self.bot2, p0=0.3, p1=0.4, batch_size=25, processes=1), expected)
+        # with small batches, the processes are still only started once
+        with patch.object(SchnapsenGamePlayEngine, "game_pool", autospec=True, side_effect=SchnapsenGamePlayEngine.game_pool) as game_pool:
+            self.assertEqual(sequential_test(self.engine, self.bot1, self.bot2, p0=0.3, p1=0.4, batch_size=4, processes=2), expected)
+        self.assertEqual(game_pool.call_count, 1)
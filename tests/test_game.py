@@ -1,7 +1,18 @@
+import copy
+import os
 import random
-from unittest import TestCase
+import timeit
+from typing import Any, Optional
+from unittest import TestCase, skipUnless
 from schnapsen.deck import Card, Rank, Suit
 from schnapsen.game import (
+    Bot,
+    BotSpec,
+    GamePlayEngine,
+    random_rollout_policy,
+    PairedComparison,
+    Move,
+    PlayerPerspective,
     TrumpExchange,
     Marriage,
     Hand,
@@ -12,7 +23,14 @@ from schnapsen.game import (
     SchnapsenGamePlayEngine,
     LeaderPerspective,
     RegularMove,
+    RegularTrick,
+    Trick,
     FollowerPerspective,
+    ExchangeTrick,
+    FastSchnapsenGamePlayEngine,
+    GameHistory,
+    GamePhase,
+    NUMBER_OF_MOVES,
 )
 from schnapsen.bots.rand import RandBot
 
@@ -57,6 +75,29 @@ class MoveTest(TestCase):
             self.assertEqual(marriage.underlying_regular_move().cards[0], king)
             self.assertEqual(marriage.cards, [queen, king])
 
+    def test_shared_moves(self) -> None:
+        moves = [Move.from_id(move_id) for move_id in range(NUMBER_OF_MOVES)]
+        self.assertEqual(len(set(moves)), NUMBER_OF_MOVES)
+        for move_id, move in enumerate(moves):
+            self.assertEqual(move.move_id, move_id)
+            self.assertEqual(list(move.card_tuple), move.cards)
+        for card in Card:
+            self.assertIs(RegularMove.get_move(card), RegularMove.get_move(card))
+            self.assertEqual(RegularMove.get_move(card), RegularMove(card))
+            self.assertEqual(hash(RegularMove.get_move(card)), hash(RegularMove(card)))
+        for suit in Suit:
+            queen = Card.get_card(Rank.QUEEN, suit)
+            king = Card.get_card(Rank.KING, suit)
+            jack = Card.get_card(Rank.JACK, suit)
+            self.assertEqual(Marriage.get_move(suit), Marriage(queen_card=queen, king_card=king))
+            self.assertEqual(TrumpExchange.get_move(suit), TrumpExchange(jack=jack))
+            self.assertIs(Marriage.get_move(suit).underlying_regular_move(), RegularMove.get_move(king))
+            # moves of a different type are never equal, even if they involve the same cards
+            self.assertNotEqual(TrumpExchange.get_move(suit), RegularMove.get_move(jack))
+            for other_suit in Suit:
+                if other_suit is not suit:
+                    self.assertNotEqual(Marriage.get_move(suit), Marriage.get_move(other_suit))
+
 
 class HandTest(TestCase):
 
@@ -146,6 +187,43 @@ class HandTest(TestCase):
         copy.remove(Card.FIVE_CLUBS)
         self.assertEqual(hand.get_cards(), self.ten_cards)
 
+    def test_contains_after_changes(self) -> None:
+        hand = Hand(self.ten_cards[:4], max_size=6)
+        hand.add(Card.QUEEN_HEARTS)
+        hand.add(Card.QUEEN_HEARTS)
+        hand.remove(Card.QUEEN_HEARTS)
+        self.assertIn(Card.QUEEN_HEARTS, hand)
+        hand.remove(Card.QUEEN_HEARTS)
+        self.assertNotIn(Card.QUEEN_HEARTS, hand)
+        hand.cards = [Card.KING_CLUBS]
+        self.assertIn(Card.KING_CLUBS, hand)
+        self.assertNotIn(Card.FIVE_CLUBS, hand)
+
+    def test_contains_after_changes_of_the_list(self) -> None:
+        hand = Hand([Card.ACE_HEARTS], max_size=5)
+        hand.cards.append(Card.TEN_HEARTS)
+        self.assertIn(Card.TEN_HEARTS, hand)
+        hand.cards.extend([Card.KING_CLUBS, Card.KING_CLUBS])
+        hand.cards.remove(Card.KING_CLUBS)
+        self.assertIn(Card.KING_CLUBS, hand)
+        hand.cards[0] = Card.QUEEN_SPADES
+        self.assertNotIn(Card.ACE_HEARTS, hand)
+        self.assertIn(Card.QUEEN_SPADES, hand)
+        del hand.cards[1:]
+        self.assertEqual(hand.cards, [Card.QUEEN_SPADES])
+        self.assertFalse(hand.has_cards([Card.TEN_HEARTS]))
+        hand.cards.clear()
+        self.assertTrue(hand.is_empty())
+        # a copy of the list is not tied to the hand, and neither is the list of a copied hand
+        hand.add(Card.JACK_DIAMONDS)
+        cards = copy.copy(hand.cards)
+        cards.clear()
+        self.assertIn(Card.JACK_DIAMONDS, hand)
+        copied = copy.deepcopy(hand)
+        copied.cards.pop()
+        self.assertTrue(copied.is_empty())
+        self.assertIn(Card.JACK_DIAMONDS, hand)
+
     def test_filter_suit(self) -> None:
         hand = Hand(self.ten_cards, max_size=10)
         self.assertEqual(
@@ -262,6 +340,9 @@ class GameTest(TestCase):
         self.assertEqual(bar.hand.cards, hand.cards)
         self.assertEqual(bar.score, score)
         self.assertEqual(bar.won_cards, won_cards)
+        # the copy has its own list of won cards
+        bar.won_cards.append(Card.TEN_DIAMONDS)
+        self.assertEqual(foo.won_cards, [Card.ACE_DIAMONDS])
 
     def test_GameState(self) -> None:
         bot0 = RandBot(random.Random(42))
@@ -339,6 +420,10 @@ class GameTest(TestCase):
         )
         sgpe = SchnapsenGamePlayEngine()
         lgs = LeaderPerspective(state=gs, engine=sgpe)
+        # the won cards are ordered by their position in the deck, not by when they were won
+        leader.won_cards = [Card.TEN_SPADES, Card.ACE_CLUBS, Card.KING_HEARTS]
+        self.assertEqual(lgs.get_won_cards().get_cards(), [Card.KING_HEARTS, Card.ACE_CLUBS, Card.TEN_SPADES])
+        self.assertEqual(lgs.get_opponent_won_cards().get_cards(), [Card.NINE_DIAMONDS])
         self.assertEqual(
             lgs.valid_moves(),
             [
@@ -431,3 +516,444 @@ class GameTest(TestCase):
         # make sure marriage poits are applied
         #        assert
         pass
+
+
+class ApplyUndoTrickTest(TestCase):
+
+    def test_apply_matches_play_and_undo_restores(self) -> None:
+        engine = SchnapsenGamePlayEngine()
+        for seed in range(20):
+            rng = random.Random(seed)
+            state = engine.get_random_phase_two_state(rng) if seed % 2 else self._initial_state(engine, rng)
+            while not engine.trick_scorer.declare_winner(state):
+                before = repr(state)
+                leader_move = rng.choice(list(engine.move_validator.get_legal_leader_moves(engine, state)))
+                follower_move = None
+                if not leader_move.is_trump_exchange():
+                    follower_move = rng.choice(list(engine.move_validator.get_legal_follower_moves(engine, state, leader_move)))
+                played = engine.trick_implementer.play_trick_with_fixed_leader_move(
+                    engine, state.copy_with_other_bots(_FixedMovesBot(leader_move), _FixedMovesBot(follower_move)), leader_move)
+
+                undo = engine.apply_trick(state, leader_move, follower_move)
+                for bot_state, played_bot_state in ((state.leader, played.leader), (state.follower, played.follower)):
+                    self.assertEqual(bot_state.hand.cards, played_bot_state.hand.cards)
+                    self.assertEqual(bot_state.score, played_bot_state.score)
+                    self.assertEqual(bot_state.won_cards, played_bot_state.won_cards)
+                self.assertEqual(state.talon.get_cards(), played.talon.get_cards())
+                self.assertEqual(state.trick_cards_mask, played.trick_cards_mask)
+                self.assertEqual(state.tricks_played, played.tricks_played)
+
+                engine.undo_trick(state, undo)
+                self.assertEqual(repr(state), before)
+                self.assertEqual(state.trick_cards_mask, undo.trick_cards_mask)
+                self.assertEqual(state.tricks_played, undo.tricks_played)
+                # continue the game from the played state
+                state = played
+
+    @staticmethod
+    def _initial_state(engine: SchnapsenGamePlayEngine, rng: random.Random) -> GameState:
+        deck = engine.deck_generator.shuffle_deck(engine.deck_generator.get_initial_deck(), rng)
+        hand1, hand2, talon = engine.hand_generator.generateHands(deck)
+        return GameState(leader=BotState(RandBot(rng), hand1), follower=BotState(RandBot(rng), hand2), talon=talon, previous=None)
+
+
+class RolloutTest(TestCase):
+
+    def test_rollout_matches_play_at_most_n_tricks(self) -> None:
+        engine = SchnapsenGamePlayEngine()
+        for seed in range(20):
+            rng = random.Random(seed)
+            state = engine.get_random_phase_two_state(rng) if seed % 2 else ApplyUndoTrickTest._initial_state(engine, rng)
+            before = repr(state)
+            depth = 1 + seed % 8
+            # the random policy makes the same choices as RandBot, when both use the same random numbers
+            rand = random.Random(seed)
+            played, tricks = engine.play_at_most_n_tricks(state, RandBot(rand), RandBot(rand), depth)
+            undos = engine.rollout(state, random_rollout_policy(random.Random(seed)), depth)
+            self.assertEqual(len(undos), tricks)
+            self.assertEqual((state.leader.score, state.follower.score), (played.leader.score, played.follower.score))
+            self.assertEqual((state.leader.hand.cards, state.follower.hand.cards), (played.leader.hand.cards, played.follower.hand.cards))
+
+            engine.undo_rollout(state, undos)
+            self.assertEqual(repr(state), before)
+
+    def test_fixed_first_moves(self) -> None:
+        engine = SchnapsenGamePlayEngine()
+        state = engine.get_random_phase_two_state(random.Random(3))
+        leader, follower = state.leader, state.follower
+        leader_move = list(engine.move_validator.get_legal_leader_moves(engine, state))[-1]
+        follower_move = list(engine.move_validator.get_legal_follower_moves(engine, state, leader_move))[-1]
+
+        def no_policy(engine: GamePlayEngine, game_state: GameState, leader_move: Optional[Move]) -> Move:
+            raise AssertionError("The policy must not be asked for the fixed moves")
+
+        undos = engine.rollout(state, no_policy, 1, leader_move=leader_move, follower_move=follower_move)
+        self.assertEqual(len(undos), 1)
+        self.assertNotIn(leader_move.cards[0], leader.hand)
+        self.assertNotIn(follower_move.cards[0], follower.hand)
+        engine.undo_rollout(state, undos)
+        self.assertIn(leader_move.cards[0], leader.hand)
+
+
+class HistoryFreeTest(TestCase):
+
+    def test_same_play_without_history(self) -> None:
+        engine, history_free_engine = SchnapsenGamePlayEngine(), SchnapsenGamePlayEngine(record_history=False)
+        for seed in range(10):
+            state = ApplyUndoTrickTest._initial_state(engine, random.Random(seed))
+            played, tricks = engine.play_at_most_n_tricks(state, RandBot(random.Random(seed)), RandBot(random.Random(seed)), 8)
+            for history_free, history_free_tricks in (engine.play_at_most_n_tricks(state, RandBot(random.Random(seed)), RandBot(random.Random(seed)), 8, record_history=False),
+                                                      history_free_engine.play_at_most_n_tricks(state, RandBot(random.Random(seed)), RandBot(random.Random(seed)), 8)):
+                self.assertEqual(history_free_tricks, tricks)
+                self.assertIsNone(history_free.previous)
+                self.assertEqual(history_free.canonical_key(), played.canonical_key())
+                # the perspectives still know which cards were played
+                self.assertEqual(history_free.trick_cards_mask, played.trick_cards_mask)
+                self.assertEqual(history_free.tricks_played, played.tricks_played)
+            self.assertIsNotNone(played.previous)
+        # the override only holds for the call
+        self.assertTrue(engine.record_history)
+        results = []
+        for game_engine in (engine, history_free_engine):
+            bot1 = RandBot(random.Random(1))
+            winner, points, score = game_engine.play_game(bot1, RandBot(random.Random(2)), random.Random(3))
+            results.append((winner is bot1, points, score))
+        self.assertEqual(results[0], results[1])
+
+
+class _NotificationCountingBot(RandBot):
+    """Plays randomly, and counts the notifications it gets"""
+
+    def __init__(self, rand: random.Random) -> None:
+        super().__init__(rand)
+        self.notifications = 0
+
+    def notify_trump_exchange(self, move: TrumpExchange) -> None:
+        self.notifications += 1
+
+    def notify_game_end(self, won: bool, perspective: PlayerPerspective) -> None:
+        self.notifications += 1
+
+
+class FastEngineTest(TestCase):
+
+    def test_same_games(self) -> None:
+        for seed in range(20):
+            results = []
+            for engine in (SchnapsenGamePlayEngine(), FastSchnapsenGamePlayEngine(), FastSchnapsenGamePlayEngine(validate=True)):
+                bot1, bot2 = _NotificationCountingBot(random.Random(seed)), _NotificationCountingBot(random.Random(seed + 1))
+                winner, points, score = engine.play_game(bot1, bot2, random.Random(seed))
+                results.append((winner is bot1, points, score))
+                if isinstance(engine, FastSchnapsenGamePlayEngine):
+                    self.assertEqual(bot1.notifications + bot2.notifications, 0)
+                else:
+                    self.assertGreaterEqual(bot1.notifications + bot2.notifications, 2)
+            self.assertEqual(results[1], results[0])
+            self.assertEqual(results[2], results[0])
+
+    def test_validate(self) -> None:
+        state = ApplyUndoTrickTest._initial_state(SchnapsenGamePlayEngine(), random.Random(1))
+        # a card which is not in the hand of the leader
+        illegal_move = RegularMove(state.follower.hand.get_cards()[0])
+        # with validate, illegal moves are rejected as by the full engine
+        for engine in (SchnapsenGamePlayEngine(), FastSchnapsenGamePlayEngine(validate=True)):
+            with self.assertRaises(Exception):
+                engine.play_one_trick(state, _FixedMovesBot(illegal_move), RandBot(random.Random(2)))
+
+
+class _SamplerCheckingBot(Bot):
+    """Plays randomly, and checks the guesses of a DeterminizationSampler at each move"""
+
+    def __init__(self, test: TestCase, rand: random.Random) -> None:
+        super().__init__()
+        self.test = test
+        self.rand = rand
+        self.checked = 0
+
+    def get_move(self, perspective: PlayerPerspective, leader_move: Optional[Move]) -> Move:
+        sampler = perspective.determinization_sampler(leader_move)
+        seed = self.rand.random()
+        guesses = sampler.sample_many(random.Random(seed), 3)
+        # the same guesses as make_assumption, and as the compact permutations
+        rand = random.Random(seed)
+        self.test.assertEqual([self._layout(guess) for guess in guesses], [self._layout(perspective.make_assumption(leader_move, rand)) for _ in range(3)])
+        permutations = sampler.sample_permutations(random.Random(seed), 3)
+        self.test.assertEqual([self._layout(guess) for guess in guesses], [self._layout(sampler.state_from_permutation(permutation)) for permutation in permutations])
+
+        for guess in guesses:
+            me, opponent = (guess.leader, guess.follower) if perspective.am_i_leader() else (guess.follower, guess.leader)
+            self.test.assertEqual(me.hand.get_cards(), perspective.get_hand().get_cards())
+            self.test.assertEqual((me.score, opponent.score), (perspective.get_my_score(), perspective.get_opponent_score()))
+            self.test.assertEqual(guess.talon.trump_card(), perspective.get_trump_card())
+            self.test.assertEqual(len(guess.talon), perspective.get_talon_size())
+            self.test.assertEqual(len(opponent.hand), len(perspective.get_hand()))
+            for card in perspective.get_known_cards_of_opponent_hand():
+                self.test.assertIn(card, opponent.hand)
+            if leader_move:
+                for card in leader_move.cards:
+                    self.test.assertIn(card, opponent.hand)
+            # the unseen cards are spread over the hand of the opponent and the talon, which also contain the cards known to be there
+            known = set(perspective.get_known_cards_of_opponent_hand().get_cards()) | set(leader_move.cards if leader_move else [])
+            trump_card = perspective.get_trump_card()
+            if trump_card:
+                known.add(trump_card)
+            self.test.assertEqual(set(opponent.hand.get_cards()) | set(guess.talon.get_cards()), set(sampler.unseen_cards) | known)
+        self.checked += 1
+        return self.rand.choice(perspective.valid_moves())
+
+    @staticmethod
+    def _layout(state: GameState) -> tuple[object, ...]:
+        """Where the cards are in the state, and the scores. The bots in guessed states are different objects each time."""
+        return (state.leader.hand.get_cards(), state.follower.hand.get_cards(), state.talon.get_cards(), state.leader.score, state.follower.score, state.previous)
+
+
+class _SeenCardsCheckingBot(Bot):
+    """Plays randomly, and checks the seen cards and the known cards of the opponent against the cards in the game history"""
+
+    def __init__(self, test: TestCase, rand: random.Random) -> None:
+        super().__init__()
+        self.test = test
+        self.rand = rand
+        self.checked = 0
+
+    def get_move(self, perspective: PlayerPerspective, leader_move: Optional[Move]) -> Move:
+        trick_cards = {card for _, trick in perspective.get_game_history() if trick is not None for card in trick.cards}
+        seen = trick_cards | set(perspective.get_hand().get_cards()) | set(leader_move.cards if leader_move else [])
+        trump_card = perspective.get_trump_card()
+        if trump_card:
+            seen.add(trump_card)
+        self.test.assertEqual(set(perspective.seen_cards(leader_move).get_cards()), seen)
+        if perspective.get_phase() == GamePhase.ONE:
+            # a guess puts the cards which are not seen in the hand of the opponent, so the cards from tricks in it are exactly the known ones
+            guess = perspective.make_assumption(leader_move, self.rand)
+            opponent = guess.follower if perspective.am_i_leader() else guess.leader
+            known = perspective.get_known_cards_of_opponent_hand().get_cards()
+            self.test.assertEqual(set(known), set(opponent.hand.get_cards()) & trick_cards)
+        self.checked += 1
+        return self.rand.choice(perspective.valid_moves())
+
+
+class SeenCardsTest(TestCase):
+    def test_seen_cards_match_history(self) -> None:
+        engine = SchnapsenGamePlayEngine()
+        bot1, bot2 = _SeenCardsCheckingBot(self, random.Random(1)), _SeenCardsCheckingBot(self, random.Random(2))
+        for seed in range(10):
+            engine.play_game(bot1, bot2, random.Random(seed))
+        self.assertGreater(bot1.checked + bot2.checked, 100)
+
+
+class _HistoryCheckingBot(Bot):
+    """Plays randomly, and checks the game history against the one seen at the previous move"""
+
+    def __init__(self, test: TestCase, rand: random.Random) -> None:
+        super().__init__()
+        self.test = test
+        self.rand = rand
+        self.last_history: Optional[GameHistory] = None
+
+    def get_move(self, perspective: PlayerPerspective, leader_move: Optional[Move]) -> Move:
+        history = perspective.get_game_history()
+        self.test.assertIs(history[-1][0], perspective)
+        self.test.assertIsNone(history[-1][1])
+        self.test.assertEqual(len(history.tricks()), len(history) - 1)
+        self.test.assertEqual(perspective.get_tricks_played(), len(history.tricks()))
+        self.test.assertEqual([trick for _, trick in history], [*history.tricks(), None])
+        self.test.assertEqual(list(reversed(history)), list(history)[::-1])
+        self.test.assertEqual(history[1:-1], list(history)[1:-1])
+        with self.test.assertRaises(IndexError):
+            history[len(history)]
+        for past_perspective, trick in history[:-1]:
+            # the player made its move of the trick from the past perspective, except for the follower of a trump exchange
+            if isinstance(trick, ExchangeTrick):
+                if past_perspective.am_i_leader():
+                    self.test.assertIn(trick.exchange, past_perspective.valid_moves())
+            else:
+                assert isinstance(trick, RegularTrick)
+                own_move = trick.leader_move if past_perspective.am_i_leader() else trick.follower_move
+                self.test.assertIn(own_move, past_perspective.valid_moves())
+        if self.last_history is not None and len(self.last_history) < len(history):
+            # the past perspectives are made once, and shared by later histories
+            for index in range(len(self.last_history) - 1):
+                self.test.assertIs(self.last_history[index][0], history[index][0])
+        self.last_history = history
+        return self.rand.choice(perspective.valid_moves())
+
+    def notify_game_end(self, won: bool, perspective: PlayerPerspective) -> None:
+        self.last_history = None
+
+
+class GameHistoryTest(TestCase):
+    def test_history(self) -> None:
+        engine = SchnapsenGamePlayEngine()
+        bot1, bot2 = _HistoryCheckingBot(self, random.Random(1)), _HistoryCheckingBot(self, random.Random(2))
+        for seed in range(10):
+            engine.play_game(bot1, bot2, random.Random(seed))
+
+
+class DeterminizationSamplerTest(TestCase):
+    def test_guesses(self) -> None:
+        engine = SchnapsenGamePlayEngine()
+        bot1, bot2 = _SamplerCheckingBot(self, random.Random(1)), _SamplerCheckingBot(self, random.Random(2))
+        for seed in range(10):
+            engine.play_game(bot1, bot2, random.Random(seed))
+        self.assertGreater(bot1.checked + bot2.checked, 100)
+
+
+class PlayGamesTest(TestCase):
+    def test_results_do_not_depend_on_processes(self) -> None:
+        engine = SchnapsenGamePlayEngine()
+        bot1 = BotSpec(RandBot, rand_argument="rand", kwargs={"name": "first"})
+        bot2 = BotSpec(RandBot, rand_argument="rand")
+        serial = engine.play_games(bot1, bot2, seeds=range(20), processes=1)
+        parallel = engine.play_games(bot1, bot2, seeds=range(20), processes=2)
+        self.assertEqual(serial, parallel)
+        self.assertEqual([result.seed for result in serial], list(range(20)))
+        self.assertEqual([result.bot1_leads for result in serial], [index % 2 == 0 for index in range(20)])
+
+        # each game is the same as when played directly
+        for result in serial:
+            first, second = RandBot(random.Random(f"bot1-{result.seed}")), RandBot(random.Random(f"bot2-{result.seed}"))
+            leader, follower = (first, second) if result.bot1_leads else (second, first)
+            winner, game_points, score = engine.play_game(leader, follower, random.Random(result.seed))
+            self.assertEqual(result.winner, 1 if winner is first else 2)
+            self.assertEqual((result.game_points, result.score), (game_points, score))
+
+    def test_game_pool(self) -> None:
+        engine = SchnapsenGamePlayEngine()
+        bot1 = BotSpec(RandBot, rand_argument="rand", kwargs={"name": "first"})
+        bot2 = BotSpec(RandBot, rand_argument="rand")
+        with engine.game_pool(bot1, bot2, processes=2) as pool:
+            # the pool plays the pairing it was started with, for all calls
+            self.assertEqual((pool.engine, pool.bot1, pool.bot2), (engine, bot1, bot2))
+            self.assertEqual(pool.play_games(range(10)), engine.play_games(bot1, bot2, seeds=range(10), processes=1))
+            self.assertEqual(pool.play_games(range(10, 14), alternate_leader=False), engine.play_games(bot1, bot2, seeds=range(10, 14), processes=1, alternate_leader=False))
+
+    def test_duplicate_games(self) -> None:
+        engine = SchnapsenGamePlayEngine()
+        bot1 = BotSpec(RandBot, rand_argument="rand")
+        bot2 = BotSpec(RandBot, rand_argument="rand")
+        results = engine.play_duplicate_games(bot1, bot2, seeds=[3, 7, 11], processes=1)
+        self.assertEqual([result.seed for result in results], [3, 7, 11])
+        games = engine.play_games(bot1, bot2, seeds=[3, 3, 7, 7, 11, 11], processes=1)
+        for index, result in enumerate(results):
+            self.assertEqual((result.bot1_leading, result.bot2_leading), (games[2 * index], games[2 * index + 1]))
+            self.assertTrue(result.bot1_leading.bot1_leads)
+            self.assertFalse(result.bot2_leading.bot1_leads)
+            self.assertEqual(result.difference, games[2 * index].bot1_game_points + games[2 * index + 1].bot1_game_points)
+
+    def test_paired_comparison(self) -> None:
+        comparison = PairedComparison.of([2, 4, 0, 2])
+        self.assertEqual((comparison.deals, comparison.mean_difference), (4, 2.0))
+        self.assertAlmostEqual(comparison.standard_error, (8 / 3 / 4) ** 0.5)
+        self.assertAlmostEqual(comparison.z_score, 2.0 / comparison.standard_error)
+        self.assertEqual(PairedComparison.of([1, 1]).z_score, float("inf"))
+        self.assertEqual(PairedComparison.of([0, 0]).z_score, 0.0)
+
+
+class ZobristKeyTest(TestCase):
+
+    @staticmethod
+    def _rebuild(state: GameState) -> GameState:
+        """Build a state equal to the given one from scratch, such that its key is not computed incrementally."""
+        return GameState(
+            leader=BotState(state.leader.implementation, Hand(state.leader.hand.get_cards()), score=state.leader.score),
+            follower=BotState(state.follower.implementation, Hand(state.follower.hand.get_cards()), score=state.follower.score),
+            talon=Talon(state.talon.get_cards(), state.trump_suit),
+            previous=None)
+
+    def test_incremental_key_matches_scratch(self) -> None:
+        engine = SchnapsenGamePlayEngine()
+        keys: dict[int, tuple[object, ...]] = {}
+        for seed in range(20):
+            rng = random.Random(seed)
+            state = ApplyUndoTrickTest._initial_state(engine, rng)
+            while not engine.trick_scorer.declare_winner(state):
+                key = state.zobrist_key()
+                self.assertEqual(key, self._rebuild(state).zobrist_key())
+                # different states do not collide
+                self.assertEqual(keys.setdefault(key, state.canonical_key()), state.canonical_key())
+
+                leader_move = rng.choice(list(engine.move_validator.get_legal_leader_moves(engine, state)))
+                follower_move = None
+                if not leader_move.is_trump_exchange():
+                    follower_move = rng.choice(list(engine.move_validator.get_legal_follower_moves(engine, state, leader_move)))
+                undo = engine.apply_trick(state, leader_move, follower_move)
+                self.assertNotEqual(state.zobrist_key(), key)
+                engine.undo_trick(state, undo)
+                self.assertEqual(state.zobrist_key(), key)
+                engine.apply_trick(state, leader_move, follower_move)
+
+    def test_key_ignores_history_and_bots(self) -> None:
+        engine = SchnapsenGamePlayEngine()
+        state = engine.get_random_phase_two_state(random.Random(42))
+        other = state.copy_with_other_bots(RandBot(random.Random(1)), RandBot(random.Random(2)))
+        other.previous = None
+        self.assertEqual(state.zobrist_key(), other.zobrist_key())
+        self.assertEqual(state.canonical_key(), other.canonical_key())
+        # swapping the roles of the players gives a different state
+        swapped = GameState(leader=state.follower, follower=state.leader, talon=state.talon, previous=None)
+        self.assertNotEqual(state.zobrist_key(), swapped.zobrist_key())
+
+
+class AttributeAccessTest(TestCase):
+    """Reading attributes of the objects used in the inner loops of the engine must not go through a Python level __getattribute__."""
+
+    @staticmethod
+    def _subclasses(cls: type[Any]) -> list[type[Any]]:
+        subclasses = [cls]
+        for subclass in cls.__subclasses__():
+            subclasses.extend(AttributeAccessTest._subclasses(subclass))
+        return subclasses
+
+    def test_no_getattribute_override(self) -> None:
+        for base in (GameState, Move, Trick):
+            for cls in self._subclasses(base):
+                self.assertIs(cls.__getattribute__, object.__getattribute__, f"{cls.__name__} overrides __getattribute__")
+
+    def test_virtual_attributes(self) -> None:
+        engine = SchnapsenGamePlayEngine()
+        state = engine.get_random_phase_two_state(random.Random(42))
+        move = RegularMove(Card.ACE_HEARTS)
+        trick = RegularTrick(leader_move=move, follower_move=RegularMove(Card.TEN_HEARTS))
+        self.assertIs(state.trump_suit, state.talon.trump_suit())
+        self.assertEqual(move.cards, [Card.ACE_HEARTS])
+        self.assertEqual(list(trick.cards), [Card.ACE_HEARTS, Card.TEN_HEARTS])
+
+
+@skipUnless(os.environ.get("SCHNAPSEN_BENCHMARKS"), "timing benchmark, set SCHNAPSEN_BENCHMARKS=1 to run it")
+class AttributeAccessBenchmark(TestCase):
+    """Compares the time to read attributes of the engine objects with a plain object. Wall clock timings are too noisy to gate the test suite, so this only runs on request."""
+
+    class _Plain:
+        def __init__(self, **attributes: Any) -> None:
+            self.__dict__.update(attributes)
+
+    def _assert_not_slower(self, hot: object, attribute: str) -> None:
+        plain = AttributeAccessBenchmark._Plain(**{attribute: getattr(hot, attribute)})
+        # take the best of several runs to reduce noise, and allow for a generous margin
+        hot_time = min(timeit.repeat(f"o.{attribute}", globals={"o": hot}, number=100_000, repeat=7))
+        plain_time = min(timeit.repeat(f"o.{attribute}", globals={"o": plain}, number=100_000, repeat=7))
+        self.assertLess(hot_time, plain_time * 1.5, f"Reading {attribute} on {type(hot).__name__} is slower than on a plain object")
+
+    def test_attribute_access(self) -> None:
+        engine = SchnapsenGamePlayEngine()
+        state = engine.get_random_phase_two_state(random.Random(42))
+        self._assert_not_slower(state, "leader")
+        self._assert_not_slower(state, "follower")
+        self._assert_not_slower(state, "talon")
+        move = RegularMove(Card.ACE_HEARTS)
+        self._assert_not_slower(move, "card")
+        trick = RegularTrick(leader_move=move, follower_move=RegularMove(Card.TEN_HEARTS))
+        self._assert_not_slower(trick, "leader_move")
+
+
+class _FixedMovesBot(Bot):
+    """Plays the given move, and nothing else"""
+
+    def __init__(self, move: Optional[Move]) -> None:
+        super().__init__()
+        self.move = move
+
+    def get_move(self, perspective: PlayerPerspective, leader_move: Optional[Move]) -> Move:
+        assert self.move is not None
+        return self.move
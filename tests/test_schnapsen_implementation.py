@@ -1,7 +1,9 @@
 from unittest import TestCase
 
 from schnapsen.deck import OrderedCardCollection, Card, Rank, Suit
-from schnapsen.game import SchnapsenDeckGenerator, SchnapsenHandGenerator
+from schnapsen.game import SchnapsenDeckGenerator, SchnapsenHandGenerator, SchnapsenTrickScorer, SchnapsenGamePlayEngine, BotState, GamePhase, GameState, Hand, Score, RegularTrick, RegularMove, SchnapsenMoveValidator, TrickScorer, _DummyBot
+from schnapsen.alternative_engines.ace_one_engine import MyTrickScorer as AceOneTrickScorer
+from schnapsen.alternative_engines.twenty_four_card_schnapsen import MyTrickScorer as TwentyFourTrickScorer, MyDeckGenerator as TwentyFourDeckGenerator
 from random import Random
 
 
@@ -35,3 +37,110 @@ class DealingTest (TestCase):
             assert cards[i] in rest
             assert cards[i] not in hand1
             assert cards[i] not in hand2
+
+
+class TrickScorerTest(TestCase):
+    @staticmethod
+    def _expected_outcome(scorer: SchnapsenTrickScorer, leader_card: Card, follower_card: Card, trump: Suit) -> tuple[bool, int]:
+        """Determine the outcome of a trick directly from the rules, as a reference for the precomputed table."""
+        leader_points = scorer.rank_to_points(leader_card.rank)
+        follower_points = scorer.rank_to_points(follower_card.rank)
+        if leader_card.suit is follower_card.suit:
+            leader_wins = leader_points > follower_points
+        else:
+            leader_wins = follower_card.suit is not trump
+        return leader_wins, leader_points + follower_points
+
+    def test_score_matches_rules(self) -> None:
+        for scorer, deck in [
+            (SchnapsenTrickScorer(), SchnapsenDeckGenerator().get_initial_deck()),
+            (AceOneTrickScorer(), SchnapsenDeckGenerator().get_initial_deck()),
+            (TwentyFourTrickScorer(), TwentyFourDeckGenerator().get_initial_deck()),
+        ]:
+            for trump in Suit:
+                for leader_card in deck:
+                    for follower_card in deck:
+                        if leader_card is follower_card:
+                            continue
+                        leader = BotState(implementation=_DummyBot(), hand=Hand([]), score=Score(direct_points=5, pending_points=20))
+                        follower = BotState(implementation=_DummyBot(), hand=Hand([]), score=Score(direct_points=7))
+                        trick = RegularTrick(leader_move=RegularMove(leader_card), follower_move=RegularMove(follower_card))
+                        winner, loser, leader_wins = scorer.score(trick, leader, follower, trump)
+
+                        expected_leader_wins, expected_points = self._expected_outcome(scorer, leader_card, follower_card, trump)
+                        self.assertEqual(leader_wins, expected_leader_wins)
+                        self.assertIs(winner, leader if leader_wins else follower)
+                        self.assertIs(loser, follower if leader_wins else leader)
+                        self.assertEqual(winner.won_cards, [leader_card, follower_card])
+                        if leader_wins:
+                            self.assertEqual(winner.score, Score(direct_points=5 + 20 + expected_points))
+                        else:
+                            self.assertEqual(winner.score, Score(direct_points=7 + expected_points))
+
+
+class FollowerMoveCacheTest(TestCase):
+    @staticmethod
+    def _is_legal(scorer: TrickScorer, hand: list[Card], leader_card: Card, trump: Suit, phase_two: bool, card: Card) -> bool:
+        """Check a single card of the follower directly against the rules, as a reference for the cached legal moves."""
+        if not phase_two:
+            return True
+        leader_points = scorer.rank_to_points(leader_card.rank)
+        same_suit = [other for other in hand if other.suit is leader_card.suit]
+        higher = [other for other in same_suit if scorer.rank_to_points(other.rank) > leader_points]
+        if higher:
+            return card in higher
+        if same_suit:
+            return card in same_suit
+        trumps = [other for other in hand if other.suit is trump]
+        if leader_card.suit is not trump and trumps:
+            return card in trumps
+        return True
+
+    def test_cached_moves_match_rules(self) -> None:
+        engine = SchnapsenGamePlayEngine()
+        rng = Random(42)
+        for index in range(100):
+            if index % 2:
+                state = engine.get_random_phase_two_state(rng)
+            else:
+                deck = engine.deck_generator.shuffle_deck(engine.deck_generator.get_initial_deck(), rng)
+                hand1, hand2, talon = engine.hand_generator.generateHands(deck)
+                state = GameState(leader=BotState(_DummyBot(), hand1), follower=BotState(_DummyBot(), hand2), talon=talon, previous=None)
+            hand = state.follower.hand.get_cards()
+            for leader_move in engine.move_validator.get_legal_leader_moves(engine, state):
+                if leader_move.is_trump_exchange():
+                    continue
+                leader_card = leader_move.cards[0]
+                expected_cards = {card for card in hand
+                                  if self._is_legal(engine.trick_scorer, hand, leader_card, state.trump_suit, state.game_phase() is GamePhase.TWO, card)}
+                for _ in range(2):
+                    # the second round is served from the cache of the engine's validator
+                    legal_moves = list(engine.move_validator.get_legal_follower_moves(engine, state, leader_move))
+                    self.assertEqual({move.cards[0] for move in legal_moves}, expected_cards)
+                    self.assertEqual(len(legal_moves), len(expected_cards))
+                    for card in hand:
+                        self.assertEqual(engine.move_validator.is_legal_follower_move(engine, state, leader_move, RegularMove(card)), card in expected_cards)
+
+    def test_hand_in_other_order_shares_entry(self) -> None:
+        engine = SchnapsenGamePlayEngine()
+        validator = SchnapsenMoveValidator()
+        state = engine.get_random_phase_two_state(Random(7))
+        leader_move = next(move for move in engine.move_validator.get_legal_leader_moves(engine, state) if not move.is_trump_exchange())
+        legal_moves = list(validator.get_legal_follower_moves(engine, state, leader_move))
+        hand = state.follower.hand
+        hand.cards = list(reversed(hand.cards))
+        reversed_moves = list(validator.get_legal_follower_moves(engine, state, leader_move))
+        self.assertEqual(len(validator._follower_cache), 1)
+        # the moves are still in the order of the cards in the hand
+        self.assertEqual(reversed_moves, list(reversed(legal_moves)))
+
+    def test_full_cache_keeps_recent_entries(self) -> None:
+        engine = SchnapsenGamePlayEngine()
+        validator = SchnapsenMoveValidator(follower_cache_size=4)
+        state = engine.get_random_phase_two_state(Random(7))
+        leader_moves = [move for move in engine.move_validator.get_legal_leader_moves(engine, state) if move.is_regular_move()]
+        self.assertEqual(len(leader_moves), 5)
+        # each leader card gives an entry, the fifth one drops the oldest two
+        for leader_move in leader_moves:
+            validator.get_legal_follower_moves(engine, state, leader_move)
+        self.assertEqual([key[1] for key in validator._follower_cache], [move.cards[0] for move in leader_moves[2:5]])
@@ -0,0 +1,83 @@
+import json
+import pathlib
+import tempfile
+from unittest import TestCase
+from schnapsen.bots import RandBot, RdeepBot
+from schnapsen.game import BotSpec
+from schnapsen.tournament import Tournament
+
+
+class TournamentTest(TestCase):
+    def setUp(self) -> None:
+        self.bots = {name: BotSpec(RandBot, kwargs={"name": name}, rand_argument="rand") for name in ("a", "b", "c")}
+        self.directory = tempfile.TemporaryDirectory()
+        self.checkpoint = pathlib.Path(self.directory.name) / "results.jsonl"
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_schedule(self) -> None:
+        schedule = Tournament(self.bots, games_per_pairing=4).schedule()
+        self.assertEqual(len(schedule), 12)
+        self.assertEqual([game.game_id for game in schedule], list(range(12)))
+        self.assertEqual({(game.bot1, game.bot2) for game in schedule}, {("a", "b"), ("a", "c"), ("b", "c")})
+        # every bot leads in half of the games of each pairing, and every game has its own deal
+        self.assertEqual(sum(game.bot1_leads for game in schedule), 6)
+        self.assertEqual(len({game.seed for game in schedule}), 12)
+
+    def test_results_do_not_depend_on_processes(self) -> None:
+        serial = Tournament(self.bots, games_per_pairing=4, processes=1).run()
+        parallel = Tournament(self.bots, games_per_pairing=4, processes=2).run()
+        self.assertEqual(serial, parallel)
+        standings = Tournament.standings(serial)
+        self.assertEqual(sum(standing.wins for standing in standings), 12)
+        self.assertEqual([standing.games for standing in standings], [8, 8, 8])
+
+    def test_resume(self) -> None:
+        expected = Tournament(self.bots, games_per_pairing=4, processes=1).run()
+        played: list[int] = []
+        Tournament(self.bots, games_per_pairing=4, checkpoint=self.checkpoint, processes=1).run(progress=lambda done, total: played.append(done))
+        self.assertEqual(played, list(range(1, 13)))
+
+        # simulate a run which stopped while writing the sixth record
+        lines = self.checkpoint.read_text().split("\n")
+        self.checkpoint.write_text("\n".join(lines[:6]) + "\n" + lines[6][:10])
+        played.clear()
+        resumed = Tournament(self.bots, games_per_pairing=4, checkpoint=self.checkpoint, processes=1).run(progress=lambda done, total: played.append(done))
+        self.assertEqual(played, list(range(6, 13)))
+        self.assertEqual(resumed, expected)
+        # the file is complete again, so nothing is played anymore
+        self.assertEqual(Tournament(self.bots, games_per_pairing=4, checkpoint=self.checkpoint, processes=1).run(), expected)
+        header = json.loads(self.checkpoint.read_text().split("\n")[0])
+        self.assertEqual(list(header["tournament"]["bots"]), ["a", "b", "c"])
+        self.assertIn("RandBot", header["tournament"]["bots"]["a"])
+
+    def test_duplicate(self) -> None:
+        tournament = Tournament(self.bots, games_per_pairing=4, processes=1, duplicate=True)
+        schedule = tournament.schedule()
+        for first, second in zip(schedule[::2], schedule[1::2]):
+            self.assertEqual((first.bot1, first.bot2, first.seed), (second.bot1, second.bot2, second.seed))
+            self.assertEqual((first.bot1_leads, second.bot1_leads), (True, False))
+        self.assertEqual(len({game.seed for game in schedule}), 6)
+
+        records = tournament.run()
+        differences = Tournament.paired_differences(records)
+        self.assertEqual(set(differences), {("a", "b"), ("a", "c"), ("b", "c")})
+        self.assertEqual([len(values) for values in differences.values()], [2, 2, 2])
+        # the differences account for all game points of the pairing
+        for (bot1, bot2), values in differences.items():
+            standings = {standing.name: standing.game_points for standing in Tournament.standings([record for record in records if (record.bot1, record.bot2) == (bot1, bot2)])}
+            self.assertEqual(sum(values), standings[bot1] - standings[bot2])
+        self.assertEqual(Tournament.compare(records)[("a", "b")].deals, 2)
+
+    def test_checkpoint_of_other_tournament(self) -> None:
+        Tournament(self.bots, games_per_pairing=2, checkpoint=self.checkpoint, processes=1).run()
+        with self.assertRaises(Exception):
+            Tournament(self.bots, games_per_pairing=2, seed=1, checkpoint=self.checkpoint, processes=1).run()
+        # the same names, but a bot which is created differently
+        changed = dict(self.bots, c=BotSpec(RdeepBot, kwargs={"num_samples": 2, "depth": 2, "name": "c"}, rand_argument="rand"))
+        with self.assertRaises(Exception):
+            Tournament(changed, games_per_pairing=2, checkpoint=self.checkpoint, processes=1).run()
+        changed = dict(self.bots, c=BotSpec(RandBot, kwargs={"name": "other"}, rand_argument="rand"))
+        with self.assertRaises(Exception):
+            Tournament(changed, games_per_pairing=2, checkpoint=self.checkpoint, processes=1).run()
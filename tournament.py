@@ -1,119 +1,53 @@
-import random
 import pathlib
-from schnapsen.game import SchnapsenGamePlayEngine
+from schnapsen.game import BotSpec, SchnapsenGamePlayEngine
+from schnapsen.tournament import Tournament
 from schnapsen.bots import RandBot, RdeepBot, Human_Strategy_Bot
 from schnapsen.bots.ml_bot import create_replay_memory_dataset, train_model, MLPlayingBot
 
-# lines 8, 13 and 14 are used to train the machine learning bot locally, commented out since they only need to be ran once.
-#bot1_sample = RandBot(rand=random.Random(), name="randbot")
-
-# Initializing Rdeep bot 
-bot2 = RdeepBot = RdeepBot(num_samples= 2, depth = 2, rand=random.Random(), name="RdeepBot")
-
-#create_replay_memory_dataset(bot1=bot1_sample, bot2=bot2)
-#train_model('LR')
-
-# Initializing game engine
-engine = SchnapsenGamePlayEngine()
-
 # Variables needed to create the Machine Learning bot
 model_dir = "ML_models"
 model_name = "simple_model"
 model_location = pathlib.Path(model_dir) / model_name
 
-# Number of repeats for the tournaments
+# Number of games each pair of bots plays. Each deal is played twice, with each bot leading once, such that the luck of the deal cancels out
 myrepeats = 50
 
-# Initializing our Human Strategy bot and the Machine Learning bot 
-bot1 = Human_Strategy_Bot(name="Human_Strategy_Bot")
-bot3 = MLPlayingBot(model_location=model_location, name="MLBot")
-
-# First tournament, all the bots compete 
-bots = [bot1, bot2, bot3]
-n = len(bots)
-wins = {str(bot): 0 for bot in bots}
-matches = [(p1, p2) for p1 in range(n) for p2 in range(n) if p1 < p2]
-
-totalgames = (n * n - n) / 2 * myrepeats
-playedgames = 0
-
-print("Playing {} games:".format(int(totalgames)))
-for a, b in matches:
-    for r in range(myrepeats):
-        if random.choice([True, False]):
-            p = [a, b]
-        else:
-            p = [b, a]
-
-        winner_id, game_points, score = engine.play_game(
-            bots[p[0]], bots[p[1]], random.Random(45)
-        )
-
-        wins[str(winner_id)] += game_points
-
-        playedgames += 1
-        print(
-            "Played {} out of {:.0f} games ({:.0f}%): {} \r".format(
-                playedgames, totalgames, playedgames / float(totalgames) * 100, wins
-            )
-        )
-
-# Second tournament, Human Strategy bot versus Rdeep bot
-bots = [bot1, bot2]
-n = len(bots)
-wins = {str(bot): 0 for bot in bots}
-matches = [(p1, p2) for p1 in range(n) for p2 in range(n) if p1 < p2]
-
-totalgames = (n * n - n) / 2 * myrepeats
-playedgames = 0
-
-print("Playing {} games:".format(int(totalgames)))
-for a, b in matches:
-    for r in range(myrepeats):
-        if random.choice([True, False]):
-            p = [a, b]
-        else:
-            p = [b, a]
+# The results are stored in this file after each game. When the run is stopped, running this script again continues where it stopped.
+checkpoint = pathlib.Path("tournament_results") / "round_robin.jsonl"
 
-        winner_id, game_points, score = engine.play_game(
-            bots[p[0]], bots[p[1]], random.Random(45)
-        )
 
-        wins[str(winner_id)] += game_points
+def print_progress(played: int, total: int) -> None:
+    print("Played {} out of {} games ({:.0f}%)\r".format(played, total, played / total * 100))
 
-        playedgames += 1
-        print(
-            "Played {} out of {:.0f} games ({:.0f}%): {} \r".format(
-                playedgames, totalgames, playedgames / float(totalgames) * 100, wins
-            )
-        )
 
-# Third tournament, Human Strategy bot versus Machine Learning bot 
-bots = [bot1, bot3]
-n = len(bots)
-wins = {str(bot): 0 for bot in bots}
-matches = [(p1, p2) for p1 in range(n) for p2 in range(n) if p1 < p2]
+if __name__ == "__main__":
+    # the lines below are used to train the machine learning bot locally, commented out since they only need to be ran once.
+    # import random
+    # create_replay_memory_dataset(bot1=RandBot(rand=random.Random(), name="randbot"), bot2=RdeepBot(num_samples=2, depth=2, rand=random.Random(), name="RdeepBot"))
+    # train_model('LR')
 
-totalgames = (n * n - n) / 2 * myrepeats
-playedgames = 0
+    # The bots are described by specifications, each process creates its own bots from these for every game
+    bots = {
+        "Human_Strategy_Bot": BotSpec(Human_Strategy_Bot, kwargs={"name": "Human_Strategy_Bot"}),
+        "RdeepBot": BotSpec(RdeepBot, kwargs={"num_samples": 2, "depth": 2, "name": "RdeepBot"}, rand_argument="rand"),
+        "MLBot": BotSpec(MLPlayingBot, kwargs={"model_location": model_location, "name": "MLBot"}),
+    }
 
-print("Playing {} games:".format(int(totalgames)))
-for a, b in matches:
-    for r in range(myrepeats):
-        if random.choice([True, False]):
-            p = [a, b]
-        else:
-            p = [b, a]
+    # All bots compete against each other, the results of each pair of bots are shown separately as well
+    tournament = Tournament(bots, games_per_pairing=myrepeats, seed=45, engine=SchnapsenGamePlayEngine(), checkpoint=checkpoint, duplicate=True)
+    print("Playing {} games:".format(len(tournament.schedule())))
+    records = tournament.run(progress=print_progress)
 
-        winner_id, game_points, score = engine.play_game(
-            bots[p[0]], bots[p[1]], random.Random(45)
-        )
+    print("All bots:")
+    for standing in Tournament.standings(records):
+        print(f"{standing.name}: {standing.wins} wins out of {standing.games} games, {standing.game_points} game points")
 
-        wins[str(winner_id)] += game_points
+    for opponent in ("RdeepBot", "MLBot"):
+        print(f"Human_Strategy_Bot versus {opponent}:")
+        pairing = [record for record in records if {record.bot1, record.bot2} == {"Human_Strategy_Bot", opponent}]
+        for standing in Tournament.standings(pairing):
+            print(f"{standing.name}: {standing.wins} wins out of {standing.games} games, {standing.game_points} game points")
 
-        playedgames += 1
-        print(
-            "Played {} out of {:.0f} games ({:.0f}%): {} \r".format(
-                playedgames, totalgames, playedgames / float(totalgames) * 100, wins
-            )
-        )
\ No newline at end of file
+    print("Paired differences (game points per deal of the first bot over the second):")
+    for (first, second), comparison in Tournament.compare(records).items():
+        print(f"{first} versus {second}: {comparison.mean_difference:+.2f} +- {comparison.standard_error:.2f} over {comparison.deals} deals")